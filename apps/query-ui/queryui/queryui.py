@@ -15,11 +15,18 @@ from streamlit_agraph import agraph, Node, Edge, Config
 from sycamore.query.client import SycamoreQueryClient
 from sycamore.query.logical_plan import LogicalPlan
 from sycamore.query.operators.logical_operator import LogicalOperator
+from sycamore.query.schema import SchemaCache
 
 
 DEFAULT_S3_CACHE_PATH = "s3://aryn-temp/llm_cache/luna/ntsb"
 
 
+@st.cache_resource
+def get_schema_cache() -> SchemaCache:
+    """Schema cache shared by every client across Streamlit reruns and sessions."""
+    return SchemaCache()
+
+
 def execute(code: str):
     try:
         exec(code, globals(), globals())
@@ -104,7 +111,9 @@ def run_query(query: str, index: str, plan_only: bool, do_trace: bool, use_cache
     if use_cache:
         st.write(f"Using cache at `{st.session_state.s3_cache_path}`")
     client = SycamoreQueryClient(
-        trace_dir=trace_dir, s3_cache_path=st.session_state.s3_cache_path if use_cache else None
+        trace_dir=trace_dir,
+        s3_cache_path=st.session_state.s3_cache_path if use_cache else None,
+        schema_cache=get_schema_cache(),
     )
     with st.spinner("Getting schema..."):
         schema = client.get_opensearch_schema(index)
@@ -124,7 +133,7 @@ def run_query(query: str, index: str, plan_only: bool, do_trace: bool, use_cache
         st.button("Show traces", on_click=lambda: show_traces(trace_dir))
 
 
-client = SycamoreQueryClient()
+client = SycamoreQueryClient(schema_cache=get_schema_cache())
 indices = client.get_opensearch_incides()
 
 st.title("Sycamore Query Demo")
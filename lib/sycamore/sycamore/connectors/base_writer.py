@@ -1,7 +1,10 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from abc import ABC, abstractmethod
+import threading
 from typing import Callable
+import uuid
 
 from sycamore.data.document import Document
 from sycamore.plan_nodes import Node, Write
@@ -10,6 +13,14 @@ from sycamore.utils.ray_utils import check_serializable
 from sycamore.utils.time_trace import TimeTrace
 
 
+# Clients (and the target params they validated) are cached per worker process, keyed by the
+# writer that created them, so that every batch after the first one in a process reuses the
+# same connection instead of reconnecting and re-validating the target.
+_MAX_CACHED_CLIENTS = 8
+_client_cache: "OrderedDict[str, tuple[BaseDBWriter.Client, BaseDBWriter.TargetParams]]" = OrderedDict()
+_client_cache_lock = threading.Lock()
+
+
 class BaseDBWriter(MapBatch, Write):
 
     # Type param for the client
@@ -31,6 +42,17 @@ class BaseDBWriter(MapBatch, Write):
         def get_existing_target_params(self, target_params: "BaseDBWriter.TargetParams") -> "BaseDBWriter.TargetParams":
             pass
 
+        def release(self):
+            """
+            Release anything that must not be held between batches, such as a lock on a database file.
+            Called after every batch; the client stays cached and must be usable for the next batch.
+            """
+            pass
+
+        def close(self):
+            """Release any connections held by the client. Called when the client is evicted from the cache."""
+            pass
+
     # Type param for the objects to write to the db
     class Record(ABC):
         @classmethod
@@ -63,19 +85,58 @@ class BaseDBWriter(MapBatch, Write):
         self._filter = filter
         self._client_params = client_params
         self._target_params = target_params
+        # Identifies this writer across the processes it is shipped to. A new writer (e.g. a new
+        # pipeline) always re-validates the target, even if the params are the same.
+        self._writer_id = str(uuid.uuid4())
+
+    def _get_client(self) -> tuple[Client, TargetParams]:
+        with _client_cache_lock:
+            cached = _client_cache.get(self._writer_id)
+            if cached is not None:
+                _client_cache.move_to_end(self._writer_id)
+                return cached
 
-    def write_docs(self, docs: list[Document]) -> list[Document]:
         client = self.Client.from_client_params(self._client_params)
         client.create_target_idempotent(self._target_params)
         created_target_params = client.get_existing_target_params(self._target_params)
         if not self._target_params.compatible_with(created_target_params):
+            client.close()
             raise ValueError(
                 "Found mismatching target parameters in script and destination\n"
                 f"Script: {self._target_params}\n"
                 f"Destination: {created_target_params}\n"
             )
-        records = [self.Record.from_doc(d, created_target_params) for d in docs if self._filter(d)]
-        client.write_many_records(records, self._target_params)
+
+        evicted = []
+        with _client_cache_lock:
+            if self._writer_id in _client_cache:
+                # Another thread in this process got there first; use its client.
+                evicted.append(client)
+                cached = _client_cache[self._writer_id]
+            else:
+                cached = (client, created_target_params)
+                _client_cache[self._writer_id] = cached
+                while len(_client_cache) > _MAX_CACHED_CLIENTS:
+                    _, (old_client, _) = _client_cache.popitem(last=False)
+                    evicted.append(old_client)
+        for c in evicted:
+            c.close()
+        return cached
+
+    def close(self):
+        """Closes the client cached for this writer in the current process, if any."""
+        with _client_cache_lock:
+            cached = _client_cache.pop(self._writer_id, None)
+        if cached is not None:
+            cached[0].close()
+
+    def write_docs(self, docs: list[Document]) -> list[Document]:
+        client, created_target_params = self._get_client()
+        try:
+            records = [self.Record.from_doc(d, created_target_params) for d in docs if self._filter(d)]
+            client.write_many_records(records, self._target_params)
+        finally:
+            client.release()
         return docs
 
     def _write_docs_tt(self, docs: list[Document]) -> list[Document]:
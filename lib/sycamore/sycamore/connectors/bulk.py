@@ -0,0 +1,195 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import heapq
+import time
+from typing import Any, Callable
+
+# Per-item statuses that indicate the cluster is overloaded or temporarily unavailable, as opposed to
+# a problem with the document itself.
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+
+@dataclass
+class BulkParams:
+    """
+    Tuning parameters for bulk writes to OpenSearch and Elasticsearch.
+
+    Args:
+        max_chunk_bytes: Upper bound on the serialized size of a single bulk request.
+        max_chunk_docs: Upper bound on the number of documents in a single bulk request.
+        max_concurrency: Maximum number of bulk requests in flight at once. The writer starts here and
+            halves the concurrency whenever the cluster rejects items, growing back by one per clean request.
+        max_retries: Number of times a rejected item is retried before it is reported as failed.
+        initial_backoff: Seconds to wait before the first retry of an item; doubled on each further retry.
+        max_backoff: Upper bound in seconds on the wait between retries.
+        raise_on_error: Raise once the batch is done if any document could not be written.
+    """
+
+    max_chunk_bytes: int = 10 * 1024 * 1024
+    max_chunk_docs: int = 500
+    max_concurrency: int = 4
+    max_retries: int = 5
+    initial_backoff: float = 1.0
+    max_backoff: float = 60.0
+    raise_on_error: bool = True
+
+
+@dataclass
+class BulkStats:
+    """Counters describing the bulk writes done by a client."""
+
+    docs: int = 0
+    bytes: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttled_requests: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add(self, other: "BulkStats") -> None:
+        self.docs += other.docs
+        self.bytes += other.bytes
+        self.requests += other.requests
+        self.retries += other.retries
+        self.throttled_requests += other.throttled_requests
+        self.failed += other.failed
+        self.seconds += other.seconds
+
+    def docs_per_second(self) -> float:
+        return self.docs / self.seconds if self.seconds > 0 else 0.0
+
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.docs} docs ({self.bytes / (1024 * 1024):.1f} MiB) in {self.seconds:.2f}s "
+            f"({self.docs_per_second():.0f} docs/s, {self.bytes_per_second() / (1024 * 1024):.2f} MiB/s), "
+            f"{self.requests} requests, {self.retries} retries, {self.throttled_requests} throttled, "
+            f"{self.failed} failed"
+        )
+
+
+class AdaptiveBulkWriter:
+    """
+    Sends pre-serialized bulk items in byte-budgeted chunks from a small thread pool.
+
+    Items rejected with a retryable status are retried with exponential backoff. Whenever a request
+    comes back with rejections, the number of requests in flight is halved; every clean request
+    allows one more, up to BulkParams.max_concurrency.
+
+    Args:
+        send_bulk: Sends one bulk request made of the given ndjson lines and returns the parsed response.
+        params: Chunking, concurrency and retry parameters.
+        is_retryable_exception: Decides whether an exception raised by send_bulk should cause the whole
+            chunk to be retried. Other exceptions are propagated.
+    """
+
+    def __init__(
+        self,
+        send_bulk: Callable[[list[bytes]], Any],
+        params: BulkParams,
+        is_retryable_exception: Callable[[Exception], bool],
+    ):
+        self._send_bulk = send_bulk
+        self._params = params
+        self._is_retryable_exception = is_retryable_exception
+        self._concurrency = max(1, params.max_concurrency)
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def _backoff(self, attempt: int) -> float:
+        return min(self._params.max_backoff, self._params.initial_backoff * (2**attempt))
+
+    def _next_chunk(self, pending: deque, sizes: list[int]) -> list[int]:
+        chunk: list[int] = []
+        chunk_bytes = 0
+        while pending and len(chunk) < self._params.max_chunk_docs:
+            idx = pending[0]
+            # Always take at least one item, even if it alone is over budget.
+            if chunk and chunk_bytes + sizes[idx] > self._params.max_chunk_bytes:
+                break
+            pending.popleft()
+            chunk.append(idx)
+            chunk_bytes += sizes[idx]
+        return chunk
+
+    def _send_chunk(self, chunk: list[int], items: list[list[bytes]]) -> list[tuple[int, int, Any]]:
+        lines = [line for idx in chunk for line in items[idx]]
+        try:
+            response = self._send_bulk(lines)
+        except Exception as e:
+            if not self._is_retryable_exception(e):
+                raise
+            return [(idx, 429, str(e)) for idx in chunk]
+        entries = response["items"]
+        results = []
+        for idx, entry in zip(chunk, entries):
+            op_type, item = next(iter(entry.items()))
+            results.append((idx, item.get("status", 500), {op_type: item}))
+        # The response should have one item per document; count any it left out as failed rather than
+        # dropping them.
+        for idx in chunk[len(entries) :]:
+            results.append((idx, 500, {"error": f"no item in the bulk response for document {idx} of the batch"}))
+        return results
+
+    def write(self, items: list[list[bytes]]) -> BulkStats:
+        """
+        Writes the given items, each a list of serialized ndjson lines (action and optional source),
+        and returns statistics for the write.
+        """
+        stats = BulkStats()
+        if not items:
+            return stats
+        start = time.time()
+        sizes = [sum(len(line) + 1 for line in item) for item in items]
+        attempts = [0] * len(items)
+        pending: deque = deque(range(len(items)))
+        delayed: list[tuple[float, int]] = []  # heap of (ready_time, item index)
+
+        with ThreadPoolExecutor(max_workers=max(1, self._params.max_concurrency)) as executor:
+            in_flight: dict[Future, list[int]] = {}
+            while pending or delayed or in_flight:
+                now = time.time()
+                while delayed and delayed[0][0] <= now:
+                    pending.append(heapq.heappop(delayed)[1])
+
+                while pending and len(in_flight) < self._concurrency:
+                    chunk = self._next_chunk(pending, sizes)
+                    in_flight[executor.submit(self._send_chunk, chunk, items)] = chunk
+
+                if not in_flight:
+                    time.sleep(max(0.0, delayed[0][0] - time.time()))
+                    continue
+
+                timeout = max(0.0, delayed[0][0] - time.time()) if delayed else None
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                    throttled = False
+                    stats.requests += 1
+                    for idx, status, info in future.result():
+                        if 200 <= status < 300:
+                            stats.docs += 1
+                            stats.bytes += sizes[idx]
+                        elif status in RETRYABLE_STATUSES and attempts[idx] < self._params.max_retries:
+                            throttled = True
+                            stats.retries += 1
+                            heapq.heappush(delayed, (time.time() + self._backoff(attempts[idx]), idx))
+                            attempts[idx] += 1
+                        else:
+                            throttled = throttled or status in RETRYABLE_STATUSES
+                            stats.failed += 1
+                            stats.errors.append(info if isinstance(info, dict) else {"error": info})
+                    if throttled:
+                        stats.throttled_requests += 1
+                        self._concurrency = max(1, self._concurrency // 2)
+                    else:
+                        self._concurrency = min(self._params.max_concurrency, self._concurrency + 1)
+
+        stats.seconds = time.time() - start
+        return stats
@@ -57,7 +57,25 @@ class DuckDBWriterTargetParams(BaseDBWriter.TargetParams):
 
 class DuckDBClient(BaseDBWriter.Client):
     def __init__(self, client_params: DuckDBWriterClientParams):
-        pass
+        self._connections: dict[str, duckdb.DuckDBPyConnection] = {}
+
+    def _connect(self, db_url: Optional[str]) -> duckdb.DuckDBPyConnection:
+        # Keep one connection per database file open for the rest of the batch, rather than reopening
+        # the file for every flush.
+        key = str(db_url)
+        if key not in self._connections:
+            self._connections[key] = duckdb.connect(key)
+        return self._connections[key]
+
+    def release(self):
+        # A connection holds the write lock on its database file, so close it at the end of every batch;
+        # otherwise no other process could open the database while this worker is alive.
+        self.close()
+
+    def close(self):
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
 
     @classmethod
     def from_client_params(cls, params: BaseDBWriter.ClientParams) -> "DuckDBClient":
@@ -71,50 +89,40 @@ class DuckDBClient(BaseDBWriter.Client):
         ), f"Wrong kind of target parameters found: {target_params}"
         dict_params = asdict(target_params)
         N = target_params.batch_size * 1024  # Around 1 MB
-        headers = ["doc_id", "embeddings", "properties", "text_representation", "bbox", "shingles", "type"]
-        schema = pa.schema(
-            [
-                ("doc_id", pa.string()),
-                ("embeddings", pa.list_(pa.float32())),
-                ("properties", pa.map_(pa.string(), pa.string())),
-                ("text_representation", pa.string()),
-                ("bbox", pa.list_(pa.float32())),
-                ("shingles", pa.list_(pa.int64())),
-                ("type", pa.string()),
-            ]
-        )
+        client = self._connect(dict_params.get("db_url"))
+        table_name = dict_params.get("table_name")
+
+        def write_batch(batch: pa.RecordBatch):
+            # The arrow data is scanned in place by DuckDB.
+            client.register("_sycamore_batch", pa.Table.from_batches([batch]))
+            try:
+                client.execute(f"INSERT INTO {table_name} SELECT * FROM _sycamore_batch")
+            finally:
+                client.unregister("_sycamore_batch")
 
-        def write_batch(batch_data: dict):
-            pa_table = pa.Table.from_pydict(batch_data, schema=schema)  # noqa
-            client = duckdb.connect(str(dict_params.get("db_url")))
-            client.sql(f"INSERT INTO {dict_params.get('table_name')} SELECT * FROM pa_table")
-            for key in batch_data:
-                batch_data[key].clear()
-
-        batch_data: dict[str, list[Any]] = {key: [] for key in headers}
-
-        for r in records:
-            # Append the new data to the batch
-            batch_data["doc_id"].append(r.doc_id)
-            batch_data["embeddings"].append(r.embeddings)
-            batch_data["properties"].append(convert_to_str_dict(r.properties) if r.properties else {})
-            batch_data["text_representation"].append(r.text_representation)
-            batch_data["bbox"].append(r.bbox)
-            batch_data["shingles"].append(r.shingles)
-            batch_data["type"].append(r.type)
-
-            # If we've reached the batch size, write to the database
-            if batch_data.__sizeof__() >= N:
-                write_batch(batch_data)
-        # Write any remaining records
-        if len(batch_data["doc_id"]) > 0:
-            write_batch(batch_data)
+        # Flushes bound the memory used for building arrow data; the whole call is a single transaction
+        # so that we only pay for one commit per batch of records.
+        builder = _ArrowBatchBuilder()
+        client.begin()
+        try:
+            for r in records:
+                builder.append(r)
+                # Flush on the size of the data accumulated so far, not of the containers holding it.
+                if builder.nbytes >= N:
+                    write_batch(builder.flush())
+            # Write any remaining records
+            if len(builder) > 0:
+                write_batch(builder.flush())
+            client.commit()
+        except Exception:
+            client.rollback()
+            raise
 
     def create_target_idempotent(self, target_params: BaseDBWriter.TargetParams):
         assert isinstance(target_params, DuckDBWriterTargetParams)
         dict_params = asdict(target_params)
         schema = dict_params.get("schema")
-        client = duckdb.connect(str(dict_params.get("db_url")))
+        client = self._connect(dict_params.get("db_url"))
         try:
             if schema:
                 embedding_size = schema.get("embeddings") + "[" + str(dict_params.get("dimensions")) + "]"
@@ -141,7 +149,7 @@ class DuckDBClient(BaseDBWriter.Client):
         if not target_params.db_url or not os.path.exists(target_params.db_url):
             raise ValueError(f"Must provide valid disk location. Location Specified: {target_params.db_url}")
         if target_params.db_url and target_params.table_name:
-            client = duckdb.connect(str(dict_params.get("db_url")))
+            client = self._connect(dict_params.get("db_url"))
             try:
                 table = client.sql(f"SELECT * FROM {target_params.table_name}")
                 schema = dict(zip(table.columns, [repr(i) for i in table.dtypes]))
@@ -187,6 +195,106 @@ class DuckDBDocumentRecord(BaseDBWriter.Record):
         )
 
 
+_ARROW_SCHEMA = pa.schema(
+    [
+        ("doc_id", pa.string()),
+        ("embeddings", pa.list_(pa.float32())),
+        ("properties", pa.map_(pa.string(), pa.string())),
+        ("text_representation", pa.string()),
+        ("bbox", pa.list_(pa.float32())),
+        ("shingles", pa.list_(pa.int64())),
+        ("type", pa.string()),
+    ]
+)
+
+
+class _ArrowBatchBuilder:
+    """
+    Accumulates DuckDBDocumentRecords column by column and turns them into an arrow RecordBatch.
+
+    List and map columns are kept as flat value buffers plus offsets, so each flush builds every column
+    with a single conversion rather than one python object per row.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._num_rows = 0
+        self.nbytes = 0
+        self._doc_ids: list[str] = []
+        self._texts: list[Optional[str]] = []
+        self._types: list[Optional[str]] = []
+        self._prop_keys: list[str] = []
+        self._prop_values: list[str] = []
+        self._prop_offsets: list[int] = [0]
+        self._lists: dict[str, tuple[list, list[int], list[bool]]] = {
+            "embeddings": ([], [0], []),
+            "bbox": ([], [0], []),
+            "shingles": ([], [0], []),
+        }
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def _append_list(self, name: str, value: Optional[Any], itemsize: int):
+        values, offsets, nulls = self._lists[name]
+        if value is None:
+            nulls.append(True)
+        else:
+            values.extend(value)
+            nulls.append(False)
+            self.nbytes += itemsize * len(value)
+        offsets.append(len(values))
+
+    def append(self, r: "DuckDBDocumentRecord"):
+        self._num_rows += 1
+        self._doc_ids.append(r.doc_id)
+        self._texts.append(r.text_representation)
+        self._types.append(r.type)
+        self.nbytes += len(r.doc_id) + len(r.text_representation or "") + len(r.type or "")
+
+        if r.properties:
+            for k, v in convert_to_str_dict(r.properties).items():
+                self._prop_keys.append(k)
+                self._prop_values.append(v)
+                self.nbytes += len(k) + len(v)
+        self._prop_offsets.append(len(self._prop_keys))
+
+        self._append_list("embeddings", r.embeddings, 4)
+        self._append_list("bbox", r.bbox, 4)
+        self._append_list("shingles", r.shingles, 8)
+
+    def _list_array(self, name: str, value_type: pa.DataType) -> pa.Array:
+        values, offsets, nulls = self._lists[name]
+        return pa.ListArray.from_arrays(
+            pa.array(offsets, type=pa.int32()),
+            pa.array(values, type=value_type),
+            mask=pa.array(nulls, type=pa.bool_()),
+        )
+
+    def flush(self) -> pa.RecordBatch:
+        properties = pa.MapArray.from_arrays(
+            pa.array(self._prop_offsets, type=pa.int32()),
+            pa.array(self._prop_keys, type=pa.string()),
+            pa.array(self._prop_values, type=pa.string()),
+        )
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(self._doc_ids, type=pa.string()),
+                self._list_array("embeddings", pa.float32()),
+                properties,
+                pa.array(self._texts, type=pa.string()),
+                self._list_array("bbox", pa.float32()),
+                self._list_array("shingles", pa.int64()),
+                pa.array(self._types, type=pa.string()),
+            ],
+            schema=_ARROW_SCHEMA,
+        )
+        self._reset()
+        return batch
+
+
 def _narrow_list_of_doc_records(records: list[BaseDBWriter.Record]) -> TypeGuard[list[DuckDBDocumentRecord]]:
     return all(isinstance(r, DuckDBDocumentRecord) for r in records)
 
@@ -4,16 +4,22 @@ from typing_extensions import TypeGuard
 
 from sycamore.data.document import Document
 from sycamore.connectors.base_writer import BaseDBWriter
+from sycamore.connectors.bulk import RETRYABLE_STATUSES, AdaptiveBulkWriter, BulkParams, BulkStats
 from sycamore.connectors.common import flatten_data, check_dictionary_compatibility
 
 from elasticsearch import Elasticsearch, ApiError
-from elasticsearch.helpers import parallel_bulk
+from elasticsearch import ConnectionError as ElasticsearchConnectionError
+from elasticsearch.helpers import BulkIndexError
+import logging
+
+log = logging.getLogger(__name__)
 
 
 @dataclass
 class ElasticsearchWriterClientParams(BaseDBWriter.ClientParams):
     url: str
     es_client_args: dict = field(default_factory=lambda: {})
+    bulk_params: BulkParams = field(default_factory=BulkParams)
 
 
 @dataclass
@@ -61,34 +67,52 @@ class ElasticsearchWriterTargetParams(BaseDBWriter.TargetParams):
 
 
 class ElasticsearchWriterClient(BaseDBWriter.Client):
-    def __init__(self, client: Elasticsearch):
+    def __init__(self, client: Elasticsearch, bulk_params: Optional[BulkParams] = None):
         self._client = client
+        self._bulk_params = bulk_params or BulkParams()
+        self._bulk_writer = AdaptiveBulkWriter(self._send_bulk, self._bulk_params, _is_retryable_exception)
+        self._refresh = "false"
+        self.stats = BulkStats()
 
     @classmethod
     def from_client_params(cls, params: BaseDBWriter.ClientParams) -> "ElasticsearchWriterClient":
         assert isinstance(params, ElasticsearchWriterClientParams)
         client = Elasticsearch(params.url, **params.es_client_args)
-        return ElasticsearchWriterClient(client)
+        return ElasticsearchWriterClient(client, params.bulk_params)
+
+    def _send_bulk(self, lines: list[bytes]) -> Any:
+        # The client sends pre-serialized ndjson lines as they are; its own bulk helpers pass bytes the same way,
+        # although the stubs only admit mappings.
+        return self._client.bulk(operations=lines, refresh=self._refresh)  # type: ignore[arg-type]
 
     def write_many_records(self, records: list[BaseDBWriter.Record], target_params: BaseDBWriter.TargetParams):
         assert isinstance(target_params, ElasticsearchWriterTargetParams)
         assert _narrow_list_of_doc_records(records), f"Found a bad record in {records}"
-        with self._client:
-
-            def bulk_action_generator():
-                for r in records:
-                    yield {
-                        "_index": target_params.index_name,
-                        "_id": r.doc_id,
-                        "properties": r.properties,
-                        "embeddings": r.embeddings,
-                    }
-
-            for success, info in parallel_bulk(
-                self._client, bulk_action_generator(), refresh=target_params.wait_for_completion
-            ):  # generator must be consumed
-                if not success:
-                    print(f"Insert Operation Unsuccessful: {info}")
+
+        serializer = self._client.transport.serializers.get_serializer("application/json")
+        items = [
+            [
+                serializer.dumps({"index": {"_index": target_params.index_name, "_id": r.doc_id}}),
+                serializer.dumps({"properties": r.properties, "embeddings": r.embeddings}),
+            ]
+            for r in records
+        ]
+        self._refresh = target_params.wait_for_completion
+        stats = self._bulk_writer.write(items)
+        self.stats.add(stats)
+        log.info(
+            "Elasticsearch bulk write: %s; concurrency now %d. Cumulative: %s",
+            stats,
+            self._bulk_writer.concurrency,
+            self.stats,
+        )
+        if stats.failed > 0:
+            log.error("%d document(s) failed to upload: %s", stats.failed, stats.errors[:5])
+            if self._bulk_params.raise_on_error:
+                raise BulkIndexError(f"{stats.failed} document(s) failed to index.", stats.errors)
+
+    def close(self):
+        self._client.close()
 
     def create_target_idempotent(self, target_params: BaseDBWriter.TargetParams):
         assert isinstance(target_params, ElasticsearchWriterTargetParams)
@@ -143,6 +167,12 @@ class ElasticsearchWriterDocumentRecord(BaseDBWriter.Record):
         return ElasticsearchWriterDocumentRecord(doc_id=doc_id, properties=properties, embeddings=embedding)
 
 
+def _is_retryable_exception(e: Exception) -> bool:
+    if isinstance(e, ElasticsearchConnectionError):
+        return True
+    return isinstance(e, ApiError) and e.status_code in RETRYABLE_STATUSES
+
+
 def _narrow_list_of_doc_records(
     records: list[BaseDBWriter.Record],
 ) -> TypeGuard[list[ElasticsearchWriterDocumentRecord]]:
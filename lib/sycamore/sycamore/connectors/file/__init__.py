@@ -1,16 +1,26 @@
-from sycamore.connectors.file.file_scan import BinaryScan, FileScan, JsonScan, JsonDocumentScan
+from sycamore.connectors.file.file_scan import (
+    BinaryScan,
+    BundleScan,
+    FileScan,
+    JsonScan,
+    JsonDocumentScan,
+    ParquetScan,
+)
 from sycamore.connectors.file.materialized_scan import ArrowScan, DocScan, MaterializedScan, PandasScan
-from sycamore.connectors.file.file_writer import FileWriter, _FileDataSink
+from sycamore.connectors.file.file_writer import FileWriter, ParquetWriter, _FileDataSink
 
 __all__ = [
     "ArrowScan",
     "BinaryScan",
+    "BundleScan",
     "DocScan",
     "FileScan",
     "JsonScan",
     "JsonDocumentScan",
+    "ParquetScan",
     "MaterializedScan",
     "PandasScan",
     "FileWriter",
+    "ParquetWriter",
     "_FileDataSink",
 ]
@@ -0,0 +1,127 @@
+"""
+Binary layout used to pack many documents into a single file.
+
+A bundle is laid out as::
+
+    MAGIC | record* | index | index length (u64) | MAGIC
+
+where each record is a little-endian u64 length followed by that many bytes of payload, and the
+index is a JSON list of ``[doc_id, offset, length]`` triples pointing at the payloads. Records can be
+read sequentially without the index, and a single document can be fetched by doc_id by reading the
+footer, the index and then only the bytes of that record.
+"""
+
+from io import BytesIO
+import json
+import struct
+from typing import IO, Iterator, Optional
+
+from pyarrow.fs import FileSystem
+from ray.data.datasource.path_util import _resolve_paths_and_filesystem
+
+from sycamore.data import Document
+
+MAGIC = b"SYCBNDL1"
+BUNDLE_EXTENSION = "sybundle"
+
+_LENGTH = struct.Struct("<Q")
+_FOOTER_SIZE = _LENGTH.size + len(MAGIC)
+
+
+class BundleBuilder:
+    """Accumulates length-prefixed records in memory and produces the bytes of a bundle."""
+
+    def __init__(self):
+        self._buffer = BytesIO()
+        self._buffer.write(MAGIC)
+        self._index: list[tuple[Optional[str], int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        return self._buffer.tell()
+
+    def add(self, doc_id: Optional[str], payload: bytes) -> None:
+        self._buffer.write(_LENGTH.pack(len(payload)))
+        self._index.append((doc_id, self._buffer.tell(), len(payload)))
+        self._buffer.write(payload)
+
+    def finish(self) -> bytes:
+        index = json.dumps(self._index).encode("utf-8")
+        self._buffer.write(index)
+        self._buffer.write(_LENGTH.pack(len(index)))
+        self._buffer.write(MAGIC)
+        return self._buffer.getvalue()
+
+
+def _index_bounds(size: int, footer: bytes) -> tuple[int, int]:
+    if len(footer) != _FOOTER_SIZE or footer[_LENGTH.size :] != MAGIC:
+        raise ValueError("Not a Sycamore bundle: bad footer")
+    (index_length,) = _LENGTH.unpack(footer[: _LENGTH.size])
+    index_start = size - _FOOTER_SIZE - index_length
+    if index_start < len(MAGIC):
+        raise ValueError("Not a Sycamore bundle: bad index length")
+    return index_start, index_length
+
+
+def iter_bundle_payloads(data: bytes) -> Iterator[bytes]:
+    """Yields the payloads of a bundle held in memory, in the order they were written."""
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a Sycamore bundle: bad header")
+    end, _ = _index_bounds(len(data), data[-_FOOTER_SIZE:])
+    view = memoryview(data)
+    pos = len(MAGIC)
+    while pos < end:
+        (length,) = _LENGTH.unpack_from(view, pos)
+        pos += _LENGTH.size
+        yield bytes(view[pos : pos + length])
+        pos += length
+
+
+def read_bundle_index(file: IO[bytes], size: int) -> dict[Optional[str], tuple[int, int]]:
+    """
+    Reads the index of a bundle from a seekable file.
+
+    Args:
+        file: The open bundle.
+        size: The size of the bundle in bytes.
+
+    Returns:
+        A map from doc_id to the (offset, length) of its payload.
+    """
+    file.seek(size - _FOOTER_SIZE)
+    index_start, index_length = _index_bounds(size, file.read(_FOOTER_SIZE))
+    file.seek(index_start)
+    return {doc_id: (offset, length) for doc_id, offset, length in json.loads(file.read(index_length))}
+
+
+def read_bundle_payload(file: IO[bytes], size: int, doc_id: str) -> Optional[bytes]:
+    """Returns the payload stored for doc_id in a seekable bundle file, or None if it is not present."""
+    entry = read_bundle_index(file, size).get(doc_id)
+    if entry is None:
+        return None
+    offset, length = entry
+    file.seek(offset)
+    return file.read(length)
+
+
+def read_bundle_document(path: str, doc_id: str, filesystem: Optional[FileSystem] = None) -> Optional[Document]:
+    """
+    Fetches a single Document from a binary bundle written with the default payload, reading only the
+    footer, the index and the record itself.
+
+    Args:
+        path: The bundle to read. Should include the scheme if not local.
+        doc_id: The doc_id of the Document to fetch.
+        filesystem: The pyarrow.fs FileSystem to use.
+
+    Returns:
+        The Document, or None if the bundle does not contain doc_id.
+    """
+    (paths, filesystem) = _resolve_paths_and_filesystem(path, filesystem)
+    size = filesystem.get_file_info(paths[0]).size
+    with filesystem.open_input_file(paths[0]) as file:
+        payload = read_bundle_payload(file, size, doc_id)
+    return None if payload is None else Document.deserialize(payload)
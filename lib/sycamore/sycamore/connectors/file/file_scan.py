@@ -7,8 +7,11 @@ import uuid
 import logging
 
 from pyarrow.filesystem import FileSystem
-from ray.data import Dataset, read_binary_files, read_json
+import pyarrow as pa
+from ray.data import Dataset, read_binary_files, read_json, read_parquet
 
+from sycamore.connectors.file.bundle_format import BUNDLE_EXTENSION, iter_bundle_payloads
+from sycamore.connectors.file.parquet_format import table_to_documents
 from sycamore.data import Document
 from sycamore.plan_nodes import Scan
 from sycamore.utils.time_trace import timetrace
@@ -274,3 +277,72 @@ class JsonDocumentScan(FileScan):
 
     def format(self):
         return "jsonl"
+
+
+class ParquetScan(FileScan):
+    """Scan Parquet files written by :class:`sycamore.connectors.file.file_writer.ParquetWriter` back into
+    Documents. Only the requested columns are read, and hive-style partition directories are supported."""
+
+    def __init__(
+        self,
+        paths: Union[str, list[str]],
+        *,
+        columns: Optional[list[str]] = None,
+        parallelism: Optional[int] = None,
+        filesystem: Optional[FileSystem] = None,
+        **resource_args,
+    ):
+        super().__init__(paths, parallelism=parallelism, filesystem=filesystem, **resource_args)
+        self.parallelism = -1 if parallelism is None else parallelism
+        self._columns = columns
+
+    @staticmethod
+    def _to_documents(batch: pa.Table) -> dict[str, list[bytes]]:
+        return {"doc": [d.serialize() for d in table_to_documents(batch)]}
+
+    def execute(self, **kwargs) -> Dataset:
+        ds = read_parquet(
+            self._paths,
+            filesystem=self._filesystem,
+            columns=self._columns,
+            parallelism=self.parallelism,
+            ray_remote_args=self.resource_args,
+        )
+        return ds.map_batches(self._to_documents, batch_format="pyarrow", **self.resource_args)
+
+    def format(self):
+        return "parquet"
+
+
+class BundleScan(FileScan):
+    """Scan binary bundles written by ``DocSetWriter.files(..., bundle_format="binary")`` back into
+    Documents. Each record in a bundle must hold a serialized Document, which is the default payload."""
+
+    def __init__(
+        self,
+        paths: Union[str, list[str]],
+        *,
+        parallelism: Optional[int] = None,
+        filesystem: Optional[FileSystem] = None,
+        **resource_args,
+    ):
+        super().__init__(paths, parallelism=parallelism, filesystem=filesystem, **resource_args)
+        self.parallelism = -1 if parallelism is None else parallelism
+
+    @staticmethod
+    def _to_documents(row: dict[str, Any]) -> list[dict[str, Any]]:
+        # The payloads are already serialized Documents, so they become rows as is.
+        return [{"doc": payload} for payload in iter_bundle_payloads(row["bytes"])]
+
+    def execute(self, **kwargs) -> Dataset:
+        files = read_binary_files(
+            self._paths,
+            filesystem=self._filesystem,
+            parallelism=self.parallelism,
+            file_extensions=[BUNDLE_EXTENSION],
+            ray_remote_args=self.resource_args,
+        )
+        return files.flat_map(self._to_documents, **self.resource_args)
+
+    def format(self):
+        return "bundle"
@@ -1,8 +1,11 @@
 from sycamore.data import Document, MetadataDocument
 from sycamore.plan_nodes import Node, Write
+from sycamore.connectors.file.bundle_format import BUNDLE_EXTENSION, BundleBuilder
+from sycamore.connectors.file.parquet_format import PARTITION_COLUMN_PREFIX, documents_to_table
 
 from pyarrow.fs import FileSystem
 from pyarrow import NativeFile
+import pyarrow.dataset as pads
 
 from ray.data import Dataset
 from ray.data.datasource import FilenameProvider, Datasink, BlockBasedFileDatasink
@@ -117,11 +120,26 @@ def document_to_bytes(doc: Document) -> bytes:
     return out.getvalue().encode("utf-8")
 
 
+def _bundle_doc_to_json(doc: Document) -> bytes:
+    del doc.binary_representation  # Doesn't make sense in JSON
+    return document_to_bytes(doc)
+
+
+def _bundle_doc_to_binary(doc: Document) -> bytes:
+    return doc.serialize()
+
+
+BUNDLE_FORMATS = {"jsonl": _bundle_doc_to_json, "binary": _bundle_doc_to_binary}
+
+DEFAULT_TARGET_FILE_SIZE = 128 * 1024 * 1024
+
+
 class FileWriter(Write):
     """Sycamore Write implementation that writes out binary or text representation.
 
     Supports writting files to any FileSystem supported by Ray (e.g. arrow.fs.FileSystem).
-    Each document is written to a separate file.
+    By default each document is written to a separate file. With a bundle_format, many documents
+    are packed into each file instead, which is much cheaper on object stores.
     """
 
     def __init__(
@@ -130,7 +148,9 @@ class FileWriter(Write):
         path: str,
         filesystem: Optional[FileSystem] = None,
         filename_fn: Callable[[Document], str] = default_filename,
-        doc_to_bytes_fn: Callable[[Document], bytes] = default_doc_to_bytes,
+        doc_to_bytes_fn: Optional[Callable[[Document], bytes]] = None,
+        bundle_format: Optional[str] = None,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE,
         **ray_remote_args,
     ):
         """Initializes a FileWriter instance.
@@ -140,18 +160,27 @@ class FileWriter(Write):
             path: The path prefix to write to. Should include the scheme.
             filesystem: The pyarrow.fs FileSystem to use.
             filename_fn: A function for generating a file name. Takes a Document
-                and returns a unique name that will be appended to path.
+                and returns a unique name that will be appended to path. Not used for bundles.
             doc_to_bytes_fn: A function from a Document to bytes for generating the data to write.
                 Defaults to using text_representation if available, or binary_representation
-                if not.
+                if not. For bundles, defaults to a JSON line per document ("jsonl") or the
+                serialized Document ("binary").
+            bundle_format: If set, pack many documents into each file. "jsonl" writes newline
+                delimited records; "binary" writes length-prefixed records followed by an index
+                that allows fetching a single document by doc_id.
+            target_file_size: Approximate size in bytes at which a bundle is closed and a new one started.
             ray_remote_args: Arguments to pass to the underlying execution environment.
         """
 
         super().__init__(plan, **ray_remote_args)
+        if bundle_format is not None and bundle_format not in BUNDLE_FORMATS:
+            raise ValueError(f"Unknown bundle_format {bundle_format}; expected one of {list(BUNDLE_FORMATS)}")
         self.path = path
         self.filesystem = filesystem
         self.filename_fn = filename_fn
         self.doc_to_bytes_fn = doc_to_bytes_fn
+        self.bundle_format = bundle_format
+        self.target_file_size = target_file_size
         self.ray_remote_args = ray_remote_args
 
     def execute(self, **kwargs) -> Dataset:
@@ -163,6 +192,8 @@ class FileWriter(Write):
                 filesystem=self.filesystem,
                 filename_fn=self.filename_fn,
                 doc_to_bytes_fn=self.doc_to_bytes_fn,
+                bundle_format=self.bundle_format,
+                target_file_size=self.target_file_size,
             ),
             ray_remote_args=self.ray_remote_args,
         )
@@ -207,6 +238,61 @@ class JsonWriter(Write):
         return ds
 
 
+class ParquetWriter(Write):
+    """
+    Sycamore Write implementation that writes Documents to Parquet files using the columnar layout in
+    :mod:`sycamore.connectors.file.parquet_format`. Each write task produces its own files, optionally
+    split into hive-style ``properties.<name>=<value>`` directories.
+    """
+
+    def __init__(
+        self,
+        plan: Node,
+        path: str,
+        filesystem: Optional[FileSystem] = None,
+        embedding_dim: Optional[int] = None,
+        partition_by: Optional[list[str]] = None,
+        row_group_size: int = 10000,
+        max_rows_per_file: int = 0,
+        **ray_remote_args,
+    ) -> None:
+        """
+        Construct a ParquetWriter instance.
+
+        Args:
+            plan: A Sycamore plan representing the DocSet to write out.
+            path: The path prefix to write to. Should include the scheme.
+            filesystem: The pyarrow.fs FileSystem to use.
+            embedding_dim: If set, embeddings are stored as fixed size lists of this many float32 values.
+            partition_by: Property names whose values are used to partition the output into directories.
+            row_group_size: Maximum number of rows in a Parquet row group.
+            max_rows_per_file: Maximum number of rows in a file; 0 means no limit.
+            ray_remote_args: Arguments to pass to the underlying execution environment.
+        """
+
+        super().__init__(plan, **ray_remote_args)
+        self.path = path
+        self.filesystem = filesystem
+        self.embedding_dim = embedding_dim
+        self.partition_by = partition_by
+        self.row_group_size = row_group_size
+        self.max_rows_per_file = max_rows_per_file
+        self.ray_remote_args = ray_remote_args
+
+    def execute(self, **kwargs) -> Dataset:
+        ds = self.child().execute()
+        sink = _ParquetDataSink(
+            self.path,
+            filesystem=self.filesystem,
+            embedding_dim=self.embedding_dim,
+            partition_by=self.partition_by,
+            row_group_size=self.row_group_size,
+            max_rows_per_file=self.max_rows_per_file,
+        )
+        ds.write_datasink(sink, ray_remote_args=self.ray_remote_args)
+        return ds
+
+
 class DocToRowFilenameProvider(FilenameProvider):
     def __init__(self, filename_fn: Callable[[Document], str]):
         self._filename_fn = filename_fn
@@ -226,18 +312,70 @@ class _FileDataSink(Datasink):
         path: str,
         filesystem: Optional[FileSystem] = None,
         filename_fn: Callable[[Document], str] = default_filename,
-        doc_to_bytes_fn: Callable[[Document], bytes] = default_doc_to_bytes,
+        doc_to_bytes_fn: Optional[Callable[[Document], bytes]] = None,
         makedirs: bool = False,
+        bundle_format: Optional[str] = None,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE,
     ):
         (paths, self._filesystem) = _resolve_paths_and_filesystem(path, filesystem)
         self._root = paths[0]
         self._filename_fn = filename_fn
+        self._bundle_format = bundle_format
+        self._target_file_size = target_file_size
+        if doc_to_bytes_fn is None:
+            doc_to_bytes_fn = default_doc_to_bytes if bundle_format is None else BUNDLE_FORMATS[bundle_format]
         self._doc_to_bytes_fn = doc_to_bytes_fn
 
         if makedirs:
             self._filesystem.create_dir(path)
 
+    def _write_file(self, name: str, data: bytes) -> None:
+        with self._filesystem.open_output_stream(posixpath.join(self._root, name)) as file:
+            file.write(data)
+
+    def _write_bundles(self, blocks: Iterable[Block], ctx: TaskContext) -> None:
+        # Bundles from different tasks and different writes to the same path must not collide.
+        prefix = f"bundle_{ctx.task_idx}_{uuid.uuid4().hex}"
+        binary = self._bundle_format == "binary"
+        extension = BUNDLE_EXTENSION if binary else "jsonl"
+        count = 0
+        builder = BundleBuilder()
+        lines: list[bytes] = []
+        size = 0
+
+        def flush():
+            nonlocal builder, lines, size, count
+            data = builder.finish() if binary else b"".join(lines)
+            self._write_file(f"{prefix}_{count}.{extension}", data)
+            count += 1
+            builder = BundleBuilder()
+            lines = []
+            size = 0
+
+        for block in blocks:
+            for row in BlockAccessor.for_block(block).iter_rows(True):  # type: ignore[var-annotated]
+                doc = Document.from_row(row)
+                if isinstance(doc, MetadataDocument):
+                    continue
+                data = self._doc_to_bytes_fn(doc)
+                if binary:
+                    builder.add(doc.doc_id, data)
+                    size = builder.nbytes
+                else:
+                    if not data.endswith(b"\n"):
+                        data += b"\n"
+                    lines.append(data)
+                    size += len(data)
+                if size >= self._target_file_size:
+                    flush()
+        if size > 0:
+            flush()
+
     def write(self, blocks: Iterable[Block], ctx: TaskContext) -> Any:
+        if self._bundle_format is not None:
+            with TimeTrace("bundleSink"):
+                self._write_bundles(blocks, ctx)
+            return
         for block in blocks:
             b = BlockAccessor.for_block(block).to_arrow().to_pylist()
             for _, row in enumerate(b):
@@ -267,3 +405,48 @@ class _JsonBlockDataSink(BlockBasedFileDatasink):
                 del doc.binary_representation  # Doesn't make sense in JSON
                 binary = document_to_bytes(doc)
                 file.write(binary)
+
+
+class _ParquetDataSink(Datasink):
+    def __init__(
+        self,
+        path: str,
+        filesystem: Optional[FileSystem] = None,
+        embedding_dim: Optional[int] = None,
+        partition_by: Optional[list[str]] = None,
+        row_group_size: int = 10000,
+        max_rows_per_file: int = 0,
+    ) -> None:
+        (paths, self._filesystem) = _resolve_paths_and_filesystem(path, filesystem)
+        self._root = paths[0]
+        self._embedding_dim = embedding_dim
+        self._partition_by = partition_by or []
+        self._row_group_size = row_group_size
+        self._max_rows_per_file = max_rows_per_file
+
+    def write(self, blocks: Iterable[Block], ctx: TaskContext) -> Any:
+        with TimeTrace("parquetSink"):
+            docs = []
+            for block in blocks:
+                for row in BlockAccessor.for_block(block).iter_rows(True):  # type: ignore[var-annotated]
+                    docs.append(Document.from_row(row))
+            table = documents_to_table(docs, embedding_dim=self._embedding_dim, partition_by=self._partition_by)
+            if table.num_rows == 0:
+                return
+            partitioning = None
+            if self._partition_by:
+                partitioning = pads.partitioning(
+                    table.select([PARTITION_COLUMN_PREFIX + p for p in self._partition_by]).schema, flavor="hive"
+                )
+            pads.write_dataset(
+                table,
+                self._root,
+                format="parquet",
+                filesystem=self._filesystem,
+                partitioning=partitioning,
+                basename_template=f"part_{ctx.task_idx}_{uuid.uuid4().hex}_{{i}}.parquet",
+                max_rows_per_group=self._row_group_size,
+                min_rows_per_group=min(self._row_group_size, table.num_rows),
+                max_rows_per_file=self._max_rows_per_file,
+                existing_data_behavior="overwrite_or_ignore",
+            )
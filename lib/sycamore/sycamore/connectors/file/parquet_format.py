@@ -0,0 +1,230 @@
+"""
+Columnar layout used to store Documents in Parquet.
+
+Every top-level Document field that Sycamore knows about gets its own column, so that readers can prune
+columns (e.g. skip binary_representation or embedding) and engines like DuckDB or Spark can query the
+files directly. Properties are stored as a JSON string because their keys differ from document to
+document. Keys that do not fit the schema (table objects and tokens on elements, children of
+hierarchical documents, ...) are stored as a JSON object in the ``extra`` column.
+
+Both JSON columns can be read by any JSON parser. Tables, Documents and bytes are written as
+``{"__sycamore_type__": <type>, "value": <JSON value>}`` objects so that they round trip, numpy values
+become plain numbers and lists, and any other value that JSON cannot represent is stored as its string.
+"""
+
+import base64
+from collections import UserDict
+import json
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from sycamore.data import Document, HierarchicalDocument, MetadataDocument, Table
+
+PARTITION_COLUMN_PREFIX = "properties."
+
+_ELEMENT_FIELDS = ("type", "text_representation", "binary_representation", "bbox", "properties")
+_DOCUMENT_FIELDS = (
+    "doc_id",
+    "lineage_id",
+    "type",
+    "text_representation",
+    "binary_representation",
+    "parent_id",
+    "embedding",
+    "shingles",
+    "bbox",
+    "properties",
+    "elements",
+)
+
+_BBOX_TYPE = pa.list_(pa.float64())
+
+ELEMENT_TYPE = pa.struct(
+    [
+        ("type", pa.string()),
+        ("text_representation", pa.string()),
+        ("binary_representation", pa.binary()),
+        ("bbox", _BBOX_TYPE),
+        ("properties", pa.string()),
+        ("extra", pa.string()),
+    ]
+)
+
+
+def document_schema(embedding_dim: Optional[int] = None) -> pa.Schema:
+    """
+    Returns the arrow schema used for Documents.
+
+    Args:
+        embedding_dim: If set, embeddings are stored as a fixed size list of this many float32 values;
+            otherwise as a variable length list of float32. Parquet cannot store missing fixed size
+            lists, so every Document must have an embedding when this is set.
+    """
+    embedding_type = pa.list_(pa.float32(), embedding_dim) if embedding_dim else pa.list_(pa.float32())
+    return pa.schema(
+        [
+            ("doc_id", pa.string()),
+            ("lineage_id", pa.string()),
+            ("type", pa.string()),
+            ("text_representation", pa.string()),
+            ("binary_representation", pa.binary()),
+            ("parent_id", pa.string()),
+            ("embedding", embedding_type),
+            ("shingles", pa.list_(pa.int64())),
+            ("bbox", _BBOX_TYPE),
+            ("properties", pa.string()),
+            ("elements", pa.list_(ELEMENT_TYPE)),
+            ("extra", pa.string()),
+        ]
+    )
+
+
+_TYPE_KEY = "__sycamore_type__"
+
+
+class _SycamoreJSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, Table):
+            return {_TYPE_KEY: "table", "value": obj.to_dict()}
+        if isinstance(obj, Document):
+            return {_TYPE_KEY: "document", "value": obj.data}
+        if isinstance(obj, bytes):
+            return {_TYPE_KEY: "bytes", "value": base64.b64encode(obj).decode("ascii")}
+        if isinstance(obj, UserDict):
+            return obj.data
+        if isinstance(obj, (np.ndarray, np.generic)):
+            return obj.tolist()
+        return str(obj)
+
+
+def _object_hook(obj: dict[str, Any]) -> Any:
+    if len(obj) != 2 or _TYPE_KEY not in obj or "value" not in obj:
+        return obj
+    kind, value = obj[_TYPE_KEY], obj["value"]
+    if kind == "table":
+        return Table.from_dict(value)
+    if kind == "document":
+        return _data_to_document(value)
+    if kind == "bytes":
+        return base64.b64decode(value)
+    return obj
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, cls=_SycamoreJSONEncoder)
+
+
+def _loads(value: str) -> Any:
+    return json.loads(value, object_hook=_object_hook)
+
+
+def _properties_to_json(properties: Optional[dict[str, Any]]) -> Optional[str]:
+    return None if properties is None else _dumps(properties)
+
+
+def _extra_to_json(extra: dict[str, Any]) -> Optional[str]:
+    return _dumps(extra) if extra else None
+
+
+def _element_to_row(element: Any) -> dict[str, Any]:
+    data = element.data
+    extra = {k: v for k, v in data.items() if k not in _ELEMENT_FIELDS}
+    return {
+        "type": data.get("type"),
+        "text_representation": data.get("text_representation"),
+        "binary_representation": data.get("binary_representation"),
+        "bbox": data.get("bbox"),
+        "properties": _properties_to_json(data.get("properties")),
+        "extra": _extra_to_json(extra),
+    }
+
+
+def document_to_row(doc: Document) -> dict[str, Any]:
+    data = doc.data
+    extra = {k: v for k, v in data.items() if k not in _DOCUMENT_FIELDS}
+    return {
+        "doc_id": data.get("doc_id"),
+        "lineage_id": data.get("lineage_id"),
+        "type": data.get("type"),
+        "text_representation": data.get("text_representation"),
+        "binary_representation": data.get("binary_representation"),
+        "parent_id": data.get("parent_id"),
+        "embedding": data.get("embedding"),
+        "shingles": data.get("shingles"),
+        "bbox": data.get("bbox"),
+        "properties": _properties_to_json(data.get("properties")),
+        "elements": [_element_to_row(e) for e in data.get("elements", [])],
+        "extra": _extra_to_json(extra),
+    }
+
+
+def documents_to_table(
+    docs: Iterable[Document], embedding_dim: Optional[int] = None, partition_by: Optional[list[str]] = None
+) -> pa.Table:
+    """
+    Converts Documents into an arrow table using :func:`document_schema`. MetadataDocuments are skipped.
+
+    Args:
+        docs: The documents to convert.
+        embedding_dim: See :func:`document_schema`.
+        partition_by: Property names to copy into additional string columns named ``properties.<name>``,
+            for use as partitioning columns.
+    """
+    schema = document_schema(embedding_dim)
+    docs = [d for d in docs if not isinstance(d, MetadataDocument)]
+    if embedding_dim:
+        for d in docs:
+            if d.embedding is None or len(d.embedding) != embedding_dim:
+                raise ValueError(f"Document {d.doc_id} does not have an embedding of dimension {embedding_dim}")
+    table = pa.Table.from_pylist([document_to_row(d) for d in docs], schema=schema)
+    for name in partition_by or []:
+        values = [d.properties.get(name) for d in docs]
+        column = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+        table = table.append_column(PARTITION_COLUMN_PREFIX + name, column)
+    return table
+
+
+def _loads_properties(value: Optional[str]) -> dict[str, Any]:
+    return {} if value is None else _loads(value)
+
+
+def _data_to_document(data: dict[str, Any]) -> Document:
+    if "children" in data:
+        return HierarchicalDocument(data)
+    return Document(data)
+
+
+def _row_to_element(row: dict[str, Any]) -> dict[str, Any]:
+    element = {k: row[k] for k in ("type", "text_representation", "binary_representation") if row[k] is not None}
+    if row["bbox"] is not None:
+        element["bbox"] = tuple(row["bbox"])
+    element["properties"] = _loads_properties(row["properties"])
+    if row["extra"] is not None:
+        element.update(_loads(row["extra"]))
+    return element
+
+
+def row_to_document(row: dict[str, Any]) -> Document:
+    data: dict[str, Any] = {}
+    for k in ("doc_id", "lineage_id", "type", "text_representation", "binary_representation", "parent_id"):
+        if row.get(k) is not None:
+            data[k] = row[k]
+    for k in ("embedding", "shingles"):
+        if row.get(k) is not None:
+            data[k] = list(row[k])
+    if row.get("bbox") is not None:
+        data["bbox"] = tuple(row["bbox"])
+    data["properties"] = _loads_properties(row.get("properties"))
+    data["elements"] = [_row_to_element(e) for e in row.get("elements") or []]
+    if row.get("extra") is not None:
+        data.update(_loads(row["extra"]))
+    return _data_to_document(data)
+
+
+def table_to_documents(table: pa.Table) -> list[Document]:
+    """Converts an arrow table written by :func:`documents_to_table` back into Documents. Columns that are
+    missing (e.g. pruned on read) are left unset, and partitioning columns are ignored."""
+    columns = [c for c in table.column_names if c in _DOCUMENT_FIELDS or c == "extra"]
+    return [row_to_document(row) for row in table.select(columns).to_pylist()]
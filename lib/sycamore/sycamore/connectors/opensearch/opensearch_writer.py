@@ -4,11 +4,12 @@ from typing import Any, Optional
 from typing_extensions import TypeGuard
 
 from opensearchpy import OpenSearch
-from opensearchpy.exceptions import RequestError
-from opensearchpy.helpers import parallel_bulk
+from opensearchpy.exceptions import ConnectionError as OpenSearchConnectionError, RequestError, TransportError
+from opensearchpy.helpers import BulkIndexError
 
 from sycamore.data import Document
 from sycamore.connectors.base_writer import BaseDBWriter
+from sycamore.connectors.bulk import RETRYABLE_STATUSES, AdaptiveBulkWriter, BulkParams, BulkStats
 from sycamore.connectors.common import (
     HostAndPort,
     flatten_data,
@@ -29,6 +30,7 @@ class OpenSearchWriterClientParams(BaseDBWriter.ClientParams):
     ssl_assert_hostname: bool = True
     ssl_show_warn: bool = True
     timeout: Optional[int] = None
+    bulk_params: BulkParams = field(default_factory=BulkParams)
 
 
 @dataclass
@@ -78,8 +80,11 @@ class OpenSearchWriterTargetParams(BaseDBWriter.TargetParams):
 
 
 class OpenSearchWriterClient(BaseDBWriter.Client):
-    def __init__(self, os_client: OpenSearch):
+    def __init__(self, os_client: OpenSearch, bulk_params: Optional[BulkParams] = None):
         self._client = os_client
+        self._bulk_writer = AdaptiveBulkWriter(self._send_bulk, bulk_params or BulkParams(), _is_retryable_exception)
+        self._raise_on_error = (bulk_params or BulkParams()).raise_on_error
+        self.stats = BulkStats()
 
     @classmethod
     def from_client_params(cls, params: BaseDBWriter.ClientParams) -> "OpenSearchWriterClient":
@@ -87,9 +92,13 @@ class OpenSearchWriterClient(BaseDBWriter.Client):
             params, OpenSearchWriterClientParams
         ), f"Provided params was not of type OpenSearchWriterClientParams:\n{params}"
         paramsdict = asdict(params)
+        paramsdict.pop("bulk_params")
         os_client = OpenSearch(**paramsdict)
         os_client.ping()
-        return OpenSearchWriterClient(os_client)
+        return OpenSearchWriterClient(os_client, params.bulk_params)
+
+    def _send_bulk(self, lines: list[bytes]) -> Any:
+        return self._client.bulk(body=b"\n".join(lines) + b"\n")
 
     def write_many_records(self, records: list[BaseDBWriter.Record], target_params: BaseDBWriter.TargetParams):
         assert isinstance(
@@ -97,9 +106,29 @@ class OpenSearchWriterClient(BaseDBWriter.Client):
         ), f"Provided target_params was not of type OpenSearchWriterTargetParams:\n{target_params}"
         assert _narrow_list_of_os_records(records), f"A provided record was not of type OpenSearchRecord:\n{records}"
 
-        for success, info in parallel_bulk(self._client, [asdict(r) for r in records]):
-            if not success:
-                log.error("A Document failed to upload", info)
+        serializer = self._client.transport.serializer
+        items = [
+            [
+                serializer.dumps({"index": {"_index": r._index, "_id": r._id}}).encode("utf-8"),
+                serializer.dumps(r._source).encode("utf-8"),
+            ]
+            for r in records
+        ]
+        stats = self._bulk_writer.write(items)
+        self.stats.add(stats)
+        log.info(
+            "OpenSearch bulk write: %s; concurrency now %d. Cumulative: %s",
+            stats,
+            self._bulk_writer.concurrency,
+            self.stats,
+        )
+        if stats.failed > 0:
+            log.error("%d document(s) failed to upload: %s", stats.failed, stats.errors[:5])
+            if self._raise_on_error:
+                raise BulkIndexError(f"{stats.failed} document(s) failed to index.", stats.errors)
+
+    def close(self):
+        self._client.close()
 
     def create_target_idempotent(self, target_params: BaseDBWriter.TargetParams):
         assert isinstance(
@@ -174,6 +203,12 @@ class OpenSearchWriterRecord(BaseDBWriter.Record):
         return OpenSearchWriterRecord(_index=target_params.index_name, _id=document.doc_id, _source=result)
 
 
+def _is_retryable_exception(e: Exception) -> bool:
+    if isinstance(e, OpenSearchConnectionError):
+        return True
+    return isinstance(e, TransportError) and e.status_code in RETRYABLE_STATUSES
+
+
 def _narrow_list_of_os_records(records: list[BaseDBWriter.Record]) -> TypeGuard[list[OpenSearchWriterRecord]]:
     return all(isinstance(r, OpenSearchWriterRecord) for r in records)
 
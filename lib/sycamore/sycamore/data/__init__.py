@@ -1,6 +1,8 @@
 from sycamore.data.bbox import BoundingBox
+from sycamore.data.bbox_array import BoundingBoxArray
 from sycamore.data.table import Table
 from sycamore.data.element import Element, ImageElement, TableElement
+from sycamore.data.element_index import ElementIndex
 from sycamore.data.document import (
     Document,
     MetadataDocument,
@@ -12,10 +14,12 @@ from sycamore.data.document import (
 
 __all__ = [
     "BoundingBox",
+    "BoundingBoxArray",
     "Document",
     "MetadataDocument",
     "HierarchicalDocument",
     "Element",
+    "ElementIndex",
     "ImageElement",
     "TableElement",
     "OpenSearchQuery",
@@ -0,0 +1,200 @@
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from sycamore.data.bbox import BoundingBox
+from sycamore.data.element import Element
+
+
+class BoundingBoxArray:
+    """
+    A batch of N bounding boxes held as an N x 4 float array of (x1, y1, x2, y2) rows, for computing
+    overlaps between many boxes at once instead of pair by pair. Pairwise methods take a second array of
+    M boxes and return an N x M matrix whose [i, j] entry matches the corresponding BoundingBox method
+    called on box i of this array with box j of the other, e.g. iob()[i, j] == self[i].iob(other[j]).
+
+    Args:
+        coords: Anything numpy can turn into an N x 4 array, e.g. a list of [x1, y1, x2, y2] lists.
+    """
+
+    def __init__(self, coords: Any):
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 4)
+
+    @classmethod
+    def from_boxes(cls, boxes: Iterable[BoundingBox]) -> "BoundingBoxArray":
+        return cls([box.coordinates for box in boxes])
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[Element]) -> "BoundingBoxArray":
+        """
+        Returns the bounding boxes of elements, in order. Elements without a bounding box get a row of
+        NaNs, which overlaps and contains nothing.
+        """
+        nan = (np.nan,) * 4
+        return cls([nan if e.data.get("bbox") is None else e.data["bbox"][:4] for e in elements])
+
+    def to_boxes(self) -> list[BoundingBox]:
+        return [BoundingBox(*row) for row in self.coords.tolist()]
+
+    def to_list(self) -> list[list[float]]:
+        return self.coords.tolist()
+
+    def assign_to_elements(self, elements: Sequence[Element]) -> None:
+        """Sets the bounding box of each element to the corresponding row of this array."""
+        if len(elements) != len(self):
+            raise ValueError(f"Expected {len(self)} elements, got {len(elements)}")
+        for element, row in zip(elements, self.coords.tolist()):
+            element.data["bbox"] = tuple(row)
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __getitem__(self, index: Any) -> Union[BoundingBox, "BoundingBoxArray"]:
+        """An integer index returns a BoundingBox; a slice, mask or index array returns a BoundingBoxArray."""
+        if isinstance(index, (int, np.integer)):
+            return BoundingBox(*self.coords[index].tolist())
+        return BoundingBoxArray(self.coords[index])
+
+    def __repr__(self):
+        return f"BoundingBoxArray({self.coords.tolist()})"
+
+    @property
+    def x1(self) -> np.ndarray:
+        return self.coords[:, 0]
+
+    @property
+    def y1(self) -> np.ndarray:
+        return self.coords[:, 1]
+
+    @property
+    def x2(self) -> np.ndarray:
+        return self.coords[:, 2]
+
+    @property
+    def y2(self) -> np.ndarray:
+        return self.coords[:, 3]
+
+    @property
+    def width(self) -> np.ndarray:
+        return self.x2 - self.x1
+
+    @property
+    def height(self) -> np.ndarray:
+        return self.y2 - self.y1
+
+    @property
+    def area(self) -> np.ndarray:
+        return self.width * self.height
+
+    def is_empty(self) -> np.ndarray:
+        return (self.x1 >= self.x2) & (self.y1 >= self.y2)
+
+    def intersection_area(self, other: "BoundingBoxArray") -> np.ndarray:
+        """The N x M matrix of the areas of the intersections of each pair of boxes."""
+        width = np.minimum(self.x2[:, None], other.x2[None, :]) - np.maximum(self.x1[:, None], other.x1[None, :])
+        height = np.minimum(self.y2[:, None], other.y2[None, :]) - np.maximum(self.y1[:, None], other.y1[None, :])
+        # Boxes that do not meet have an empty intersection, whose area is 0. fmax also maps NaN rows to 0.
+        return np.fmax(width, 0) * np.fmax(height, 0)
+
+    def iou(self, other: "BoundingBoxArray") -> np.ndarray:
+        """
+        The N x M matrix of the intersection over union of each pair of boxes. Pairs whose union has no
+        area get 0 rather than raising ZeroDivisionError like BoundingBox.iou.
+        """
+        inter = self.intersection_area(other)
+        union = self.area[:, None] + other.area[None, :] - inter
+        return _safe_divide(inter, union)
+
+    def iob(self, other: "BoundingBoxArray") -> np.ndarray:
+        """The N x M matrix of the intersection of each pair over the area of the box from this array."""
+        area = self.area[:, None]
+        return np.where(area > 0, _safe_divide(self.intersection_area(other), area), 0.0)
+
+    def contains(self, other: "BoundingBoxArray") -> np.ndarray:
+        """The N x M boolean matrix of whether each box in this array contains each box in the other."""
+        return (
+            (self.x1[:, None] <= other.x1[None, :])
+            & (self.x2[:, None] >= other.x2[None, :])
+            & (self.y1[:, None] <= other.y1[None, :])
+            & (self.y2[:, None] >= other.y2[None, :])
+        )
+
+    def intersect(self, other: Union["BoundingBoxArray", BoundingBox]) -> "BoundingBoxArray":
+        """
+        The row by row intersection with an array of the same length, or of every row with a single box.
+        Rows that do not meet become the empty box (0, 0, 0, 0), as with BoundingBox.intersect.
+        """
+        theirs = np.asarray(other.coordinates, dtype=float) if isinstance(other, BoundingBox) else other.coords
+        coords = np.concatenate(
+            [np.maximum(self.coords[:, :2], theirs[..., :2]), np.minimum(self.coords[:, 2:], theirs[..., 2:])], axis=1
+        )
+        disjoint = (coords[:, 0] > coords[:, 2]) | (coords[:, 1] > coords[:, 3])
+        coords[disjoint] = 0.0
+        return BoundingBoxArray(coords)
+
+    def union(self) -> BoundingBox:
+        """The union of all the boxes, as with BoundingBox.from_union. Empty boxes are ignored."""
+        return BoundingBox(*self.union_by_group(np.zeros(len(self), dtype=int), 1).coords[0].tolist())
+
+    def union_by_group(self, groups: Any, num_groups: Optional[int] = None) -> "BoundingBoxArray":
+        """
+        The union of the boxes in each group, where groups[i] is the group number, from 0, of box i.
+        Empty boxes and NaN rows are ignored, and groups without a non-empty box get the empty box
+        (0, 0, 0, 0).
+
+        Args:
+            groups: The group of each box.
+            num_groups: The number of groups; defaults to one more than the largest group number.
+        """
+        groups = np.asarray(groups, dtype=int)
+        if num_groups is None:
+            num_groups = int(groups.max()) + 1 if len(groups) > 0 else 0
+        keep = ~self.is_empty() & ~np.isnan(self.coords).any(axis=1)
+        groups, coords = groups[keep], self.coords[keep]
+        mins = np.full((num_groups, 2), np.inf)
+        maxs = np.full((num_groups, 2), -np.inf)
+        np.minimum.at(mins, groups, coords[:, :2])
+        np.maximum.at(maxs, groups, coords[:, 2:])
+        result = np.concatenate([mins, maxs], axis=1)
+        result[np.isinf(mins[:, 0])] = 0.0
+        return BoundingBoxArray(result)
+
+    def nms(self, scores: Any, threshold: float, criteria: str = "iou") -> np.ndarray:
+        """
+        Greedy non-maxima suppression. Visits the boxes from the highest score to the lowest, ties in
+        their original order, and suppresses a box when its overlap with a higher scoring box that was
+        kept is at least threshold. Returns the indexes of the kept boxes, highest score first.
+
+        Args:
+            scores: The score of each box.
+            threshold: The overlap at which the lower scoring box is suppressed.
+            criteria: How to measure overlap: "iou", "object1_overlap" (the intersection over the area of
+                the higher scoring box) or "object2_overlap" (over the area of the lower scoring box).
+                Pairs where this divides by zero never suppress.
+        """
+        order = np.argsort(-np.asarray(scores, dtype=float), kind="stable")
+        boxes = BoundingBoxArray(self.coords[order])
+        inter = boxes.intersection_area(boxes)
+        area = boxes.area
+        # [i, j] measures how much lower scoring box i overlaps higher scoring box j.
+        if criteria == "iou":
+            denominator = area[:, None] + area[None, :] - inter
+        elif criteria == "object1_overlap":
+            denominator = np.broadcast_to(area[None, :], inter.shape)
+        elif criteria == "object2_overlap":
+            denominator = np.broadcast_to(area[:, None], inter.shape)
+        else:
+            raise ValueError(f"Unknown nms criteria: {criteria}")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            suppresses = (denominator != 0) & (inter / denominator >= threshold)
+        kept = np.ones(len(order), dtype=bool)
+        for i in range(len(order)):
+            if kept[i]:
+                kept[i + 1 :] &= ~suppresses[i + 1 :, i]
+        return order[kept]
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
@@ -5,6 +5,7 @@ import uuid
 
 from sycamore.data import BoundingBox, Element
 from sycamore.data.element import create_element
+from sycamore.data.element_index import ElementIndex
 
 
 class Document(UserDict):
@@ -13,6 +14,8 @@ class Document(UserDict):
     types of document may have different properties, they all contain the following common fields in Sycamore:
     """
 
+    _element_index: Optional[ElementIndex] = None
+
     def __init__(self, document=None, /, **kwargs):
         if isinstance(document, bytes):
             from pickle import loads
@@ -104,11 +107,33 @@ class Document(UserDict):
     def elements(self, elements: list[Element]):
         """Set the elements for this document."""
         self.data["elements"] = elements
+        self._element_index = None
 
     @elements.deleter
     def elements(self) -> None:
         """Delete the elements of this document."""
         self.data["elements"] = []
+        self._element_index = None
+
+    @property
+    def element_index(self) -> ElementIndex:
+        """An index of the elements by page. It is built on first use and rebuilt when elements are
+        added, removed, replaced or reordered; after changing the page numbers or bounding boxes of
+        elements in place, reassign the elements (``doc.elements = doc.elements``) to rebuild it."""
+        elements = self.elements
+        index = self._element_index
+        if index is None or not index.indexes(elements):
+            index = ElementIndex(elements)
+            self._element_index = index
+        return index
+
+    def elements_on_page(self, page_number: int) -> list[Element]:
+        """The elements on a page, in document order."""
+        return self.element_index.elements_on_page(page_number)
+
+    def elements_in_region(self, page_number: int, bbox: BoundingBox) -> list[Element]:
+        """The elements on a page whose bounding box overlaps bbox, in document order."""
+        return self.element_index.elements_in_region(page_number, bbox)
 
     @property
     def embedding(self) -> Optional[list[float]]:
@@ -251,6 +276,13 @@ class MetadataDocument(Document):
         del self.data["elements"]
         del self.data["properties"]
 
+    def serialize(self) -> bytes:
+        """Serialize this document to bytes. The metadata comes first, so that a serialized
+        MetadataDocument can be recognized without unpickling it."""
+        from pickle import dumps
+
+        return dumps({"metadata": self.data["metadata"], **self.data})
+
     # Override some of the common operations to make it hard to mis-use metadata. If any of these
     # are called it means that something tried to process a MetadataDocument as if it was a
     # Document.
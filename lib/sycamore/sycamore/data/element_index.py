@@ -0,0 +1,69 @@
+from bisect import bisect_right
+from typing import Any, Optional
+
+import numpy as np
+
+from sycamore.data.bbox import BoundingBox
+from sycamore.data.element import Element
+
+
+class _Page:
+    def __init__(self, positions: list[int], elements: list[Element]):
+        self.positions = positions
+        with_bbox = [(e.data["bbox"], p) for e, p in zip(elements, positions) if e.data.get("bbox") is not None]
+        with_bbox.sort(key=lambda b: b[0][1])
+        self.by_top = np.array([p for _, p in with_bbox], dtype=int)
+        coords = np.array([b[:4] for b, _ in with_bbox], dtype=float).reshape(-1, 4)
+        self.tops = coords[:, 1].tolist()
+        self.left = coords[:, 0]
+        self.right = coords[:, 2]
+        self.bottom = coords[:, 3]
+
+
+class ElementIndex:
+    """
+    An index of a list of elements by page, for finding the elements on a page, or in a region of a
+    page, without scanning the whole list. Elements without a page number are indexed under page None.
+
+    The index reflects the list when it was built; see Document.element_index for a cached index that
+    is rebuilt when the elements of a document are added, removed, replaced or reordered.
+
+    Args:
+        elements: The elements to index.
+    """
+
+    def __init__(self, elements: list[Element]):
+        self._elements = list(elements)
+        positions: dict[Any, list[int]] = {}
+        for i, e in enumerate(elements):
+            positions.setdefault(e.properties.get("page_number"), []).append(i)
+        self._pages = {page: _Page(members, [elements[i] for i in members]) for page, members in positions.items()}
+
+    def indexes(self, elements: list[Element]) -> bool:
+        """Whether this index was built from the same elements, in the same order."""
+        return len(elements) == len(self._elements) and all(a is b for a, b in zip(elements, self._elements))
+
+    @property
+    def page_numbers(self) -> list[Any]:
+        """The page numbers that have elements, in the order they first appear."""
+        return list(self._pages)
+
+    def elements_on_page(self, page_number: Optional[int]) -> list[Element]:
+        """Returns the elements on a page, in the order of the element list."""
+        page = self._pages.get(page_number)
+        if page is None:
+            return []
+        return [self._elements[i] for i in page.positions]
+
+    def elements_in_region(self, page_number: Optional[int], bbox: BoundingBox) -> list[Element]:
+        """
+        Returns the elements on a page whose bounding box overlaps bbox, edges included, in the order
+        of the element list. Elements without a bounding box are never in a region.
+        """
+        page = self._pages.get(page_number)
+        if page is None:
+            return []
+        # Only elements starting above the bottom of the region can overlap it.
+        end = bisect_right(page.tops, bbox.y2)
+        hits = (page.bottom[:end] >= bbox.y1) & (page.left[:end] <= bbox.x2) & (page.right[:end] >= bbox.x1)
+        return [self._elements[i] for i in np.sort(page.by_top[:end][hits]).tolist()]
@@ -71,6 +71,17 @@ class TableCell:
 
         return TableCell(**kwargs)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Returns a dict representation of this cell that :meth:`from_dict` accepts."""
+        return {
+            "content": self.content,
+            "rows": list(self.rows),
+            "cols": list(self.cols),
+            "is_header": self.is_header,
+            "bbox": self.bbox.to_dict() if self.bbox is not None else None,
+            "properties": self.properties,
+        }
+
 
 DEFAULT_HTML_STYLE = """
 table, th, td {
@@ -145,6 +156,15 @@ class Table:
 
         return ret
 
+    def to_dict(self) -> dict[str, Any]:
+        """Returns a dict representation of this table that :meth:`from_dict` accepts."""
+        return {
+            "cells": [c.to_dict() for c in self.cells],
+            "caption": self.caption,
+            "num_rows": self.num_rows,
+            "num_cols": self.num_cols,
+        }
+
     # TODO: There are likely edge cases where this will break or lose information. Nested or non-contiguous
     # headers are one likely source of issues. We also don't support missing closing tags (which are allowed in
     # the spec) because html.parser doesn't handle them. If and when this becomes an issue, we can consider
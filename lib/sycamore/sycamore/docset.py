@@ -4,7 +4,7 @@ import pprint
 import sys
 from typing import Callable, Optional, Any, Iterable, Type, Union
 
-from sycamore.context import Context
+from sycamore.context import Context, ExecMode
 from sycamore.data import Document, Element, MetadataDocument
 from sycamore.functions.tokenizer import Tokenizer
 from sycamore.lineage import Materialize, MaterializeMode
@@ -15,6 +15,7 @@ from sycamore.transforms.embed import Embedder
 from sycamore.transforms.extract_entity import EntityExtractor, OpenAIEntityExtractor
 from sycamore.transforms.extract_graph import GraphExtractor
 from sycamore.transforms.extract_schema import SchemaExtractor, PropertyExtractor
+from sycamore.transforms.llm_filter_cascade import CascadeFilter, LlmFilterCascade
 from sycamore.transforms.partition import Partitioner
 from sycamore.transforms.summarize import Summarizer
 from sycamore.transforms.llm_query import LLMTextQueryAgent
@@ -136,18 +137,9 @@ class DocSet:
                     .partition(partitioner=ArynPartitioner())
                     .count()
         """
-        from sycamore import Execution
-
-        execution = Execution(self.context, self.plan)
-        dataset = execution.execute(self.plan, **kwargs)
-        # We could parallelize like ray dataset.count() or optimize the metadata case, but it's not worth the complexity
-        count = 0
-        for row in dataset.iter_rows():
-            doc = Document.from_row(row)
-            if not include_metadata and isinstance(doc, MetadataDocument):
-                continue
-            count = count + 1
+        from sycamore.utils.aggregation import CountAggregation
 
+        (count,) = self._aggregate([CountAggregation()], include_metadata=include_metadata, **kwargs)
         return count
 
     def count_distinct(self, field: str, **kwargs) -> int:
@@ -170,19 +162,92 @@ class DocSet:
                     .partition(partitioner=ArynPartitioner())
                     .count("doc_id")
         """
+        from sycamore.utils.aggregation import CountDistinctAggregation
+
+        (count,) = self._aggregate([CountDistinctAggregation(field)], **kwargs)
+        return count
+
+    def _aggregate(self, aggregations: list, include_metadata: bool = False, **kwargs) -> list[Any]:
         from sycamore import Execution
+        from sycamore.utils.aggregation import aggregate
 
-        unique_docs = set()
         execution = Execution(self.context, self.plan)
         dataset = execution.execute(self.plan, **kwargs)
-        for row in dataset.iter_rows():
-            doc = Document.from_row(row)
-            if isinstance(doc, MetadataDocument):
-                continue
-            value = doc.field_to_value(field)
-            if value is not None and value != "None":
-                unique_docs.add(value)
-        return len(unique_docs)
+        return aggregate(dataset, aggregations, include_metadata=include_metadata)
+
+    def aggregate(self, field: str, **kwargs) -> dict[str, Any]:
+        """
+        Computes the count, sum, min, max and mean of the numeric values of a field in one pass. Each
+        block is aggregated where it lives and only the partial results are combined, so no Documents
+        are sent back to the driver. Documents where the field is missing or not numeric are skipped.
+
+        Args:
+            field: Field (in dotted notation) to aggregate, e.g. properties.page_count.
+            **kwargs
+
+        Returns:
+            A dict with keys "count", "sum", "min", "max" and "mean". min, max and mean are None if no
+            Document has a numeric value for field.
+
+        Example:
+             .. code-block:: python
+
+                stats = docset.aggregate("properties.page_count")
+                print(stats["mean"])
+        """
+        from sycamore.utils.aggregation import NumericAggregation
+
+        (result,) = self._aggregate([NumericAggregation(field)], **kwargs)
+        return result
+
+    def sum(self, field: str, **kwargs) -> float:
+        """Returns the sum of the numeric values of a field (in dotted notation). See :meth:`aggregate`."""
+        return self.aggregate(field, **kwargs)["sum"]
+
+    def min(self, field: str, **kwargs) -> Optional[float]:
+        """Returns the smallest numeric value of a field (in dotted notation). See :meth:`aggregate`."""
+        return self.aggregate(field, **kwargs)["min"]
+
+    def max(self, field: str, **kwargs) -> Optional[float]:
+        """Returns the largest numeric value of a field (in dotted notation). See :meth:`aggregate`."""
+        return self.aggregate(field, **kwargs)["max"]
+
+    def histogram(
+        self,
+        field: str,
+        bins: Union[int, list[float]] = 10,
+        value_range: Optional[tuple[float, float]] = None,
+        **kwargs,
+    ) -> tuple[list[int], list[float]]:
+        """
+        Counts the numeric values of a field falling into each bin, with the same conventions as
+        numpy.histogram: every bin is half-open except the last, and values outside the bins are ignored.
+
+        Args:
+            field: Field (in dotted notation) to compute the histogram of.
+            bins: Either the number of equal-width bins, or the list of bin edges.
+            value_range: The lower and upper edge when bins is a number. Defaults to the min and max of
+                the field, which costs an extra pass over the DocSet.
+            **kwargs
+
+        Returns:
+            The count for each bin and the bin edges, which have one more entry than the counts.
+
+        Example:
+             .. code-block:: python
+
+                counts, edges = docset.histogram("properties.page_count", bins=[0, 10, 100, 1000])
+        """
+        from sycamore.utils.aggregation import HistogramAggregation, histogram_edges
+
+        if isinstance(bins, int) and value_range is None:
+            stats = self.aggregate(field, **kwargs)
+            if stats["count"] == 0:
+                return [0] * bins, histogram_edges(bins, (0.0, 1.0))
+            value_range = (stats["min"], stats["max"])
+        edges = histogram_edges(bins, value_range or (0.0, 1.0))
+        (result,) = self._aggregate([HistogramAggregation(field, edges)], **kwargs)
+        return result
 
     def take(self, limit: int = 20, include_metadata: bool = False, **kwargs) -> list[Document]:
         """
@@ -817,6 +882,7 @@ class DocSet:
         prompt: Union[list[dict], str],
         field: Optional[str] = "text_representation",
         threshold: int = 3,
+        cascade: Optional[LlmFilterCascade] = None,
         **resource_args,
     ) -> "DocSet":
         """
@@ -829,7 +895,11 @@ class DocSet:
             prompt: LLM prompt.
             field: Document field to filter based on.
             threshold: Cutoff that determines whether or not to keep document.
-            **resource_args
+            cascade: If set, a cheap pre-filter decides the clearly relevant and irrelevant documents
+                and only the rest are sent to the LLM. See sycamore.transforms.llm_filter_cascade.
+            **resource_args: Passed to the cascade, if any, and to the filter. Without a ``compute``
+                argument the cascade runs in a pool of up to ``cascade.max_actors`` actors, and no
+                more than the cluster has CPUs.
 
         Returns:
             A filtered DocSet.
@@ -849,7 +919,26 @@ class DocSet:
         entity_extractor = OpenAIEntityExtractor(
             entity_name=new_field, llm=llm, use_elements=False, prompt=prompt, field=field
         )
-        docset = docset.extract_entity(entity_extractor=entity_extractor)
+        if cascade is None:
+            docset = docset.extract_entity(entity_extractor=entity_extractor)
+        else:
+            from ray.data import ActorPoolStrategy
+
+            assert field is not None, "The LLM filter cascade needs a field to score"
+            # A class, so that a cascade without reject_below calibrates on the first documents it sees.
+            # Classes default to a single actor, which would serialize all of the LLM calls.
+            max_actors = cascade.max_actors
+            if self.context.exec_mode == ExecMode.RAY:
+                import ray
+
+                # Ray counts pending actors against the cluster, so a pool that cannot fit never dispatches.
+                max_actors = max(1, min(max_actors, int(ray.cluster_resources().get("CPU", 1))))
+            cascade_args = {"compute": ActorPoolStrategy(min_size=1, max_size=max_actors), **resource_args}
+            docset = docset.map_batch(
+                CascadeFilter,
+                f_constructor_args=[cascade, entity_extractor, field, new_field, threshold],
+                **cascade_args,
+            )
         docset = docset.filter(lambda doc: threshold_filter(doc, threshold), **resource_args)
 
         return docset
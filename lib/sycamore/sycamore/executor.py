@@ -50,5 +50,6 @@ class Execution:
             assert n.children[0] is not None
             return n.local_execute(self.recursive_execute(n.children[0]))
 
-        assert f"Unable to handle node {n} with multiple children"
-        return []
+        assert hasattr(n, "local_execute"), f"Node {n.__class__.__name__} needs a local_execute method"
+        assert all(c is not None for c in n.children)
+        return n.local_execute(*[self.recursive_execute(c) for c in n.children if c is not None])
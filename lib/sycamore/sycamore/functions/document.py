@@ -43,15 +43,9 @@ def split_and_convert_to_image(doc: Document) -> list[Document]:
     else:
         return [doc]
 
-    elements_by_page: dict[int, list[Element]] = {}
-
-    for e in doc.elements:
-        page_number = e.properties["page_number"]
-        elements_by_page.setdefault(page_number, []).append(e)
-
     new_docs = []
     for page, image in enumerate(images):
-        elements = elements_by_page.get(page + 1, [])
+        elements = doc.elements_on_page(page + 1)
         new_doc = Document(binary_representation=image.tobytes(), elements=elements)
         new_doc.properties.update(doc.properties)
         new_doc.properties.update({"size": list(image.size), "mode": image.mode, "page_number": page + 1})
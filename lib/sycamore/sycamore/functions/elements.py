@@ -1,24 +1,36 @@
 import functools
-from typing import Callable
+from typing import Any, Callable, Optional
 
 from sycamore.data import Document, Element
 
 
 def reorder_elements(
     document: Document,
-    comparator: Callable[[Element, Element], int],
+    comparator: Optional[Callable[[Element, Element], int]] = None,
+    *,
+    key: Optional[Callable[[Element], Any]] = None,
 ) -> Document:
     """Reorders the elements.
 
     Args:
         document: Document for which the elements need to be re-ordered
         comparator: A comparator function
+        key: A key function, as for list.sort; use instead of comparator. It is called once per element
+            rather than once per comparison. Unlike the partitioner comparators, which raise a RuntimeError
+            for an element without a bbox, the partitioner keys sort such elements into the left column.
 
     Returns:
         Document with elements re-ordered
     """
+    if (comparator is None) == (key is None):
+        raise ValueError("reorder_elements requires exactly one of comparator and key")
+    if key is None:
+        assert comparator is not None
+        key = functools.cmp_to_key(comparator)
     elements = document.elements
-    elements.sort(key=functools.cmp_to_key(comparator))
+    # Like a comparator, which is never called for fewer than two elements, a key may reject lone elements.
+    if len(elements) > 1:
+        elements.sort(key=key)
     document.elements = elements
     return document
 
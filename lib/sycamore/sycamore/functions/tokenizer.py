@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Optional, Union, cast
 
 
 class Tokenizer(ABC):
@@ -7,6 +7,25 @@ class Tokenizer(ABC):
     def tokenize(self, text: str, as_ints: bool = False) -> Union[list[int], list[str]]:
         pass
 
+    def count_tokens(self, text: str) -> int:
+        """Returns len(self.tokenize(text)); subclasses avoid building the tokens where they can."""
+        return len(self.tokenize(text))
+
+    def tokenize_batch(self, texts: list[str], as_ints: bool = False) -> list[Union[list[int], list[str]]]:
+        """Tokenizes each of the texts, as tokenize would."""
+        return [self.tokenize(text, as_ints=as_ints) for text in texts]
+
+    def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """Returns the number of tokens in each of the texts, as count_tokens would."""
+        return [self.count_tokens(text) for text in texts]
+
+    def token_offsets(self, text: str) -> Optional[list[tuple[int, int]]]:
+        """
+        Returns the [start, end) character span in text of each token, in order, or None if the
+        tokenizer cannot provide them.
+        """
+        return None
+
 
 class OpenAITokenizer(Tokenizer):
     def __init__(self, model_name: str):
@@ -21,6 +40,23 @@ class OpenAITokenizer(Tokenizer):
         tokens = self._tk.decode_batch([[id] for id in token_ids])
         return tokens
 
+    def count_tokens(self, text: str) -> int:
+        return len(self._tk.encode(text))
+
+    def tokenize_batch(self, texts: list[str], as_ints: bool = False) -> list[Union[list[int], list[str]]]:
+        batch = self._tk.encode_batch(texts)
+        if as_ints:
+            return cast(list[Union[list[int], list[str]]], batch)
+        return [self._tk.decode_batch([[id] for id in token_ids]) for token_ids in batch]
+
+    def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        # encode_batch spreads the texts over a thread pool; tiktoken releases the GIL while encoding.
+        return [len(token_ids) for token_ids in self._tk.encode_batch(texts)]
+
+    def token_offsets(self, text: str) -> Optional[list[tuple[int, int]]]:
+        _, starts = self._tk.decode_with_offsets(self._tk.encode(text))
+        return list(zip(starts, starts[1:] + [len(text)]))
+
 
 class CharacterTokenizer(Tokenizer):
     def tokenize(self, text: str, as_ints: bool = False):
@@ -28,6 +64,12 @@ class CharacterTokenizer(Tokenizer):
             return [ord(c) for c in text]
         return list(text)
 
+    def count_tokens(self, text: str) -> int:
+        return len(text)
+
+    def token_offsets(self, text: str) -> Optional[list[tuple[int, int]]]:
+        return [(i, i + 1) for i in range(len(text))]
+
 
 class HuggingFaceTokenizer(Tokenizer):
     def __init__(self, model_name: str):
@@ -39,3 +81,26 @@ class HuggingFaceTokenizer(Tokenizer):
         if as_ints:
             return self._tk.encode(text)
         return self._tk.tokenize(text)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self._tk(text, add_special_tokens=False)["input_ids"])
+
+    def tokenize_batch(self, texts: list[str], as_ints: bool = False) -> list[Union[list[int], list[str]]]:
+        if not texts:
+            return []
+        if as_ints:
+            return self._tk(texts)["input_ids"]
+        batch = self._tk(texts, add_special_tokens=False)["input_ids"]
+        return [self._tk.convert_ids_to_tokens(token_ids) for token_ids in batch]
+
+    def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        if not texts:
+            return []
+        return [len(token_ids) for token_ids in self._tk(texts, add_special_tokens=False)["input_ids"]]
+
+    def token_offsets(self, text: str) -> Optional[list[tuple[int, int]]]:
+        # Only the Rust-backed "fast" tokenizers track offsets.
+        if not self._tk.is_fast:
+            return None
+        encoding = self._tk(text, add_special_tokens=False, return_offsets_mapping=True)
+        return [tuple(span) for span in encoding["offset_mapping"]]
@@ -29,7 +29,8 @@ from sycamore.utils.cache import S3Cache
 from sycamore.query.execution.sycamore_executor import SycamoreExecutor
 from sycamore.query.logical_plan import LogicalPlan
 from sycamore.query.planner import LlmPlanner
-from sycamore.query.schema import OpenSearchSchema
+from sycamore.query.result_cache import QueryCache, plan_cache_key, result_cache_key
+from sycamore.query.schema import OpenSearchSchema, SchemaCache, get_index_version
 from sycamore.query.visualize import visualize_plan
 
 from rich.console import Console
@@ -99,6 +100,10 @@ class SycamoreQueryClient:
         os_config (optional): OpenSearch configuration. Defaults to DEFAULT_OS_CONFIG.
         os_client_args (optional): OpenSearch client arguments. Defaults to DEFAULT_OS_CLIENT_ARGS.
         trace_dir (optional): Directory to write query execution trace.
+        cache (optional): Cache for generated plans and query results. Defaults to a new in-memory QueryCache.
+        use_cache (optional): If False, every query is planned and executed from scratch.
+        schema_cache (optional): Cache for index schemas, which can be shared between clients.
+            Defaults to a new SchemaCache.
     """
 
     def __init__(
@@ -107,11 +112,16 @@ class SycamoreQueryClient:
         os_config: dict = DEFAULT_OS_CONFIG,
         os_client_args: dict = DEFAULT_OS_CLIENT_ARGS,
         trace_dir: Optional[str] = None,
+        cache: Optional[QueryCache] = None,
+        use_cache: bool = True,
+        schema_cache: Optional[SchemaCache] = None,
     ):
         self.s3_cache_path = s3_cache_path
         self.os_config = os_config
         self.os_client_args = os_client_args
         self.trace_dir = trace_dir
+        self.cache = (cache or QueryCache()) if use_cache else None
+        self.schema_cache = schema_cache or SchemaCache()
 
         self._os_client = OpenSearch(**self.os_client_args)
         self._os_query_executor = OpenSearchQueryExecutor(self.os_client_args)
@@ -122,10 +132,12 @@ class SycamoreQueryClient:
         return indices
 
     def get_opensearch_schema(self, index: str) -> dict:
-        """Get the schema for the provided OpenSearch index."""
-        schema_provider = OpenSearchSchema(IndicesClient(self._os_client), index, self._os_query_executor)
-        schema = schema_provider.get_schema()
-        return schema
+        """Get the schema for the provided OpenSearch index, reusing the cached schema while the index is unchanged."""
+        indices_client = IndicesClient(self._os_client)
+        schema_provider = OpenSearchSchema(indices_client, index, self._os_query_executor)
+        return self.schema_cache.get(
+            index, lambda: get_index_version(indices_client, index), schema_provider.get_schema
+        )
 
     def generate_plan(self, query: str, index: str, schema: dict) -> LogicalPlan:
         """Generate a logical query plan for the given query, index, and schema."""
@@ -156,13 +168,42 @@ class SycamoreQueryClient:
         result = executor.execute(plan, query_id)
         return (query_id, result)
 
+    def get_index_version(self, index: str) -> tuple[int, int, int, int]:
+        """Returns a value that changes whenever documents are added to, updated in or deleted from the index."""
+        return get_index_version(IndicesClient(self._os_client), index)
+
     def query(self, query: str, index: str, dry_run: bool = False) -> str:
-        """Run a query against the given index."""
+        """Run a query against the given index, reusing cached plans and results when possible."""
         schema = self.get_opensearch_schema(index)
-        plan = self.generate_plan(query, index, schema)
+        if self.cache is None:
+            plan = self.generate_plan(query, index, schema)
+            _, result = self.run_plan(plan, dry_run=dry_run)
+            return result
+
+        plan_key = plan_cache_key(query, index, schema)
+        cached_plan: Optional[LogicalPlan] = self.cache.plans.get(plan_key)
+        if cached_plan is None:
+            plan = self.generate_plan(query, index, schema)
+            self.cache.plans.set(plan_key, plan, index)
+        else:
+            plan = cached_plan
+
+        result_key = result_cache_key(plan, index, self.get_index_version(index), dry_run)
+        cached_result: Optional[str] = self.cache.results.get(result_key)
+        if cached_result is not None:
+            return cached_result
         _, result = self.run_plan(plan, dry_run=dry_run)
+        # A DocSet result is only a plan that runs again when it is consumed, so caching it saves nothing.
+        if isinstance(result, (str, int, float, list, dict)):
+            self.cache.results.set(result_key, result, index)
         return result
 
+    def invalidate_cache(self, index: Optional[str] = None):
+        """Drop cached plans and results, for all indices or only for the given one."""
+        if self.cache is not None:
+            self.cache.invalidate(index)
+        self.schema_cache.invalidate(index)
+
     def dump_traces(self, logfile: str, query_id: Optional[str] = None):
         """Dump traces from the given logfile."""
         with open(logfile, "r", encoding="utf-8") as f:
@@ -0,0 +1,186 @@
+"""
+Translation of query plan Filter and Count nodes into OpenSearch queries and aggregations.
+
+A node is only translated when OpenSearch computes the same answer as the Ray implementation in
+operations.py, which depends on how the field is mapped. Anything else returns None and is left to Ray.
+"""
+
+from typing import Any, NamedTuple, Optional
+
+from opensearchpy import OpenSearch
+
+from sycamore.query.execution.operations import convert_string_to_date
+from sycamore.query.operators.filter import Filter
+
+NUMERIC_TYPES = {
+    "long",
+    "integer",
+    "short",
+    "byte",
+    "double",
+    "float",
+    "half_float",
+    "scaled_float",
+    "unsigned_long",
+}
+
+# Largest number of buckets requested from a terms aggregation; beyond this distinct values are
+# counted by paging through a composite aggregation.
+MAX_TERMS = 10000
+
+
+def get_field_mappings(client: OpenSearch, index: str, fields: list[str]) -> dict[str, dict[str, Any]]:
+    """Returns the mapping of each of the fields that exists in the index, keyed by field name."""
+    response = client.indices.get_field_mapping(fields=fields or ["_id"], index=index)
+    mappings = {}
+    for index_mappings in response.values():
+        for name, entry in index_mappings.get("mappings", {}).items():
+            leaf = name.rsplit(".", 1)[-1]
+            mapping = entry.get("mapping", {}).get(leaf)
+            if mapping is not None:
+                mappings[name] = mapping
+    return mappings
+
+
+def keyword_field(field: str, mapping: dict[str, Any]) -> Optional[str]:
+    """
+    Returns the name of the keyword (sub)field holding the exact value of field, if there is one. Keyword
+    fields with ignore_above do not index longer values, so matches and counts on them can miss documents
+    that Ray would find; they are not used.
+    """
+    if mapping.get("type") == "keyword":
+        return field if "ignore_above" not in mapping else None
+    for name, sub_mapping in mapping.get("fields", {}).items():
+        if sub_mapping.get("type") == "keyword" and "ignore_above" not in sub_mapping:
+            return f"{field}.{name}"
+    return None
+
+
+def _escape_wildcard(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("*", "\\*").replace("?", "\\?")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def filter_to_clause(node: Filter, mapping: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """
+    Translates a Filter node into an OpenSearch filter clause, or returns None if OpenSearch cannot
+    evaluate it with the semantics of match_filter_batch / range_filter_batch.
+
+    String matches become case-insensitive substring wildcards on a keyword field without ignore_above.
+    Number matches and ranges need a numeric field, and date ranges a date field.
+    """
+    if mapping is None:
+        return None
+    field_type = mapping.get("type")
+    field = node.field
+
+    if node.range_filter:
+        bounds: dict[str, Any] = {}
+        if node.date:
+            if field_type != "date":
+                return None
+            for op, value in (("gte", node.start), ("lte", node.end)):
+                if value:
+                    if not isinstance(value, str):
+                        return None
+                    bounds[op] = convert_string_to_date(value).isoformat()
+        else:
+            if field_type not in NUMERIC_TYPES:
+                return None
+            for op, value in (("gte", node.start), ("lte", node.end)):
+                if value is not None:
+                    if not _is_number(value):
+                        return None
+                    bounds[op] = value
+        # Without bounds the Ray implementation raises, so let it.
+        if not bounds:
+            return None
+        if node.date:
+            # Bounds are ISO 8601, whatever format the field is mapped with.
+            bounds["format"] = "strict_date_optional_time"
+        return {"range": {field: bounds}}
+
+    query = node.query
+    if isinstance(query, str):
+        keyword = keyword_field(field, mapping)
+        if keyword is None:
+            return None
+        return {"wildcard": {keyword: {"value": f"*{_escape_wildcard(query)}*", "case_insensitive": True}}}
+    if (isinstance(query, bool) and field_type == "boolean") or (_is_number(query) and field_type in NUMERIC_TYPES):
+        return {"term": {field: query}}
+    return None
+
+
+def count_field(field: str, mapping: Optional[dict[str, Any]]) -> Optional[str]:
+    """Returns the field to aggregate on to count the distinct values of field, or None if there is none."""
+    if mapping is None:
+        return None
+    if mapping.get("type") in NUMERIC_TYPES or mapping.get("type") == "boolean":
+        return field
+    return keyword_field(field, mapping)
+
+
+def bool_query(clauses: list[dict[str, Any]]) -> dict[str, Any]:
+    """Returns a query matching the documents that satisfy every clause."""
+    if not clauses:
+        return {"match_all": {}}
+    return {"bool": {"filter": clauses}}
+
+
+def _count_bucket(bucket: dict[str, Any]) -> bool:
+    # count_distinct skips the string "None", which is how missing values are often stored.
+    key = bucket["key"]
+    if isinstance(key, dict):
+        key = key["value"]
+    return key != "None"
+
+
+def opensearch_count(
+    os_client_args: dict, index: str, query: dict[str, Any], field: Optional[str] = None, client=None
+) -> int:
+    """
+    Counts the documents matching query, or the distinct values of field among them, with a single
+    ``size: 0`` search. Only when a field has more than MAX_TERMS distinct values are further requests
+    made, paging through a composite aggregation so the count stays exact.
+
+    Args:
+        os_client_args: Keyword arguments for the OpenSearch client.
+        index: The index to count in.
+        query: The OpenSearch query selecting the documents.
+        field: If set, the field whose distinct values are counted, as returned by count_field.
+        client: An existing OpenSearch client to use instead of creating one.
+    """
+    client = client or OpenSearch(**os_client_args)
+    if field is None:
+        response = client.search(index=index, body={"size": 0, "track_total_hits": True, "query": query})
+        return response["hits"]["total"]["value"]
+
+    body: dict[str, Any] = {
+        "size": 0,
+        "query": query,
+        "aggs": {"values": {"terms": {"field": field, "size": MAX_TERMS}}},
+    }
+    values = client.search(index=index, body=body)["aggregations"]["values"]
+    if values.get("sum_other_doc_count", 0) == 0:
+        return sum(1 for bucket in values["buckets"] if _count_bucket(bucket))
+
+    composite: dict[str, Any] = {"size": MAX_TERMS, "sources": [{"value": {"terms": {"field": field}}}]}
+    body["aggs"] = {"values": {"composite": composite}}
+    count = 0
+    while True:
+        values = client.search(index=index, body=body)["aggregations"]["values"]
+        count += sum(1 for bucket in values["buckets"] if _count_bucket(bucket))
+        if "after_key" not in values or not values["buckets"]:
+            return count
+        composite["after"] = values["after_key"]
+
+
+class OpenSearchPushdown(NamedTuple):
+    """A plan node evaluated by OpenSearch: the index and filter clauses selecting its documents."""
+
+    index_name: str
+    clauses: list[dict[str, Any]]
+    count_field: Optional[str] = None
@@ -1,8 +1,10 @@
+from functools import lru_cache
 import json
 from typing import Any, Callable, List, Optional, Union
 
 from datetime import datetime
 from dateutil import parser
+import numpy as np
 from ray.data import Dataset
 
 from sycamore import DocSet, Execution
@@ -10,6 +12,7 @@ from sycamore.data import Document, MetadataDocument
 from sycamore.llms.openai import OpenAI
 from sycamore.plan_nodes import Node, Transform
 from sycamore.transforms.extract_entity import OpenAIEntityExtractor
+from sycamore.transforms.join import DEFAULT_BROADCAST_THRESHOLD, HashJoin
 from sycamore.utils.extract_json import extract_json
 from sycamore.plan_nodes import Scan
 
@@ -45,9 +48,11 @@ into one of the following groups: "{groups}". Perform your best work to assign t
 ONLY the string corresponding to the selected group. Here is the database entry you will use: """
 
 
+@lru_cache(maxsize=65536)
 def convert_string_to_date(date_string: str) -> datetime:
     """
-    Creates datetime object given a date string.
+    Creates datetime object given a date string. Results are cached, since dates in a field
+    usually repeat and parsing is far more expensive than a lookup.
 
     Args:
         date_string: The string that contains the date in any format.
@@ -158,6 +163,124 @@ def range_filter_operation(
     return value_comp >= start_comp and value_comp <= end_comp
 
 
+def _field_column(docs: list[Document], field: str) -> np.ndarray:
+    column = np.empty(len(docs), dtype=object)
+    column[:] = [doc.field_to_value(field) for doc in docs]
+    return column
+
+
+def match_filter_batch(docs: list[Document], query: Any, field: str, ignore_case: bool = True) -> list[Document]:
+    """
+    Batch version of match_filter_operation: keeps the documents that match the query on the specified
+    field. The field is extracted into a column once and matched with vectorized string operations.
+
+    Args:
+        docs: Documents to filter.
+        query: Query to match for.
+        field: Document field that is used for filtering.
+        ignore_case: Determines case sensitivity for strings.
+
+    Returns:
+        The documents that match.
+
+    Example:
+        .. code-block:: python
+
+        docset = docset.map_batch(
+            lambda docs: match_filter_batch(docs, query="Cessna", field="properties.entity.aircraft")
+        )
+    """
+    if not docs:
+        return []
+    values = _field_column(docs, field)
+    is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+    if isinstance(query, str):
+        is_str[:] = True
+
+    mask = np.zeros(len(values), dtype=bool)
+    if is_str.any():
+        # substring matching
+        # A fixed-width numpy string array would pad every value to the longest one, so match in Python.
+        needle = str(query).lower() if ignore_case else str(query)
+        if ignore_case:
+            matches = [needle in str(v).lower() for v in values[is_str]]
+        else:
+            matches = [needle in str(v) for v in values[is_str]]
+        mask[is_str] = matches
+    if not is_str.all():
+        # if not string, exact match
+        mask[~is_str] = np.fromiter((query == v for v in values[~is_str]), dtype=bool)
+    return [doc for doc, keep in zip(docs, mask) if keep]
+
+
+def _date_column(values: np.ndarray) -> np.ndarray:
+    if not all(isinstance(v, str) for v in values):
+        raise ValueError("value must be a string for date filtering")
+    distinct, inverse = np.unique(values.astype(str), return_inverse=True)
+    parsed = np.array([convert_string_to_date(v) for v in distinct], dtype="datetime64[us]")
+    return parsed[inverse]
+
+
+def _range_bound(bound: Optional[Any], date: Optional[bool], name: str) -> Optional[Any]:
+    if not date:
+        return bound
+    if not bound:
+        return None
+    if not isinstance(bound, str):
+        raise ValueError(f"{name} must be a string for date filtering")
+    return np.datetime64(convert_string_to_date(bound), "us")
+
+
+def range_filter_batch(
+    docs: list[Document],
+    field: str,
+    start: Optional[Any] = None,
+    end: Optional[Any] = None,
+    date: Optional[bool] = False,
+) -> list[Document]:
+    """
+    Batch version of range_filter_operation: keeps the documents for which the value of the specified
+    field is within the start:end range. The field is extracted into a column once and compared as a
+    whole; for date ranges each distinct date string is parsed only once.
+
+    Args:
+        docs: Documents to filter.
+        field: Document field to filter based on.
+        start: Value for start of range.
+        end: Value for end of range.
+        date: Indicates whether start:end is a date range.
+
+    Returns:
+        The documents within the range.
+
+    Example:
+        .. code-block:: python
+
+        docset = docset.map_batch(
+            lambda docs: range_filter_batch(docs, "properties.date", "July 1, 2020", "July 30, 2020", True)
+        )
+    """
+    start_comp = _range_bound(start, date, "start")
+    end_comp = _range_bound(end, date, "end")
+    if start_comp is None and end_comp is None:
+        raise ValueError("At least one of start or end must be specified")
+    if not docs:
+        return []
+
+    values = _field_column(docs, field)
+    if date:
+        values = _date_column(values)
+    elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        values = values.astype(float)
+
+    mask = np.ones(len(values), dtype=bool)
+    if start_comp is not None:
+        mask &= np.asarray(values >= start_comp, dtype=bool)
+    if end_comp is not None:
+        mask &= np.asarray(values <= end_comp, dtype=bool)
+    return [doc for doc, keep in zip(docs, mask) if keep]
+
+
 def math_operation(val1: int, val2: int, operator: str) -> Union[int, float]:
     """
     Basic arithmetic operations on integers.
@@ -242,57 +365,50 @@ def llm_generate_operation(
     return completion
 
 
-def make_filter_fn_join(field: str, join_set: set) -> Callable[[Document], bool]:
+def join_operation(
+    docset1: DocSet,
+    docset2: DocSet,
+    field1: str,
+    field2: str,
+    how: str = "semi",
+    broadcast_threshold: int = DEFAULT_BROADCAST_THRESHOLD,
+) -> DocSet:
     """
-    Creates a filter function that can be called on a DocSet. Document
-    will be kept if the value corresponding to document field is contained
-    in join_set.
+    Joins two docsets based on specified fields; by default docset2 filtered based on values of docset1.
 
     Args:
-        field: Document field to filter based on
-        join_set: Set that contains valid field values.
+        docset1: DocSet to filter based on.
+        docset2: DocSet whose documents are returned.
+        field1: Field in docset1 to join on.
+        field2: Field in docset2 to join on.
+        how: "semi" returns each document of docset2 whose field2 matches field1 of some document in
+            docset1, unchanged. "inner" returns it once per matching docset1 document instead, with the
+            properties of that document added to its own.
+        broadcast_threshold: Largest size in bytes of the join keys and properties of docset1 that are
+            broadcast to every task; above that, both sides are shuffled by key.
 
     Returns:
-        Function that can be called inside of DocSet.filter
+        A joined DocSet.
     """
-
-    def filter_fn_join(doc: Document) -> bool:
-        value = doc.field_to_value(field)
-        return value in join_set
-
-    return filter_fn_join
+    join = HashJoin(docset1.plan, docset2.plan, field1, field2, how=how, broadcast_threshold=broadcast_threshold)
+    return DocSet(docset2.context, join)
 
 
-def join_operation(docset1: DocSet, docset2: DocSet, field1: str, field2: str) -> DocSet:
+def materialize_docset(docset: DocSet, **kwargs) -> DocSet:
     """
-    Joins two docsets based on specified fields; docset2 filtered based on values of docset1.
+    Executes a DocSet once and returns a DocSet that reads the result back instead of re-executing the
+    plan. The result is kept in the Ray object store, which spills to disk under memory pressure.
 
     Args:
-        docset1: DocSet to filter based on.
-        docset2: DocSet to filter.
-        field1: Field in docset1 to filter based on.
-        field2: Field in docset2 to filter.
+        docset: DocSet to execute.
+        **kwargs
 
     Returns:
-        A joined DocSet.
+        A DocSet over the materialized result.
     """
-    execution = Execution(docset1.context, docset1.plan)
-    dataset = execution.execute(docset1.plan)
-
-    # identifies unique values of field1 in docset1
-    unique_vals = set()
-    for row in dataset.iter_rows():
-        doc = Document.from_row(row)
-        if isinstance(doc, MetadataDocument):
-            continue
-        value = doc.field_to_value(field1)
-        unique_vals.add(value)
-
-    # filters docset2 based on matches of field2 with unique values
-    filter_fn_join = make_filter_fn_join(field2, unique_vals)
-    joined_docset = docset2.filter(lambda doc: filter_fn_join(doc))
-
-    return joined_docset
+    execution = Execution(docset.context, docset.plan)
+    dataset = execution.execute(docset.plan, **kwargs).materialize()
+    return DocSet(docset.context, DatasetScan(dataset))
 
 
 def count_aggregate_operation(docset: DocSet, field, unique_field, **kwargs) -> DocSet:
@@ -345,7 +461,7 @@ def top_k_operation(
     """
 
     if use_llm:
-        docset = semantic_cluster(client, docset, description, field)
+        docset = semantic_cluster(client, docset, description, field, **kwargs)
         field = "properties._autogen_ClusterAssignment"
 
     docset = count_aggregate_operation(docset, field, unique_field, **kwargs)
@@ -358,7 +474,7 @@ def top_k_operation(
     return docset
 
 
-def semantic_cluster(client: OpenAI, docset: DocSet, description: str, field: str) -> DocSet:
+def semantic_cluster(client: OpenAI, docset: DocSet, description: str, field: str, **kwargs) -> DocSet:
     """
     Normalizes a particular field of a DocSet. Identifies and assigns each document to a "group".
 
@@ -367,10 +483,15 @@ def semantic_cluster(client: OpenAI, docset: DocSet, description: str, field: st
         docset: DocSet to form groups for.
         description: Description of purpose of this operation.
         field: Field to make/assign groups based on.
+        **kwargs
 
     Returns:
         A DocSet with an additional field "properties._autogen_ClusterAssignment".
     """
+    # The docset is read once to build the prompt and again to assign groups; materialize it so that the
+    # upstream plan (often LLM filters) only runs once.
+    docset = materialize_docset(docset, **kwargs)
+
     text = ""
     for i, doc in enumerate(docset.take_all()):
         if i != 0:
@@ -1,6 +1,11 @@
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import contextvars
+import time
 import uuid
 from typing import Any, Dict, List, Optional
 
+from opensearchpy import OpenSearch
 import structlog
 from sycamore.query.operators.count import Count
 from sycamore.query.operators.filter import Filter
@@ -16,8 +21,16 @@ from sycamore.query.operators.sort import Sort
 from sycamore.query.operators.topk import TopK
 from sycamore.query.operators.join import Join
 from structlog.contextvars import clear_contextvars, bind_contextvars
-from sycamore import Context
+from sycamore import Context, DocSet
+from sycamore.transforms.llm_filter_cascade import LlmFilterCascade
 
+from sycamore.query.execution.operations import materialize_docset
+from sycamore.query.execution.opensearch_pushdown import (
+    OpenSearchPushdown,
+    count_field,
+    filter_to_clause,
+    get_field_mappings,
+)
 from sycamore.query.execution.physical_operator import MathOperator
 from sycamore.query.execution.sycamore_operator import (
     SycamoreLoadData,
@@ -30,6 +43,9 @@ from sycamore.query.execution.sycamore_operator import (
     SycamoreSort,
     SycamoreLimit,
     SycamoreJoin,
+    SycamoreOpenSearchCount,
+    SycamoreOpenSearchQuery,
+    SycamoreOperator,
 )
 from sycamore.query.logical_plan import LogicalPlan
 
@@ -44,6 +60,13 @@ class SycamoreExecutor:
         s3_cache_path (str): The S3 path to use for caching queries and results.
         os_client_args (dict): The OpenSearch client arguments. Defaults to None.
         trace_dir (str, optional): If set, query execution traces will be written to this directory.
+        max_parallelism (int): The maximum number of independent plan nodes executed concurrently.
+        pushdown (bool): If True, Filter and Count nodes reading straight from an index are evaluated by
+            OpenSearch where the field mappings allow the same result. OpenSearch matches any value of a
+            multi-valued field, while Ray compares the whole list, so only enable this for indexes whose
+            filtered and counted fields hold a single value.
+        llm_filter_cascade (LlmFilterCascade, optional): If set, LlmFilter nodes pre-filter documents with it
+            and only send the uncertain ones to the LLM.
     """
 
     def __init__(
@@ -53,6 +76,9 @@ class SycamoreExecutor:
         s3_cache_path: Optional[str] = None,
         trace_dir: Optional[str] = None,
         dry_run: bool = False,
+        max_parallelism: int = 4,
+        pushdown: bool = False,
+        llm_filter_cascade: Optional[LlmFilterCascade] = None,
     ) -> None:
         super().__init__()
 
@@ -62,6 +88,16 @@ class SycamoreExecutor:
         self.trace_dir = trace_dir
         self.processed: Dict[int, Any] = dict()
         self.dry_run = dry_run
+        self.max_parallelism = max(1, max_parallelism)
+        # Seconds spent executing each node, not counting its dependencies.
+        self.node_timings: Dict[int, float] = dict()
+        # Number of nodes that consume the output of each node in the current plan.
+        self.consumers: Dict[int, int] = dict()
+        self.materialized: set[int] = set()
+        self.pushdown = pushdown
+        self.llm_filter_cascade = llm_filter_cascade
+        # Nodes of the current plan evaluated by OpenSearch; their logical dependencies are not executed.
+        self.pushed_down: Dict[int, OpenSearchPushdown] = dict()
 
         if self.s3_cache_path:
             log.info("Using S3 cache path: %s", s3_cache_path)
@@ -77,30 +113,159 @@ class SycamoreExecutor:
     def get_node_args(query_id: str, logical_node: LogicalOperator) -> Dict:
         return {"name": str(logical_node.node_id)}
 
+    def dependencies(self, logical_node: LogicalOperator) -> List[LogicalOperator]:
+        """The nodes whose results are needed to execute logical_node."""
+        if logical_node.node_id in self.pushed_down:
+            return []
+        dependencies = logical_node.dependencies or []
+        assert all(isinstance(d, LogicalOperator) for d in dependencies)
+        return dependencies  # type: ignore[return-value]
+
+    def plan_pushdown(self, plan: LogicalPlan) -> None:
+        """
+        Physical planning pass that finds Filter and Count nodes fed, possibly through other pushed
+        down Filters, by LoadData, and that OpenSearch can evaluate with the same result. Whether it can
+        depends on the mapping of the fields involved; if the mappings cannot be fetched, everything
+        runs in Ray.
+        """
+        self.pushed_down = dict()
+        if not self.pushdown:
+            return
+        loads = [n for n in plan.nodes.values() if isinstance(n, LoadData)]
+        if not loads:
+            return
+
+        fields: Dict[str, set[str]] = {n.index: set() for n in loads}
+        for node in plan.nodes.values():
+            deps = node.dependencies or []
+            if len(deps) == 1 and isinstance(node, (Filter, Count)):
+                field = node.field if isinstance(node, Filter) else node.field or node.primary_field
+                if field:
+                    for index in fields:
+                        fields[index].add(field)
+        try:
+            client = self.get_os_client()
+            mappings = {index: get_field_mappings(client, index, sorted(f)) for index, f in fields.items()}
+        except Exception as e:
+            log.warning("Not pushing down into OpenSearch", error=str(e))
+            return
+
+        # Nodes whose output is exactly the result of an OpenSearch query.
+        sources: Dict[int, OpenSearchPushdown] = dict()
+        order: List[LogicalOperator] = []
+        seen: set[int] = set()
+
+        def visit(node: LogicalOperator) -> None:
+            if node.node_id in seen:
+                return
+            seen.add(node.node_id)
+            for dep in node.dependencies or []:
+                assert isinstance(dep, LogicalOperator)
+                visit(dep)
+            order.append(node)
+
+        for node in plan.nodes.values():
+            assert isinstance(node, LogicalOperator)
+            visit(node)
+
+        for node in order:
+            deps = node.dependencies or []
+            if isinstance(node, LoadData):
+                sources[node.node_id] = OpenSearchPushdown(node.index, [])
+                continue
+            if len(deps) != 1 or deps[0].node_id not in sources:
+                continue
+            source = sources[deps[0].node_id]
+            index_mappings = mappings[source.index_name]
+            if isinstance(node, Filter):
+                clause = filter_to_clause(node, index_mappings.get(node.field))
+                if clause is not None:
+                    sources[node.node_id] = OpenSearchPushdown(source.index_name, source.clauses + [clause])
+                    self.pushed_down[node.node_id] = sources[node.node_id]
+            elif isinstance(node, Count):
+                field = node.field or node.primary_field
+                aggregate_on = count_field(field, index_mappings.get(field)) if field else None
+                if field is None or aggregate_on is not None:
+                    self.pushed_down[node.node_id] = OpenSearchPushdown(source.index_name, source.clauses, aggregate_on)
+
+        if self.pushed_down:
+            log.info("Pushed down into OpenSearch", node_ids=sorted(self.pushed_down))
+
+    def get_os_client(self) -> OpenSearch:
+        return OpenSearch(**self.os_client_args)
+
     def process_node(self, logical_node: LogicalOperator, query_id: str) -> Any:
-        bind_contextvars(logical_node=logical_node)
-        # This is lifted up here to avoid serialization issues with Ray.
-        s3_cache_path = self.s3_cache_path
+        """
+        Executes a node after all of its dependencies. A node is started as soon as its dependencies are
+        done, so independent branches of the plan run concurrently on up to max_parallelism threads.
+        """
+        # Collect the part of the plan that has not run yet.
+        pending: Dict[int, LogicalOperator] = {}
+        stack = [logical_node]
+        while stack:
+            node = stack.pop()
+            if node.node_id in self.processed:
+                bind_contextvars(logical_node=node)
+                log.info("Already processed", materialized=node.node_id in self.materialized)
+                continue
+            if node.node_id in pending:
+                continue
+            pending[node.node_id] = node
+            stack.extend(self.dependencies(node))
 
-        if logical_node.node_id in self.processed:
-            log.info("Already processed")
-            return self.processed[logical_node.node_id]
-        log.info("Executing dependencies")
-        inputs = []
+        with ThreadPoolExecutor(max_workers=self.max_parallelism) as pool:
+            running: Dict[Future, int] = {}
+            while pending or running:
+                for node_id, node in list(pending.items()):
+                    dependencies = self.dependencies(node)
+                    if all(d.node_id in self.processed for d in dependencies):
+                        del pending[node_id]
+                        inputs = [self.processed[d.node_id] for d in dependencies]
+                        reused = [d.node_id for d in dependencies if d.node_id in self.materialized]
+                        if reused:
+                            bind_contextvars(logical_node=node)
+                            log.info("Reusing materialized results", node_ids=reused)
+                        # Threads do not inherit the structlog context of the query.
+                        run = contextvars.copy_context().run
+                        running[pool.submit(run, self._execute_node, node, query_id, inputs)] = node_id
+                if not running:
+                    raise ValueError(f"Query plan has a cycle through nodes {sorted(pending)}")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.processed[running.pop(future)] = future.result()
 
-        # Process dependencies
-        if logical_node.dependencies:
-            for dependency in logical_node.dependencies:
-                assert isinstance(dependency, LogicalOperator)
-                inputs += [self.process_node(dependency, query_id)]
+        return self.processed[logical_node.node_id]
 
-        # refresh context as nested execution overrides it
+    def _execute_node(self, logical_node: LogicalOperator, query_id: str, inputs: List[Any]) -> Any:
         bind_contextvars(logical_node=logical_node)
+        # This is lifted up here to avoid serialization issues with Ray.
+        s3_cache_path = self.s3_cache_path
+
         log.info("Executing node")
+        start = time.time()
         # Process node
         result = None
         operation: Optional[PhysicalOperator] = None
-        if isinstance(logical_node, LoadData):
+        pushdown = self.pushed_down.get(logical_node.node_id)
+        if pushdown is not None and isinstance(logical_node, Count):
+            operation = SycamoreOpenSearchCount(
+                context=self.context,
+                logical_node=logical_node,
+                query_id=query_id,
+                os_client_args=self.os_client_args,
+                pushdown=pushdown,
+                trace_dir=self.trace_dir,
+            )
+        elif pushdown is not None:
+            operation = SycamoreOpenSearchQuery(
+                context=self.context,
+                logical_node=logical_node,
+                query_id=query_id,
+                os_client_args=self.os_client_args,
+                pushdown=pushdown,
+                trace_dir=self.trace_dir,
+            )
+        elif isinstance(logical_node, LoadData):
             operation = SycamoreLoadData(
                 context=self.context,
                 logical_node=logical_node,
@@ -116,6 +281,7 @@ class SycamoreExecutor:
                 inputs=inputs,
                 trace_dir=self.trace_dir,
                 s3_cache_path=s3_cache_path,
+                cascade=self.llm_filter_cascade,
             )
         elif isinstance(logical_node, Filter):
             operation = SycamoreFilter(
@@ -197,9 +363,17 @@ class SycamoreExecutor:
                 self.node_id_to_node[logical_node.node_id] = logical_node
             else:
                 result = operation.execute()
+                if isinstance(result, DocSet) and self.consumers.get(logical_node.node_id, 0) > 1:
+                    # Every consumer of a lazy DocSet would execute its whole plan again, so run shared
+                    # sub-plans once and let the consumers read the stored result.
+                    execute_args = operation.get_execute_args() if isinstance(operation, SycamoreOperator) else {}
+                    result = materialize_docset(result, **execute_args)
+                    self.materialized.add(logical_node.node_id)
+                    log.info("Materialized shared result", consumers=self.consumers[logical_node.node_id])
 
-        self.processed[logical_node.node_id] = result
-        log.info("Executed node", result=str(result))
+        elapsed = time.time() - start
+        self.node_timings[logical_node.node_id] = elapsed
+        log.info("Executed node", result=str(result), seconds=round(elapsed, 3))
         return result
 
     def get_code_string(self):
@@ -226,6 +400,15 @@ class SycamoreExecutor:
             bind_contextvars(query_id=query_id)
             log.info("Executing query")
             assert isinstance(plan.result_node, LogicalOperator)
+            self.plan_pushdown(plan)
+            self.consumers = dict(
+                Counter(
+                    dep.node_id
+                    for node in plan.nodes.values()
+                    if isinstance(node, LogicalOperator)
+                    for dep in self.dependencies(node)
+                )
+            )
             result = self.process_node(plan.result_node, query_id)
         finally:
             clear_contextvars()
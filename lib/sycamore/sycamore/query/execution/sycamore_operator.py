@@ -1,4 +1,5 @@
 from abc import abstractmethod
+import dataclasses
 from typing import Any, Optional, List, Dict, Tuple
 
 from sycamore.llms.prompts.default_prompts import EntityExtractorMessagesPrompt, LLMFilterMessagesPrompt
@@ -16,13 +17,15 @@ from sycamore.query.operators.sort import Sort
 
 from sycamore.query.execution.operations import (
     llm_generate_operation,
-    range_filter_operation,
-    match_filter_operation,
+    range_filter_batch,
+    match_filter_batch,
     top_k_operation,
     join_operation,
 )
+from sycamore.query.execution.opensearch_pushdown import OpenSearchPushdown, bool_query, opensearch_count
 from sycamore.llms import OpenAI, OpenAIModels
 from sycamore.transforms.extract_entity import OpenAIEntityExtractor
+from sycamore.transforms.llm_filter_cascade import LlmFilterCascade
 from sycamore.utils.cache import S3Cache
 
 from sycamore import DocSet, Context
@@ -198,6 +201,7 @@ class SycamoreLlmFilter(SycamoreOperator):
     Use an LLM to filter records on a Docset.
     Args:
         s3_cache_path (str): Optional S3 path to use for caching
+        cascade (LlmFilterCascade): Optional pre-filter; its query is set to the filter question.
     """
 
     def __init__(
@@ -208,9 +212,11 @@ class SycamoreLlmFilter(SycamoreOperator):
         inputs: Optional[List[Any]] = None,
         trace_dir: Optional[str] = None,
         s3_cache_path: Optional[str] = None,
+        cascade: Optional[LlmFilterCascade] = None,
     ) -> None:
         super().__init__(context, logical_node, query_id, inputs, trace_dir=trace_dir)
         self.s3_cache_path = s3_cache_path
+        self.cascade = cascade
 
     def execute(self) -> Any:
         assert self.inputs and len(self.inputs) == 1, "LlmFilter requires 1 input node"
@@ -223,6 +229,7 @@ class SycamoreLlmFilter(SycamoreOperator):
         s3_cache_path = self.s3_cache_path
 
         prompt = LLMFilterMessagesPrompt(filter_question=question).get_messages_dict()
+        cascade = dataclasses.replace(self.cascade, query=question) if self.cascade else None
 
         result = self.inputs[0].llm_filter(
             llm=OpenAI(OpenAIModels.GPT_4O.value, cache=S3Cache(s3_cache_path) if s3_cache_path else None),
@@ -230,6 +237,7 @@ class SycamoreLlmFilter(SycamoreOperator):
             prompt=prompt,
             field=field,
             threshold=3,
+            cascade=cascade,
             **self.get_node_args(),
         )
         return result
@@ -287,16 +295,16 @@ class SycamoreFilter(SycamoreOperator):
             end = logical_node.end
             date = logical_node.date
 
-            result = self.inputs[0].filter(
-                lambda doc: range_filter_operation(doc=doc, field=str(field), start=start, end=end, date=date),
+            result = self.inputs[0].map_batch(
+                lambda docs: range_filter_batch(docs=docs, field=str(field), start=start, end=end, date=date),
                 **self.get_node_args(),
             )
         else:
             query = logical_node.query
             assert query is not None
             field = logical_node.field
-            result = self.inputs[0].filter(
-                lambda doc: match_filter_operation(doc=doc, query=query, field=field),
+            result = self.inputs[0].map_batch(
+                lambda docs: match_filter_batch(docs=docs, query=query, field=field),
                 **self.get_node_args(),
             )
         return result
@@ -306,6 +314,8 @@ class SycamoreFilter(SycamoreOperator):
         assert self.logical_node.dependencies is not None and len(self.logical_node.dependencies) == 1
         script = ""
         imports = []
+        output_var = output_var or get_var_name(self.logical_node)
+        input_var = input_var or get_var_name(self.logical_node.dependencies[0])
         if self.logical_node.range_filter:
             field = self.logical_node.field
             start = self.logical_node.start
@@ -315,30 +325,30 @@ class SycamoreFilter(SycamoreOperator):
             date = self.logical_node.date
 
             script = f"""
-{output_var or get_var_name(self.logical_node)} = {input_var or get_var_name(self.logical_node.dependencies[0])}.filter(
-    lambda doc: range_filter_operation(
-        doc=doc,
+{output_var} = {input_var}.map_batch(
+    lambda docs: range_filter_batch(
+        docs=docs,
         field='{field}',
-        start='{start}',
-        end='{end}',
-        date='{date}',
+        start={start!r},
+        end={end!r},
+        date={date!r},
     ),
     **{self.get_node_args()},
 )
             """
-            imports = ["from sycamore.query.execution.operations import range_filter_operation"]
+            imports = ["from sycamore.query.execution.operations import range_filter_batch"]
         else:
             script = f"""
-{output_var or get_var_name(self.logical_node)} = {input_var or get_var_name(self.logical_node.dependencies[0])}.filter(
-    lambda doc: match_filter_operation(
-        doc=doc,
+{output_var} = {input_var}.map_batch(
+    lambda docs: match_filter_batch(
+        docs=docs,
         query='{self.logical_node.query}',
         field='{self.logical_node.field}',
     ),
     **{self.get_node_args()},
 )
 """
-            imports = ["from sycamore.query.execution.operations import match_filter_operation"]
+            imports = ["from sycamore.query.execution.operations import match_filter_batch"]
         return script, imports
 
 
@@ -394,6 +404,91 @@ class SycamoreCount(SycamoreOperator):
         return script, imports
 
 
+class SycamoreOpenSearchQuery(SycamoreOperator):
+    """
+    Reads the documents selected by a chain of Filters pushed down into OpenSearch, instead of
+    reading the whole index and filtering in Ray.
+    Args:
+        os_client_args (dict): OpenSearch client args passed to OpenSearchScan to initialize the client.
+        pushdown (OpenSearchPushdown): The index and filter clauses selecting the documents.
+    """
+
+    def __init__(
+        self,
+        context: Context,
+        logical_node: LogicalOperator,
+        query_id: str,
+        os_client_args: Dict,
+        pushdown: OpenSearchPushdown,
+        trace_dir: Optional[str] = None,
+    ) -> None:
+        super().__init__(context=context, logical_node=logical_node, query_id=query_id, trace_dir=trace_dir)
+        self.os_client_args = os_client_args
+        self.pushdown = pushdown
+
+    def execute(self) -> Any:
+        return self.context.read.opensearch(
+            os_client_args=self.os_client_args,
+            index_name=self.pushdown.index_name,
+            query={"query": bool_query(self.pushdown.clauses)},
+        )
+
+    def script(self, input_var: Optional[str] = None, output_var: Optional[str] = None) -> Tuple[str, List[str]]:
+        return (
+            f"""
+os_client_args = {self.os_client_args}
+{output_var or get_var_name(self.logical_node)} = context.read.opensearch(
+    os_client_args=os_client_args,
+    index_name='{self.pushdown.index_name}',
+    query={{'query': {bool_query(self.pushdown.clauses)}}},
+)
+""",
+            [],
+        )
+
+
+class SycamoreOpenSearchCount(SycamoreOperator):
+    """
+    Counts documents, or distinct values of a field, with an OpenSearch query and aggregation
+    instead of reading the documents into Ray.
+    Args:
+        os_client_args (dict): OpenSearch client args.
+        pushdown (OpenSearchPushdown): The index and filter clauses selecting the documents, and the
+            field to count distinct values of, if any.
+    """
+
+    def __init__(
+        self,
+        context: Context,
+        logical_node: Count,
+        query_id: str,
+        os_client_args: Dict,
+        pushdown: OpenSearchPushdown,
+        trace_dir: Optional[str] = None,
+    ) -> None:
+        super().__init__(context=context, logical_node=logical_node, query_id=query_id, trace_dir=trace_dir)
+        self.os_client_args = os_client_args
+        self.pushdown = pushdown
+
+    def execute(self) -> Any:
+        return opensearch_count(
+            self.os_client_args,
+            self.pushdown.index_name,
+            bool_query(self.pushdown.clauses),
+            field=self.pushdown.count_field,
+        )
+
+    def script(self, input_var: Optional[str] = None, output_var: Optional[str] = None) -> Tuple[str, List[str]]:
+        script = f"""{output_var or get_var_name(self.logical_node)} = opensearch_count(
+    os_client_args={self.os_client_args},
+    index='{self.pushdown.index_name}',
+    query={bool_query(self.pushdown.clauses)},
+    field={self.pushdown.count_field!r},
+)
+"""
+        return script, ["from sycamore.query.execution.opensearch_pushdown import opensearch_count"]
+
+
 class SycamoreLlmExtract(SycamoreOperator):
     """
     Use an LLM to extract information from your data. The data is available for downstream tasks to consume.
@@ -626,6 +721,7 @@ class SycamoreJoin(SycamoreOperator):
             docset2=self.inputs[1],
             field1=field1,
             field2=field2,
+            how="inner",
         )
         return result
 
@@ -639,9 +735,10 @@ class SycamoreJoin(SycamoreOperator):
         result = f"""
 {output_var or get_var_name(self.logical_node)} = join_operation(
     docset1={input_var or get_var_name(logical_node.dependencies[0])},
-    docset2={input_var or get_var_name(logical_node.dependencies[2])},
+    docset2={input_var or get_var_name(logical_node.dependencies[1])},
     field1='{field1}',
-    field2='{field2}'
+    field2='{field2}',
+    how='inner'
 )
 """
         return result, ["from sycamore.query.execution.operations import join_operation"]
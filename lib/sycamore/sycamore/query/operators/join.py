@@ -15,9 +15,11 @@ class Join(LogicalOperator):
     database 2, respectively, *field_one* being "properties.key", and *field_two* being
     "properties.entity.shipType", would return the database {"properties.entity.shipType":
     ['Cruise Ship'], "properties.entity.country": ['Mexico'], "properties.entity.city":
-    ['Cabo']}.
+    ['Cabo'], "properties.key": ['Cruise Ship'], "properties.count": [3]}.
 
-    Returns a database with fields identical to those in database 2.
+    Returns a database with fields identical to those in database 2, plus the properties of the
+    matching record of database 1. A record of database 2 that matches several records of database 1
+    is returned once for each of them; where both records have a property, database 2's value is kept.
     """
 
     field_one: str
@@ -0,0 +1,148 @@
+"""
+In-process caches for Sycamore Query: generated plans keyed on the question and index schema, and query
+results keyed on a canonical form of the plan and the version of the index it ran against.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from sycamore.query.logical_plan import LogicalPlan, Node
+
+DEFAULT_PLAN_TTL_SECONDS = 60 * 60
+DEFAULT_RESULT_TTL_SECONDS = 10 * 60
+DEFAULT_MAX_ENTRIES = 256
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def plan_cache_key(query: str, index: str, schema: dict) -> str:
+    """Returns the key under which the plan for a question against an index with the given schema is cached."""
+    return _digest({"query": query.strip(), "index": index, "schema": schema})
+
+
+def canonical_plan(plan: LogicalPlan) -> list[dict[str, Any]]:
+    """
+    Returns a representation of a plan that does not depend on how the planner numbered its nodes or on
+    the question text, so that equivalent plans for differently phrased questions compare equal. Nodes
+    are renumbered in the order a depth-first traversal from the result node finishes them.
+    """
+    order: dict[int, int] = {}
+    nodes: list[Node] = []
+
+    def visit(node: Node) -> None:
+        if node.node_id in order:
+            return
+        for dep in node.dependencies or []:
+            visit(dep)
+        order[node.node_id] = len(nodes)
+        nodes.append(node)
+
+    visit(plan.result_node)
+
+    canonical = []
+    for node in nodes:
+        fields = node.model_dump(exclude={"node_id", "input"})
+        fields["operator"] = type(node).__name__
+        fields["inputs"] = [order[dep.node_id] for dep in node.dependencies or []]
+        canonical.append(fields)
+    return canonical
+
+
+def result_cache_key(plan: LogicalPlan, index: str, index_version: Hashable, dry_run: bool = False) -> str:
+    """Returns the key under which the result of running a plan against a given version of an index is cached."""
+    return _digest({"plan": canonical_plan(plan), "index": index, "version": index_version, "dry_run": dry_run})
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache whose entries expire after a fixed number of seconds. Entries are tagged
+    with an index name so that everything computed against an index can be invalidated at once.
+
+    Args:
+        ttl_seconds: How long entries stay valid.
+        max_entries: Most entries kept; the least recently used entry is evicted beyond this.
+        clock: Source of the current time, in seconds.
+    """
+
+    def __init__(
+        self, ttl_seconds: float, max_entries: int = DEFAULT_MAX_ENTRIES, clock: Callable[[], float] = time.monotonic
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.total_accesses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            self.total_accesses += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.cache_hits += 1
+            return value
+
+    def set(self, key: str, value: Any, index: str = "") -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_seconds, index, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, index: Optional[str] = None) -> None:
+        """Drops every entry, or only the entries for the given index."""
+        with self._lock:
+            if index is None:
+                self._entries.clear()
+                return
+            for key in [k for k, (_, i, _) in self._entries.items() if i == index]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_hit_rate(self) -> float:
+        if self.total_accesses == 0:
+            return 0.0
+        return self.cache_hits / self.total_accesses
+
+
+class QueryCache:
+    """
+    Two-level cache used by SycamoreQueryClient. The plan cache maps a question and index schema to the
+    generated LogicalPlan, saving the LLM planning call. The result cache maps a canonical plan and index
+    version to the query result, saving execution. Because the index version is part of the result key,
+    writes to the index make old results unreachable without explicit invalidation.
+
+    Args:
+        plan_ttl_seconds: How long generated plans stay valid.
+        result_ttl_seconds: How long query results stay valid.
+        max_entries: Most entries kept in each level.
+    """
+
+    def __init__(
+        self,
+        plan_ttl_seconds: float = DEFAULT_PLAN_TTL_SECONDS,
+        result_ttl_seconds: float = DEFAULT_RESULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.plans = TTLCache(plan_ttl_seconds, max_entries)
+        self.results = TTLCache(result_ttl_seconds, max_entries)
+
+    def invalidate(self, index: Optional[str] = None) -> None:
+        """Drops cached plans and results, for all indices or only for the given one."""
+        self.plans.invalidate(index)
+        self.results.invalidate(index)
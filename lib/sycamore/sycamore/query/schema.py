@@ -1,36 +1,150 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
 from opensearchpy.client.indices import IndicesClient
 from sycamore.transforms.query import OpenSearchQueryExecutor
 from sycamore.data import OpenSearchQuery
 
+DEFAULT_SAMPLE_SIZE = 10
+DEFAULT_REFRESH_INTERVAL_SECONDS = 60.0
+
+_ENTITY_PREFIX = "properties.entity."
+
+
+def get_index_version(client: IndicesClient, index: str) -> tuple[int, int, int, int]:
+    """
+    Returns a value that changes whenever documents are added to, updated in or deleted from the index.
+    Dynamic mapping updates only happen when documents are indexed, so this also tracks the mapping.
+    Writes only become visible to searches on the next refresh, so the number of refreshes is included;
+    otherwise a result computed between a write and its refresh would be cached under the new version.
+    """
+    stats = client.stats(index=index, metric="docs,indexing,refresh")["_all"]["primaries"]
+    return (
+        stats["docs"]["count"],
+        stats["indexing"]["index_total"],
+        stats["indexing"]["delete_total"],
+        stats["refresh"]["total"],
+    )
+
 
 class OpenSearchSchema:
-    def __init__(self, client: IndicesClient, index: str, query_executor: OpenSearchQueryExecutor) -> None:
+    """
+    Extracts the schema of an OpenSearch index for the query planner: every entity field with its
+    type and a few example values taken from a sample of the documents.
+
+    Args:
+        client: The OpenSearch indices client.
+        index: The index to describe.
+        query_executor: The executor used to sample documents.
+        sample_size: How many documents to take example values from.
+        random_sample: If True, documents are sampled at random instead of taking the first ones,
+            so the examples are not all from the same source document.
+        seed: Seed of the random sample, so repeated extractions of an unchanged index agree.
+    """
+
+    def __init__(
+        self,
+        client: IndicesClient,
+        index: str,
+        query_executor: OpenSearchQueryExecutor,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        random_sample: bool = True,
+        seed: int = 42,
+    ) -> None:
         super().__init__()
         self._client = client
         self._index = index
         self._query_executor = query_executor
+        self._sample_size = sample_size
+        self._random_sample = random_sample
+        self._seed = seed
+
+    def _sample_query(self) -> dict[str, Any]:
+        match: dict[str, Any] = {"match_all": {}}
+        if self._random_sample:
+            match = {"function_score": {"query": match, "random_score": {"seed": self._seed, "field": "_seq_no"}}}
+        return {"query": match, "size": self._sample_size, "_source": ["properties.entity"]}
 
     def get_schema(self) -> dict[str, str]:
         schema = self._client.get_field_mapping(fields=["*"], index=self._index)
         query = OpenSearchQuery()
         query["index"] = self._index
-        query["query"] = {"query": {"match_all": {}}, "size": 10}
+        query["query"] = self._sample_query()
 
-        random_sample = self._query_executor.query(query)["result"]["hits"]["hits"]
+        hits = self._query_executor.query(query)["result"]["hits"]["hits"]
+        entities = [hit["_source"].get("properties", {}).get("entity", {}) for hit in hits]
         result = {}
 
-        for k, v in schema[self._index]["mappings"].items():
-            if k.startswith("properties.entity") and ".keyword" not in k:
-                key = k
-                # key = k[18:]
-                result[key] = f"({type(random_sample[0]['_source']['properties']['entity'][k[18:]])}) e.g. "
-
-                for i in range(len(random_sample)):
-                    result[key] += "(" + str(random_sample[i]["_source"]["properties"]["entity"][k[18:]]) + ")"
-
-                    if i != 9:
-                        result[key] += ", "
+        for k in schema[self._index]["mappings"]:
+            if k.startswith(_ENTITY_PREFIX) and ".keyword" not in k:
+                name = k[len(_ENTITY_PREFIX) :]
+                examples = [entity[name] for entity in entities if name in entity]
+                if not examples:
+                    continue
+                values = ", ".join(f"({value})" for value in examples)
+                result[k] = f"({type(examples[0])}) e.g. {values}"
 
         result["text_representation"] = "(<class 'str'>) Can be assumed to have all other details"
 
         return result
+
+
+class SchemaCache:
+    """
+    Caches extracted index schemas so that planning does not pay for a mapping fetch and a sample
+    query each time. A cached schema is returned without contacting OpenSearch for
+    ``refresh_interval_seconds``; after that one cheap stats call checks whether the index changed and
+    the schema is only extracted again if it did. A single SchemaCache can be shared between clients.
+
+    Args:
+        refresh_interval_seconds: How long a schema is used without checking the index for changes.
+        clock: Source of the current time, in seconds.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._clock = clock
+        self._entries: dict[Hashable, tuple[float, Hashable, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        version_fn: Callable[[], Hashable],
+        extract_fn: Callable[[], dict[str, str]],
+    ) -> dict[str, str]:
+        """
+        Returns the schema cached under key, extracting it again if the index version changed.
+
+        Args:
+            key: Identifies the index, e.g. its name.
+            version_fn: Returns the current version of the index.
+            extract_fn: Extracts the schema of the index.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and now < entry[0]:
+            return entry[2]
+
+        version = version_fn()
+        if entry is not None and entry[1] == version:
+            schema = entry[2]
+        else:
+            schema = extract_fn()
+        with self._lock:
+            self._entries[key] = (now + self._refresh_interval_seconds, version, schema)
+        return schema
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops every cached schema, or only the one cached under key."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
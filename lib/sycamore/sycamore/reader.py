@@ -7,7 +7,16 @@ from pyarrow.filesystem import FileSystem
 from sycamore.plan_nodes import Node
 from sycamore import Context, DocSet
 from sycamore.data import Document
-from sycamore.connectors.file import ArrowScan, BinaryScan, DocScan, PandasScan, JsonScan, JsonDocumentScan
+from sycamore.connectors.file import (
+    ArrowScan,
+    BinaryScan,
+    BundleScan,
+    DocScan,
+    PandasScan,
+    JsonScan,
+    JsonDocumentScan,
+    ParquetScan,
+)
 from sycamore.connectors.file.file_scan import FileMetadataProvider
 
 
@@ -164,6 +173,32 @@ class DocSetReader:
         scan = JsonDocumentScan(paths, **kwargs)
         return DocSet(self._context, scan)
 
+    def parquet(self, paths: Union[str, list[str]], columns: Optional[list[str]] = None, **kwargs) -> DocSet:
+        """
+        Reads Documents written by :meth:`sycamore.writer.DocSetWriter.parquet` into a DocSet.
+
+        Args:
+            paths: Paths to Parquet files or directories to read into a DocSet
+            columns: (Optional) Document fields to read, e.g. ["doc_id", "text_representation", "properties"].
+                Fields that are not read are left unset. Defaults to all fields.
+            kwargs: (Optional) Arguments to passed into the underlying execution engine
+        """
+        scan = ParquetScan(paths, columns=columns, **kwargs)
+        return DocSet(self._context, scan)
+
+    def bundles(self, paths: Union[str, list[str]], **kwargs) -> DocSet:
+        """
+        Reads binary bundles written by :meth:`sycamore.writer.DocSetWriter.files` with
+        ``bundle_format="binary"`` into a DocSet. Bundles written with ``bundle_format="jsonl"`` can be read
+        with :meth:`json_document`.
+
+        Args:
+            paths: Paths to bundle files or directories to read into a DocSet
+            kwargs: (Optional) Arguments to passed into the underlying execution engine
+        """
+        scan = BundleScan(paths, **kwargs)
+        return DocSet(self._context, scan)
+
     def arrow(self, tables: Union[Table, bytes, list[Union[Table, bytes]]]) -> DocSet:
         """
         Reads the contents of PyArrow Tables into a DocSet
@@ -1,3 +1,4 @@
 from sycamore.rules.optimize_resource_args import Rule, EnforceResourceUsage, OptimizeResourceArgs
+from sycamore.rules.fuse_sort_limit import FuseSortLimit
 
-__all__ = ["Rule", "EnforceResourceUsage", "OptimizeResourceArgs"]
+__all__ = ["Rule", "EnforceResourceUsage", "OptimizeResourceArgs", "FuseSortLimit"]
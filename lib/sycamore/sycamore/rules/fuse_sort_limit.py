@@ -0,0 +1,17 @@
+from sycamore.plan_nodes import Node
+from sycamore.rules.optimize_resource_args import Rule
+
+
+class FuseSortLimit(Rule):
+    """Replaces a Sort directly followed by a Limit with a TopK, which avoids a global sort."""
+
+    def __call__(self, plan: Node) -> Node:
+        from sycamore.transforms.basics import Limit
+        from sycamore.transforms.sort import Sort, TopK
+
+        if isinstance(plan, Limit) and isinstance(plan.children[0], Sort):
+            sort = plan.children[0]
+            plan.children[0] = TopK(
+                sort.child(), sort._descending, sort._field, k=plan._limit, default_val=sort._default_val
+            )
+        return plan
@@ -0,0 +1,41 @@
+# Times the element mergers on a 2,000 element document against the original pairwise / concatenating
+# implementations, and checks that both produce the same elements. Run with:
+#
+# poetry run python sycamore/tests/manual/merge_elements_benchmark.py
+
+import pickle
+import random
+import timeit
+
+from sycamore.data import Document
+from sycamore.functions.tokenizer import CharacterTokenizer
+from sycamore.tests.unit.element_helpers import random_merge_elements, reference_marked_merge, serialized_elements
+from sycamore.transforms.merge_elements import ElementMerger, GreedyTextElementMerger, MarkedMerger
+
+NUM_ELEMENTS = 2000
+REPEAT = 5
+
+
+def main():
+    data = pickle.dumps(random_merge_elements(random.Random(0), NUM_ELEMENTS))
+
+    def doc() -> Document:
+        return Document(elements=pickle.loads(data))
+
+    # A token budget larger than the document, so every element lands in one long run.
+    greedy = GreedyTextElementMerger(CharacterTokenizer(), 10**9)
+    marked = MarkedMerger()
+    cases = [
+        ("greedy", lambda d: ElementMerger.merge_elements(greedy, d), greedy.merge_elements),
+        ("marked", reference_marked_merge, marked.merge_elements),
+    ]
+    for name, before, after in cases:
+        assert serialized_elements(before(doc())) == serialized_elements(after(doc()))
+        docs = [doc() for _ in range(2 * REPEAT)]
+        t_before = min(timeit.repeat(lambda: before(docs.pop()), number=1, repeat=REPEAT))
+        t_after = min(timeit.repeat(lambda: after(docs.pop()), number=1, repeat=REPEAT))
+        print(f"{name}: {NUM_ELEMENTS} elements {t_before * 1000:.1f}ms -> {t_after * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
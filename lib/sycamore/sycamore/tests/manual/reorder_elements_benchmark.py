@@ -0,0 +1,40 @@
+# Times reorder_elements with the original comparators against the sort keys that replace them on a 5,000
+# element document, and checks that both produce the same order. Run with:
+#
+# poetry run python sycamore/tests/manual/reorder_elements_benchmark.py
+
+import pickle
+import random
+import timeit
+
+from sycamore.data import Document
+from sycamore.functions import reorder_elements
+from sycamore.tests.unit.element_helpers import random_positioned_elements
+from sycamore.transforms.partition import ArynPartitioner, _elements_reorder_comparator, _elements_reorder_key
+
+NUM_ELEMENTS = 5000
+REPEAT = 5
+
+
+def main():
+    data = pickle.dumps(random_positioned_elements(random.Random(0), NUM_ELEMENTS))
+
+    def doc() -> Document:
+        return Document(elements=pickle.loads(data))
+
+    cases = [
+        ("partition", _elements_reorder_comparator, _elements_reorder_key),
+        ("aryn", ArynPartitioner._elements_reorder, ArynPartitioner._elements_reorder_key),
+    ]
+    for name, comparator, key in cases:
+        by_comparator = reorder_elements(doc(), comparator)
+        by_key = reorder_elements(doc(), key=key)
+        assert [e.properties["id"] for e in by_comparator.elements] == [e.properties["id"] for e in by_key.elements]
+        docs = [doc() for _ in range(2 * REPEAT)]
+        t_before = min(timeit.repeat(lambda: reorder_elements(docs.pop(), comparator), number=1, repeat=REPEAT))
+        t_after = min(timeit.repeat(lambda: reorder_elements(docs.pop(), key=key), number=1, repeat=REPEAT))
+        print(f"{name}: {NUM_ELEMENTS} elements {t_before * 1000:.1f}ms -> {t_after * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
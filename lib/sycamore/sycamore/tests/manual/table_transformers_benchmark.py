@@ -0,0 +1,131 @@
+# Times the table structure postprocessing in table_transformers on synthetic model outputs for large
+# tables, and checks the stored regression cases in
+# sycamore/tests/resources/data/json/table_structure_objects.json. Run with:
+#
+# poetry run python sycamore/tests/manual/table_transformers_benchmark.py
+#
+# random_table_objects also generated the inputs of the stored cases; their expected outputs were
+# recorded with the loop-based implementation that the vectorized one replaced.
+
+import copy
+import json
+import random
+import timeit
+from typing import Any
+
+from sycamore.tests.config import TEST_DIR
+from sycamore.transforms.table_structure.table_transformers import objects_to_structures, structure_to_cells
+from sycamore.transforms.table_structure.table_transformers import DEFAULT_STRUCTURE_CLASS_THRESHOLDS
+
+FIXTURE = TEST_DIR / "resources/data/json/table_structure_objects.json"
+REPEAT = 3
+
+WORDS = ["Revenue", "Total", "net", "of", "Q1", "Q2", "FY2023", "assets", "(1,024)", "12.5%", "$", "-", "Other"]
+
+
+def _jitter(rng: random.Random, bbox: list[float], amount: float) -> list[float]:
+    return [round(c + rng.uniform(-amount, amount), 2) for c in bbox]
+
+
+def random_table_objects(
+    rng: random.Random, num_rows: int, num_cols: int, with_tokens: bool = True
+) -> tuple[list[dict], list[dict]]:
+    """
+    Returns (objects, tokens) resembling the output of the table structure model and the tokens of a
+    table, in pixels of the cropped table image. Objects include jittered and duplicated rows and
+    columns, a column header, spanning cells and projected row headers, in no particular order.
+    """
+    xs = [10.0]
+    for _ in range(num_cols):
+        xs.append(xs[-1] + rng.uniform(40, 160))
+    ys = [10.0]
+    for _ in range(num_rows):
+        ys.append(ys[-1] + rng.uniform(14, 30))
+    left, top, right, bottom = xs[0], ys[0], xs[-1], ys[-1]
+
+    objects: list[dict[str, Any]] = [
+        {"label": "table", "score": 0.99, "bbox": [left - 2, top - 2, right + 2, bottom + 2]}
+    ]
+    for c in range(num_cols):
+        bbox = [xs[c], top, xs[c + 1], bottom]
+        objects.append({"label": "table column", "score": rng.uniform(0.6, 1.0), "bbox": _jitter(rng, bbox, 3)})
+        if rng.random() < 0.2:  # a weaker duplicate, for NMS to remove
+            objects.append({"label": "table column", "score": rng.uniform(0.3, 0.6), "bbox": _jitter(rng, bbox, 8)})
+    for r in range(num_rows):
+        bbox = [left, ys[r], right, ys[r + 1]]
+        objects.append({"label": "table row", "score": rng.uniform(0.6, 1.0), "bbox": _jitter(rng, bbox, 2)})
+        if rng.random() < 0.2:
+            objects.append({"label": "table row", "score": rng.uniform(0.3, 0.6), "bbox": _jitter(rng, bbox, 5)})
+
+    header_rows = rng.randint(1, min(2, num_rows))
+    objects.append(
+        {"label": "table column header", "score": rng.uniform(0.5, 1.0), "bbox": [left, top, right, ys[header_rows]]}
+    )
+    for _ in range(max(1, num_cols // 3)):
+        r = rng.randrange(header_rows)
+        c = rng.randrange(num_cols - 1) if num_cols > 1 else 0
+        bbox = [xs[c], ys[r], xs[min(c + 2, num_cols)], ys[r + 1]]
+        objects.append({"label": "table spanning cell", "score": rng.uniform(0.4, 1.0), "bbox": _jitter(rng, bbox, 3)})
+    for _ in range(max(1, num_rows // 8)):
+        r = rng.randrange(header_rows, num_rows) if num_rows > header_rows else 0
+        c = rng.randrange(num_cols)
+        bbox = [xs[c], ys[r], xs[c + 1], ys[min(r + 2, num_rows)]]
+        objects.append({"label": "table spanning cell", "score": rng.uniform(0.4, 1.0), "bbox": _jitter(rng, bbox, 2)})
+    if num_rows > header_rows + 1 and rng.random() < 0.7:
+        r = rng.randrange(header_rows, num_rows)
+        objects.append(
+            {
+                "label": "table projected row header",
+                "score": rng.uniform(0.5, 1.0),
+                "bbox": _jitter(rng, [left, ys[r], right, ys[r + 1]], 2),
+            }
+        )
+    for obj in objects:
+        obj["score"] = round(obj["score"], 4)
+    rng.shuffle(objects)
+
+    tokens: list[dict] = []
+    if with_tokens:
+        for r in range(num_rows):
+            for c in range(num_cols):
+                if rng.random() < 0.15:
+                    continue
+                x = xs[c] + rng.uniform(2, 8)
+                for _ in range(rng.randint(1, 3)):
+                    width = rng.uniform(8, 40)
+                    if x + width > xs[c + 1] + 4:
+                        break
+                    bbox = [x, ys[r] + rng.uniform(1, 4), x + width, ys[r + 1] - rng.uniform(1, 4)]
+                    tokens.append({"text": rng.choice(WORDS), "bbox": [round(v, 2) for v in bbox]})
+                    x += width + rng.uniform(2, 6)
+        for i, t in enumerate(tokens):
+            t["span_num"] = i
+            t["line_num"] = 0
+            t["block_num"] = 0
+    return objects, tokens
+
+
+def postprocess(objects: list[dict], tokens: list[dict]) -> dict:
+    """The structures and cells for a table, with the fields the regression cases compare."""
+    structure = objects_to_structures(objects, tokens, DEFAULT_STRUCTURE_CLASS_THRESHOLDS)
+    cells, confidence = structure_to_cells(structure, tokens)
+    keys = ["bbox", "row_nums", "column_nums", "column header", "projected row header", "cell text"]
+    return {"cells": [{k: cell[k] for k in keys} for cell in cells], "confidence": confidence}
+
+
+def main():
+    with open(FIXTURE) as f:
+        cases = json.load(f)
+    for case in cases:
+        assert postprocess(case["objects"], case["tokens"]) == case["expected"]
+    print(f"{len(cases)} stored cases match")
+
+    for num_rows, num_cols in [(20, 6), (60, 10), (150, 12)]:
+        objects, tokens = random_table_objects(random.Random(0), num_rows, num_cols)
+        inputs = [copy.deepcopy((objects, tokens)) for _ in range(REPEAT)]
+        t = min(timeit.repeat(lambda: postprocess(*inputs.pop()), number=1, repeat=REPEAT))
+        print(f"{num_rows}x{num_cols} table, {len(objects)} objects, {len(tokens)} tokens: {t * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
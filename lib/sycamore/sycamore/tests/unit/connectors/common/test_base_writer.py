@@ -7,15 +7,23 @@ import pytest
 
 
 class FakeClient(BaseDBWriter.Client):
+    num_created = 0
+
     def __init__(self, client_params: "FakeClientParams"):
         self.fspath = client_params.fspath
+        self.closed = False
 
     @classmethod
     def from_client_params(cls, params: BaseDBWriter.ClientParams) -> "FakeClient":
         assert isinstance(params, FakeClientParams)
+        FakeClient.num_created += 1
         return FakeClient(params)
 
+    def close(self):
+        self.closed = True
+
     def write_many_records(self, records: list[BaseDBWriter.Record], target_params: BaseDBWriter.TargetParams):
+        assert not self.closed
         for r in records:
             assert isinstance(r, FakeRecord) and isinstance(target_params, FakeTargetParams)
             file = self.fspath / target_params.dirname / r.doc_id
@@ -116,3 +124,25 @@ class TestBaseDBWriter(Common):
             writer.run(Common.docs)
         assert "mode='notthemodeinthedestination'" in str(einfo.value)
         assert "mode='fake'" in str(einfo.value)
+
+    def test_client_reused_across_batches(self, mocker, tmp_path):
+        input_node = mocker.Mock(spec=Node)
+        client_params = FakeClientParams(fspath=tmp_path)
+        target_params = FakeTargetParams(dirname="target", mode="fake")
+        writer = FakeWriter(input_node, client_params, target_params)
+        spy = mocker.spy(FakeClient, "get_existing_target_params")
+        before = FakeClient.num_created
+        writer.run(Common.docs[:1])
+        writer.run(Common.docs[1:])
+        assert FakeClient.num_created == before + 1
+        assert spy.call_count == 1
+        assert len(list((tmp_path / target_params.dirname).iterdir())) == 2
+
+        # A new writer validates the target again.
+        other = FakeWriter(input_node, client_params, target_params)
+        other.run(Common.docs)
+        assert FakeClient.num_created == before + 2
+        assert spy.call_count == 2
+
+        writer.close()
+        other.close()
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from sycamore.connectors.bulk import AdaptiveBulkWriter, BulkParams
+
+
+class FakeBulkEndpoint:
+    """Accepts bulk requests and rejects each document with the given statuses, in order, before accepting it."""
+
+    def __init__(self, rejections: dict[str, list[int]]):
+        self.rejections = {k: list(v) for k, v in rejections.items()}
+        self.requests: list[list[str]] = []
+        self.written: list[str] = []
+
+    def __call__(self, lines: list[bytes]):
+        ids = [json.loads(line)["index"]["_id"] for line in lines[::2]]
+        self.requests.append(ids)
+        items = []
+        for doc_id in ids:
+            pending = self.rejections.get(doc_id, [])
+            status = pending.pop(0) if pending else 201
+            if status == 201:
+                self.written.append(doc_id)
+            items.append({"index": {"_id": doc_id, "status": status}})
+        return {"items": items}
+
+
+def make_items(n: int, source_size: int = 10) -> list[list[bytes]]:
+    return [
+        [json.dumps({"index": {"_id": str(i)}}).encode(), json.dumps({"text": "x" * source_size}).encode()]
+        for i in range(n)
+    ]
+
+
+class TestAdaptiveBulkWriter:
+    def test_chunks_by_doc_count(self):
+        endpoint = FakeBulkEndpoint({})
+        writer = AdaptiveBulkWriter(endpoint, BulkParams(max_chunk_docs=3), lambda e: False)
+        stats = writer.write(make_items(10))
+        assert sorted(len(r) for r in endpoint.requests) == [1, 3, 3, 3]
+        assert stats.docs == 10
+        assert stats.requests == 4
+        assert stats.failed == 0
+
+    def test_chunks_by_bytes(self):
+        endpoint = FakeBulkEndpoint({})
+        items = make_items(10, source_size=100)
+        item_size = sum(len(line) + 1 for line in items[0])
+        writer = AdaptiveBulkWriter(endpoint, BulkParams(max_chunk_bytes=2 * item_size), lambda e: False)
+        stats = writer.write(items)
+        assert all(len(r) == 2 for r in endpoint.requests)
+        assert stats.bytes == 10 * item_size
+
+    def test_oversized_item_sent_alone(self):
+        endpoint = FakeBulkEndpoint({})
+        writer = AdaptiveBulkWriter(endpoint, BulkParams(max_chunk_bytes=1), lambda e: False)
+        stats = writer.write(make_items(3))
+        assert len(endpoint.requests) == 3
+        assert stats.docs == 3
+
+    def test_retries_rejected_and_backs_off(self):
+        endpoint = FakeBulkEndpoint({"1": [429, 429], "4": [503]})
+        params = BulkParams(max_concurrency=4, initial_backoff=0.001, max_chunk_docs=2)
+        writer = AdaptiveBulkWriter(endpoint, params, lambda e: False)
+        stats = writer.write(make_items(6))
+        assert sorted(endpoint.written) == [str(i) for i in range(6)]
+        assert stats.docs == 6
+        assert stats.retries == 3
+        assert stats.throttled_requests >= 2
+        assert stats.failed == 0
+
+    def test_gives_up_after_max_retries(self):
+        endpoint = FakeBulkEndpoint({"0": [429] * 10})
+        writer = AdaptiveBulkWriter(endpoint, BulkParams(max_retries=2, initial_backoff=0.001), lambda e: False)
+        stats = writer.write(make_items(2))
+        assert stats.docs == 1
+        assert stats.retries == 2
+        assert stats.failed == 1
+        assert endpoint.requests.count(["0"]) == 2
+
+    def test_items_missing_from_response_fail(self):
+        def endpoint(lines: list[bytes]):
+            return {"items": [{"index": {"_id": "0", "status": 201}}]}
+
+        writer = AdaptiveBulkWriter(endpoint, BulkParams(), lambda e: False)
+        stats = writer.write(make_items(3))
+        assert stats.docs == 1
+        assert stats.failed == 2
+        assert len(stats.errors) == 2
+
+    def test_non_retryable_not_retried(self):
+        endpoint = FakeBulkEndpoint({"0": [400]})
+        writer = AdaptiveBulkWriter(endpoint, BulkParams(), lambda e: False)
+        stats = writer.write(make_items(2))
+        assert len(endpoint.requests) == 1
+        assert stats.failed == 1
+        assert stats.errors == [{"index": {"_id": "0", "status": 400}}]
+
+    def test_retryable_exception_retries_chunk(self):
+        calls = []
+
+        def flaky(lines):
+            calls.append(lines)
+            if len(calls) == 1:
+                raise TimeoutError("busy")
+            return {"items": [{"index": {"status": 201}} for _ in lines[::2]]}
+
+        writer = AdaptiveBulkWriter(flaky, BulkParams(initial_backoff=0.001), lambda e: isinstance(e, TimeoutError))
+        stats = writer.write(make_items(3))
+        assert len(calls) == 2
+        assert stats.docs == 3
+        assert stats.throttled_requests == 1
+
+    def test_other_exception_propagates(self):
+        def broken(lines):
+            raise ValueError("bad request")
+
+        writer = AdaptiveBulkWriter(broken, BulkParams(), lambda e: False)
+        with pytest.raises(ValueError):
+            writer.write(make_items(1))
@@ -0,0 +1,76 @@
+import duckdb
+import pytest
+
+from sycamore.data import Document
+from sycamore.plan_nodes import Node
+
+from sycamore.connectors.duckdb.duckdb_writer import (
+    DuckDBClient,
+    DuckDBDocumentRecord,
+    DuckDBWriter,
+    DuckDBWriterClientParams,
+    DuckDBWriterTargetParams,
+    _ArrowBatchBuilder,
+)
+
+
+class TestDuckDBClient:
+    @pytest.fixture
+    def target_params(self, tmp_path):
+        return DuckDBWriterTargetParams(dimensions=3, db_url=str(tmp_path / "test.db"), table_name="test_table")
+
+    def test_write_many_records(self, target_params):
+        client = DuckDBClient.from_client_params(DuckDBWriterClientParams())
+        client.create_target_idempotent(target_params)
+        records = [
+            DuckDBDocumentRecord(
+                doc_id="1",
+                embeddings=[0.5, 1.0, 1.5],
+                properties={"page": 1, "path": "a.pdf", "nested": {"x": [1, 2]}},
+                text_representation="hello",
+                bbox=(0.0, 0.1, 0.5, 0.6),
+                shingles=[1, 2, 3],
+                type="Text",
+            ),
+            DuckDBDocumentRecord(doc_id="2"),
+        ]
+        client.write_many_records(records, target_params)
+        client.close()
+
+        conn = duckdb.connect(target_params.db_url)
+        rows = conn.sql(f"SELECT * FROM {target_params.table_name} ORDER BY doc_id").fetchall()
+        assert rows[0] == (
+            "1",
+            (0.5, 1.0, 1.5),
+            {"key": ["page", "path", "nested"], "value": ["1", "a.pdf", '{"x":[1,2]}']},
+            "hello",
+            pytest.approx([0.0, 0.1, 0.5, 0.6]),
+            [1, 2, 3],
+            "Text",
+        )
+        assert rows[1] == ("2", None, {"key": [], "value": []}, None, None, None, None)
+
+    def test_write_flushes_on_data_size(self, target_params, mocker):
+        target_params.batch_size = 1  # flush every ~1KB
+        client = DuckDBClient.from_client_params(DuckDBWriterClientParams())
+        client.create_target_idempotent(target_params)
+        records = [DuckDBDocumentRecord(doc_id=str(i), text_representation="x" * 600) for i in range(10)]
+        flush = mocker.spy(_ArrowBatchBuilder, "flush")
+        client.write_many_records(records, target_params)
+        client.close()
+
+        assert flush.call_count == 5
+        conn = duckdb.connect(target_params.db_url)
+        assert conn.sql(f"SELECT count(*) FROM {target_params.table_name}").fetchall() == [(10,)]
+
+    def test_writer_releases_database_after_each_batch(self, target_params, mocker):
+        writer = DuckDBWriter(mocker.Mock(spec=Node), DuckDBWriterClientParams(), target_params)
+        close = mocker.spy(DuckDBClient, "close")
+        writer.run([Document({"doc_id": "1", "text_representation": "a"})])
+        assert close.call_count == 1
+        writer.run([Document({"doc_id": "2", "text_representation": "b"})])
+        assert close.call_count == 2
+        writer.close()
+
+        conn = duckdb.connect(target_params.db_url)
+        assert conn.sql(f"SELECT count(*) FROM {target_params.table_name}").fetchall() == [(2,)]
@@ -1,5 +1,8 @@
 from opensearchpy import OpenSearch, RequestError
+from opensearchpy.helpers import BulkIndexError
+from opensearchpy.serializer import JSONSerializer
 import pytest
+from sycamore.connectors.bulk import BulkParams
 from sycamore.connectors.opensearch import (
     OpenSearchWriterClient,
     OpenSearchWriterClientParams,
@@ -148,8 +151,12 @@ class TestOpenSearchClient:
 
     def test_write_many_documents(self, mocker):
         client = mocker.Mock(spec=OpenSearch)
-        parallel_blk = mocker.patch("sycamore.connectors.opensearch.opensearch_writer.parallel_bulk")
-        parallel_blk.return_value = []
+        client.transport = mocker.Mock()
+        client.transport.serializer = JSONSerializer()
+        client.bulk.return_value = {
+            "errors": False,
+            "items": [{"index": {"_id": "1", "status": 201}}, {"index": {"_id": "2", "status": 201}}],
+        }
         records = [
             OpenSearchWriterRecord(_source={"field": 1}, _index="test", _id="1"),
             OpenSearchWriterRecord(_source={"field": 2}, _index="test", _id="2"),
@@ -157,6 +164,51 @@ class TestOpenSearchClient:
         target_params = OpenSearchWriterTargetParams(index_name="test")
         osc_testing = OpenSearchWriterClient(client)
         osc_testing.write_many_records(records, target_params)
+        body = client.bulk.call_args.kwargs["body"].decode()
+        assert body.splitlines() == [
+            '{"index":{"_index":"test","_id":"1"}}',
+            '{"field":1}',
+            '{"index":{"_index":"test","_id":"2"}}',
+            '{"field":2}',
+        ]
+        assert osc_testing.stats.docs == 2
+
+    def test_write_many_documents_retries_rejected(self, mocker):
+        client = mocker.Mock(spec=OpenSearch)
+        client.transport = mocker.Mock()
+        client.transport.serializer = JSONSerializer()
+        client.bulk.side_effect = [
+            {
+                "errors": True,
+                "items": [{"index": {"_id": "1", "status": 201}}, {"index": {"_id": "2", "status": 429}}],
+            },
+            {"errors": False, "items": [{"index": {"_id": "2", "status": 201}}]},
+        ]
+        records = [
+            OpenSearchWriterRecord(_source={"field": 1}, _index="test", _id="1"),
+            OpenSearchWriterRecord(_source={"field": 2}, _index="test", _id="2"),
+        ]
+        target_params = OpenSearchWriterTargetParams(index_name="test")
+        osc_testing = OpenSearchWriterClient(client, BulkParams(initial_backoff=0))
+        osc_testing.write_many_records(records, target_params)
+        assert client.bulk.call_count == 2
+        assert osc_testing.stats.docs == 2
+        assert osc_testing.stats.retries == 1
+
+    def test_write_many_documents_failure_raises(self, mocker):
+        client = mocker.Mock(spec=OpenSearch)
+        client.transport = mocker.Mock()
+        client.transport.serializer = JSONSerializer()
+        client.bulk.return_value = {
+            "errors": True,
+            "items": [{"index": {"_id": "1", "status": 400, "error": {"type": "mapper_parsing_exception"}}}],
+        }
+        records = [OpenSearchWriterRecord(_source={"field": 1}, _index="test", _id="1")]
+        target_params = OpenSearchWriterTargetParams(index_name="test")
+        osc_testing = OpenSearchWriterClient(client)
+        with pytest.raises(BulkIndexError):
+            osc_testing.write_many_records(records, target_params)
+        assert client.bulk.call_count == 1
 
 
 class TestOpenSearchRecord:
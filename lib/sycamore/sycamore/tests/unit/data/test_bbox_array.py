@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+from sycamore.data import BoundingBox, BoundingBoxArray, Element
+from sycamore.data.bbox import EMPTY_BBOX
+from sycamore.transforms.table_structure.table_transformers import nms
+
+
+def random_boxes(rng: random.Random, n: int) -> list[BoundingBox]:
+    boxes = []
+    for _ in range(n):
+        # Coarse coordinates, so that shared edges, containment and degenerate boxes all turn up.
+        x1, y1 = rng.randint(0, 8), rng.randint(0, 8)
+        boxes.append(BoundingBox(x1, y1, x1 + rng.randint(0, 4), y1 + rng.randint(0, 4)))
+    return boxes
+
+
+def test_pairwise_matches_bounding_box():
+    rng = random.Random(0)
+    a, b = random_boxes(rng, 40), random_boxes(rng, 30)
+    array_a, array_b = BoundingBoxArray.from_boxes(a), BoundingBoxArray.from_boxes(b)
+    inter, iob, iou, contains = (
+        array_a.intersection_area(array_b),
+        array_a.iob(array_b),
+        array_a.iou(array_b),
+        array_a.contains(array_b),
+    )
+    for i, box_a in enumerate(a):
+        for j, box_b in enumerate(b):
+            assert inter[i, j] == box_a.intersect(box_b).area
+            assert iob[i, j] == box_a.iob(box_b)
+            assert contains[i, j] == box_a.contains(box_b)
+            union = box_a.area + box_b.area - inter[i, j]
+            assert iou[i, j] == (box_a.iou(box_b) if union != 0 else 0)
+
+
+def test_intersect_and_union():
+    rng = random.Random(1)
+    a, b = random_boxes(rng, 50), random_boxes(rng, 50)
+    intersected = BoundingBoxArray.from_boxes(a).intersect(BoundingBoxArray.from_boxes(b))
+    assert intersected.to_boxes() == [box_a.intersect(box_b) for box_a, box_b in zip(a, b)]
+    assert BoundingBoxArray.from_boxes(a).intersect(a[0]).to_boxes() == [box.intersect(a[0]) for box in a]
+
+    groups = [rng.randrange(5) for _ in a]
+    unions = BoundingBoxArray.from_boxes(a).union_by_group(groups, 6).to_boxes()
+    for g in range(5):
+        assert unions[g] == BoundingBox.from_union(box for box, group in zip(a, groups) if group == g)
+    assert unions[5] == EMPTY_BBOX
+    assert BoundingBoxArray.from_boxes(a).union() == BoundingBox.from_union(a)
+
+
+@pytest.mark.parametrize("criteria", ["iou", "object1_overlap", "object2_overlap"])
+def test_nms_matches_table_transformers(criteria):
+    rng = random.Random(2)
+    for _ in range(20):
+        boxes = random_boxes(rng, 30)
+        objects = [
+            {"bbox": box.to_list(), "score": rng.choice([0.5, rng.random()]), "id": i} for i, box in enumerate(boxes)
+        ]
+        expected = [obj["id"] for obj in nms(objects, match_criteria=criteria, match_threshold=0.3)]
+        kept = BoundingBoxArray.from_boxes(boxes).nms([obj["score"] for obj in objects], 0.3, criteria)
+        assert kept.tolist() == expected
+
+
+def test_elements():
+    elements = [Element({"bbox": (0.1, 0.1, 0.5, 0.5)}), Element(), Element({"bbox": (0.2, 0.2, 0.3, 0.3)})]
+    array = BoundingBoxArray.from_elements(elements)
+    assert len(array) == 3
+    # The element without a bbox overlaps and contains nothing, and is left out of unions.
+    assert array.iob(array)[1].tolist() == [0, 0, 0]
+    assert not array.contains(array)[1].any()
+    assert array.union() == BoundingBox(0.1, 0.1, 0.5, 0.5)
+
+    shifted = BoundingBoxArray(array.coords[[0, 2]] + 0.25)
+    shifted.assign_to_elements([elements[0], elements[2]])
+    assert elements[0].bbox == BoundingBox(0.35, 0.35, 0.75, 0.75)
+    assert isinstance(array[0], BoundingBox) and len(array[np.array([True, False, True])]) == 2
+    with pytest.raises(ValueError):
+        shifted.assign_to_elements(elements)
@@ -137,6 +137,45 @@ class TestDocument:
         assert d.elements[0]["type"] == "a"
         assert d.elements[1]["type"] == "b"
 
+    def test_element_index(self):
+        def elem(name, page, bbox=None):
+            return {"type": name, "properties": {"page_number": page}, "bbox": bbox}
+
+        d = Document(
+            {
+                "elements": [
+                    elem("a", 1, (0.1, 0.5, 0.4, 0.6)),
+                    elem("b", 2, (0.1, 0.1, 0.9, 0.2)),
+                    elem("c", 1, (0.1, 0.1, 0.4, 0.2)),
+                    elem("d", 1),
+                    elem("e", 1, (0.5, 0.1, 0.9, 0.9)),
+                ]
+            }
+        )
+        assert [e.type for e in d.elements_on_page(1)] == ["a", "c", "d", "e"]
+        assert d.elements_on_page(3) == []
+        assert [e.type for e in d.elements_in_region(1, BoundingBox(0.0, 0.0, 0.45, 1.0))] == ["a", "c"]
+        # Edges count as overlapping.
+        assert [e.type for e in d.elements_in_region(1, BoundingBox(0.4, 0.2, 0.45, 0.3))] == ["c"]
+        assert [e.type for e in d.elements_in_region(2, BoundingBox(0.0, 0.0, 1.0, 1.0))] == ["b"]
+
+        index = d.element_index
+        assert d.element_index is index
+        d.elements.append(Element(elem("f", 3)))
+        assert d.element_index is not index
+        assert [e.type for e in d.elements_on_page(3)] == ["f"]
+        d.elements = d.elements[:1]
+        assert [e.type for e in d.elements_on_page(1)] == ["a"]
+
+    def test_element_index_follows_in_place_changes(self):
+        d = Document({"elements": [{"type": t, "properties": {"page_number": 1}} for t in "cab"]})
+        assert [e.type for e in d.elements_on_page(1)] == ["c", "a", "b"]
+        d.elements.sort(key=lambda e: e.type)
+        assert [e.type for e in d.elements_on_page(1)] == ["a", "b", "c"]
+        d.elements[1:] = [Element({"type": "x", "properties": {"page_number": 2}}), d.elements[2]]
+        assert [e.type for e in d.elements_on_page(1)] == ["a", "c"]
+        assert [e.type for e in d.elements_on_page(2)] == ["x"]
+
 
 class TestMetadataDocument:
     def test_fail_constructor(self):
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from bs4 import BeautifulSoup
+import json
 import pytest
 import re
 
@@ -489,6 +490,14 @@ def test_table_from_dict_missing():
     assert actual == expected
 
 
+@pytest.mark.parametrize("test_case", test_cases)
+def test_to_dict_round_trip(test_case):
+    table = test_case.table()
+    as_dict = table.to_dict()
+    assert json.loads(json.dumps(as_dict)) == as_dict
+    assert Table.from_dict(as_dict) == table
+
+
 @pytest.mark.parametrize("test_case", test_cases)
 def test_from_html(test_case):
     actual = Table.from_html(html_str=test_case.canonical_html())
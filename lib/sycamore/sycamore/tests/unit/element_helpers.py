@@ -0,0 +1,98 @@
+# Random elements and reference implementations shared by the equivalence tests in
+# sycamore/tests/unit and the benchmarks in sycamore/tests/manual.
+
+import pickle
+import random
+from typing import Any
+
+from sycamore.data import Document, Element
+
+
+def random_positioned_elements(rng: random.Random, n: int) -> list[Element]:
+    """Elements on pages 1 to 3, each with a bbox, many sharing a column or a top, numbered by an id property."""
+    elements = []
+    for i in range(n):
+        x, y = rng.choice([0.1, 0.5, 0.6, rng.random()]), rng.choice([0.2, 0.4, rng.random()])
+        elements.append(
+            Element({"bbox": (x, y, x + 0.1, y + 0.1), "properties": {"page_number": rng.randint(1, 3), "id": i}})
+        )
+    return elements
+
+
+def random_merge_elements(rng: random.Random, n: int) -> list[dict[str, Any]]:
+    """Elements for the mergers, with optional text, binary, page numbers and bboxes, and MarkedMerger marks."""
+    elements = []
+    page = 1
+    for _ in range(n):
+        page += rng.random() < 0.1
+        element: dict[str, Any] = {
+            "type": "Text",
+            "text_representation": rng.choice([None, "", "abc", "some longer text", "x" * rng.randint(1, 30)]),
+            "binary_representation": rng.choice([None, b"", b"bin"]),
+            "properties": {"page_number": page} if rng.random() < 0.9 else {},
+        }
+        if rng.random() < 0.2:
+            element["properties"]["page_numbers"] = [page]
+        if rng.random() < 0.3:
+            element["properties"][rng.choice(["a", "b"])] = rng.choice([None, 1, "v"])
+        if rng.random() < 0.7:
+            x, y = rng.random(), rng.random()
+            element["bbox"] = (x, y, x + rng.random(), y + rng.random())
+        if rng.random() < 0.05:
+            element["_break"] = True
+        if rng.random() < 0.02:
+            element["_drop"] = True
+        elements.append(element)
+    return elements
+
+
+def reference_marked_merge(document: Document) -> Document:
+    """MarkedMerger.merge_elements as originally written, with repeated concatenation."""
+    merged = []
+    bin = b""
+    text = ""
+    props: dict[str, Any] = {}
+    bbox = None
+    for elem in document.elements:
+        if elem.data.get("_drop"):
+            continue
+        if elem.data.get("_break"):
+            ee = Element()
+            ee.binary_representation = bin
+            ee.text_representation = text
+            ee.properties = props
+            ee.data["bbox"] = bbox
+            merged.append(ee)
+            bin = b""
+            text = ""
+            props = {}
+            bbox = None
+        if elem.binary_representation:
+            bin += elem.binary_representation + b"\n"
+        if elem.text_representation:
+            text += elem.text_representation + "\n"
+        for k, v in elem.properties.items():
+            if k == "page_number":
+                props["page_numbers"] = props.get("page_numbers", list())
+                props["page_numbers"] = list(set(props["page_numbers"] + [v]))
+            if k not in props:
+                props[k] = v
+        ebb = elem.data.get("bbox")
+        if ebb is not None:
+            if bbox is None:
+                bbox = ebb
+            else:
+                bbox = (min(bbox[0], ebb[0]), min(bbox[1], ebb[1]), max(bbox[2], ebb[2]), max(bbox[3], ebb[3]))
+    if text:
+        ee = Element()
+        ee.binary_representation = bin
+        ee.text_representation = text
+        ee.properties = props
+        ee.data["bbox"] = bbox
+        merged.append(ee)
+    document.elements = merged
+    return document
+
+
+def serialized_elements(document: Document) -> list[bytes]:
+    return [pickle.dumps(e.data) for e in document.elements]
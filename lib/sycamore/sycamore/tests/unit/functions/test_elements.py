@@ -1,6 +1,11 @@
+import random
+
+import pytest
+
 from sycamore.data import Document, Element
 from sycamore.functions import reorder_elements
-from sycamore.transforms.partition import _elements_reorder_comparator
+from sycamore.tests.unit.element_helpers import random_positioned_elements
+from sycamore.transforms.partition import ArynPartitioner, _elements_reorder_comparator, _elements_reorder_key
 
 
 class TestElementFunctions:
@@ -67,3 +72,51 @@ class TestElementFunctions:
         comparator = _elements_reorder_comparator
         doc = reorder_elements(doc, comparator)
         assert doc.elements[2] == element4
+
+    @pytest.mark.parametrize(
+        "comparator, key",
+        [
+            (_elements_reorder_comparator, _elements_reorder_key),
+            (ArynPartitioner._elements_reorder, ArynPartitioner._elements_reorder_key),
+        ],
+    )
+    def test_reorder_key_matches_comparator(self, comparator, key):
+        for seed in range(10):
+            by_comparator = reorder_elements(
+                Document(elements=random_positioned_elements(random.Random(seed), 200)), comparator
+            )
+            by_key = reorder_elements(Document(elements=random_positioned_elements(random.Random(seed), 200)), key=key)
+            assert [e.properties["id"] for e in by_key.elements] == [e.properties["id"] for e in by_comparator.elements]
+
+    @pytest.mark.parametrize(
+        "comparator, key",
+        [
+            (_elements_reorder_comparator, _elements_reorder_key),
+            (ArynPartitioner._elements_reorder, ArynPartitioner._elements_reorder_key),
+        ],
+    )
+    def test_reorder_key_without_bbox(self, comparator, key):
+        def elem(name, page, bbox=None):
+            return Element({"bbox": bbox, "properties": {"page_number": page, "name": name}})
+
+        doc = Document(
+            elements=[
+                elem("right", 1, (0.6, 0.1, 0.9, 0.2)),
+                elem("page 2", 2),
+                elem("none", 1),
+                elem("left", 1, (0.1, 0.3, 0.4, 0.4)),
+            ]
+        )
+        # The comparators cannot order an element without a bbox; the keys put it in the left column.
+        with pytest.raises(RuntimeError, match="BBox is None"):
+            reorder_elements(Document(elements=list(doc.elements)), comparator)
+        names = [e.properties["name"] for e in reorder_elements(doc, key=key).elements]
+        assert names == ["none", "left", "right", "page 2"]
+
+    def test_reorder_elements_arguments(self):
+        doc = Document(elements=[Element({"properties": {"page_number": 1}})])
+        assert reorder_elements(doc, key=_elements_reorder_key).elements == doc.elements
+        with pytest.raises(ValueError):
+            reorder_elements(doc)
+        with pytest.raises(ValueError):
+            reorder_elements(doc, _elements_reorder_comparator, key=_elements_reorder_key)
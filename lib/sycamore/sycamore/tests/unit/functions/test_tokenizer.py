@@ -11,3 +11,11 @@ class TestTokenOverlapChunker:
     def test_character_tokenizer(self, tokenizer, text, expected_tokens):
         tokens = tokenizer.tokenize(text)
         assert tokens == expected_tokens
+
+    def test_batch_and_count_match_tokenize(self):
+        tokenizer = CharacterTokenizer()
+        texts = ["a test", "", "another one"]
+        assert tokenizer.tokenize_batch(texts) == [tokenizer.tokenize(t) for t in texts]
+        assert tokenizer.tokenize_batch(texts, as_ints=True) == [tokenizer.tokenize(t, as_ints=True) for t in texts]
+        assert tokenizer.count_tokens_batch(texts) == [6, 0, 11]
+        assert tokenizer.count_tokens("a test") == 6
@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+from sycamore.query.execution.opensearch_pushdown import count_field, filter_to_clause, opensearch_count
+from sycamore.query.operators.filter import Filter
+
+TEXT = {"type": "text", "fields": {"keyword": {"type": "keyword"}}}
+
+
+def test_filter_to_clause():
+    match = Filter(node_id=0, query="a*b", field="state")
+    assert filter_to_clause(match, TEXT) == {
+        "wildcard": {"state.keyword": {"value": "*a\\*b*", "case_insensitive": True}}
+    }
+    assert filter_to_clause(match, {"type": "text"}) is None
+    assert filter_to_clause(match, None) is None
+    # Values longer than ignore_above are not indexed, so they could never match.
+    assert filter_to_clause(match, {"type": "keyword", "ignore_above": 256}) is None
+    assert (
+        filter_to_clause(match, {"type": "text", "fields": {"raw": {"type": "keyword", "ignore_above": 256}}}) is None
+    )
+
+    number = Filter(node_id=0, query=3, field="count")
+    assert filter_to_clause(number, {"type": "long"}) == {"term": {"count": 3}}
+    # Ray would do substring matching of "3" against the string values.
+    assert filter_to_clause(number, TEXT) is None
+
+    numeric_range = Filter(node_id=0, range_filter=True, start=1, field="count")
+    assert filter_to_clause(numeric_range, {"type": "integer"}) == {"range": {"count": {"gte": 1}}}
+    assert filter_to_clause(numeric_range, TEXT) is None
+
+    date_range = Filter(node_id=0, range_filter=True, date=True, start="January 1, 2022", end="2022-12-31", field="d")
+    assert filter_to_clause(date_range, {"type": "date"}) == {
+        "range": {
+            "d": {"gte": "2022-01-01T00:00:00", "lte": "2022-12-31T00:00:00", "format": "strict_date_optional_time"}
+        }
+    }
+    assert filter_to_clause(date_range, TEXT) is None
+
+
+def test_count_field():
+    assert count_field("state", TEXT) == "state.keyword"
+    assert count_field("count", {"type": "long"}) == "count"
+    assert count_field("summary", {"type": "text"}) is None
+    assert count_field("state", {"type": "keyword", "ignore_above": 256}) is None
+
+
+def test_opensearch_count_pages_past_max_terms():
+    client = MagicMock()
+    client.search.side_effect = [
+        {"aggregations": {"values": {"sum_other_doc_count": 5, "buckets": []}}},
+        {
+            "aggregations": {
+                "values": {"buckets": [{"key": {"value": "a"}}, {"key": {"value": "None"}}], "after_key": 1}
+            }
+        },
+        {"aggregations": {"values": {"buckets": [{"key": {"value": "b"}}], "after_key": 2}}},
+        {"aggregations": {"values": {"buckets": []}}},
+    ]
+    assert opensearch_count({}, "index", {"match_all": {}}, field="state.keyword", client=client) == 2
+    assert client.search.call_count == 4
+    assert client.search.call_args.kwargs["body"]["aggs"]["values"]["composite"]["after"] == 2
+
+    client = MagicMock()
+    client.search.return_value = {"hits": {"total": {"value": 42}}}
+    assert opensearch_count({}, "index", {"match_all": {}}, client=client) == 42
+    assert client.search.call_args.kwargs["body"]["size"] == 0
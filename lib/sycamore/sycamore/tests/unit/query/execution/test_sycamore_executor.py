@@ -1,13 +1,18 @@
-from unittest.mock import patch
+import threading
+from unittest.mock import MagicMock, patch
 from typing import Dict
 
 import pytest
 import sycamore
 
 from sycamore.query.execution.sycamore_executor import SycamoreExecutor
+from sycamore.query.execution.sycamore_operator import SycamoreCount
 from sycamore.query.logical_plan import LogicalPlan, Node
 from sycamore.query.operators.count import Count
+from sycamore.query.operators.filter import Filter
 from sycamore.query.operators.loaddata import LoadData
+from sycamore.query.operators.math import Math
+from sycamore.tests.unit.query.conftest import MockOpenSearchReader, get_mock_docs
 
 
 @pytest.fixture
@@ -48,3 +53,142 @@ def test_count_docs(test_count_docs_query_plan, mock_sycamore_docsetreader, mock
         executor = SycamoreExecutor(context, os_client_args=os_client_args, s3_cache_path="s3://sycamore-cache")
         result = executor.execute(test_count_docs_query_plan)
         assert result == mock_opensearch_num_docs
+
+
+def test_shared_node_is_materialized(mock_sycamore_docsetreader, mock_opensearch_num_docs):
+    load_node = LoadData(node_id=0, description="Load data", index="test_index")
+    count_node = Count(node_id=1, description="Count documents", input=[load_node.node_id])
+    distinct_node = Count(node_id=2, description="Count counters", field="properties.counter", input=[0])
+    math_node = Math(node_id=3, description="Add counts", operation="add", input=[1, 2])
+    # pylint: disable=protected-access
+    count_node._dependencies = [load_node]
+    distinct_node._dependencies = [load_node]
+    math_node._dependencies = [count_node, distinct_node]
+    nodes: Dict[int, Node] = {n.node_id: n for n in (load_node, count_node, distinct_node, math_node)}
+    plan = LogicalPlan(result_node=math_node, nodes=nodes, query="Test query plan")
+
+    with (
+        patch("sycamore.reader.DocSetReader", new=mock_sycamore_docsetreader),
+        patch.object(
+            MockOpenSearchReader, "read_docs", autospec=True, side_effect=lambda self: get_mock_docs()
+        ) as read_docs,
+    ):
+        context = sycamore.init()
+        executor = SycamoreExecutor(context, os_client_args={})
+        result = executor.execute(plan)
+
+    assert result == 2 * mock_opensearch_num_docs
+    assert read_docs.call_count == 1
+    assert executor.materialized == {load_node.node_id}
+
+
+def test_independent_branches_run_concurrently(mock_sycamore_docsetreader):
+    load_a = LoadData(node_id=0, description="Load data", index="index_a")
+    load_b = LoadData(node_id=1, description="Load data", index="index_b")
+    count_a = Count(node_id=2, description="Count a", input=[0])
+    count_b = Count(node_id=3, description="Count b", input=[1])
+    math_node = Math(node_id=4, description="Subtract counts", operation="subtract", input=[2, 3])
+    # pylint: disable=protected-access
+    count_a._dependencies = [load_a]
+    count_b._dependencies = [load_b]
+    math_node._dependencies = [count_a, count_b]
+    nodes: Dict[int, Node] = {n.node_id: n for n in (load_a, load_b, count_a, count_b, math_node)}
+    plan = LogicalPlan(result_node=math_node, nodes=nodes, query="Test query plan")
+
+    # Both counts must be running at the same time for the barrier to release.
+    barrier = threading.Barrier(2, timeout=30)
+
+    def count(self):
+        barrier.wait()
+        return self.logical_node.node_id
+
+    with (
+        patch("sycamore.reader.DocSetReader", new=mock_sycamore_docsetreader),
+        patch.object(SycamoreCount, "execute", autospec=True, side_effect=count),
+    ):
+        context = sycamore.init()
+        executor = SycamoreExecutor(context, os_client_args={})
+        result = executor.execute(plan)
+
+    assert result == -1
+    assert set(executor.node_timings) == set(nodes)
+
+
+FIELD_MAPPINGS = {
+    "test_index": {
+        "mappings": {
+            "properties.entity.state": {
+                "mapping": {"state": {"type": "text", "fields": {"keyword": {"type": "keyword"}}}}
+            },
+            "properties.entity.summary": {"mapping": {"summary": {"type": "text"}}},
+            "properties.entity.city": {
+                "mapping": {"city": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}}}
+            },
+        }
+    }
+}
+
+
+def filter_count_plan(filter_field: str) -> LogicalPlan:
+    load_node = LoadData(node_id=0, description="Load data", index="test_index")
+    filter_node = Filter(node_id=1, description="Filter", query="wa", field=filter_field, input=[0])
+    count_node = Count(node_id=2, description="Count states", field="properties.entity.state", input=[1])
+    # pylint: disable=protected-access
+    filter_node._dependencies = [load_node]
+    count_node._dependencies = [filter_node]
+    nodes: Dict[int, Node] = {n.node_id: n for n in (load_node, filter_node, count_node)}
+    return LogicalPlan(result_node=count_node, nodes=nodes, query="Test query plan")
+
+
+def test_filter_and_count_pushed_down():
+    os_client = MagicMock()
+    os_client.indices.get_field_mapping.return_value = FIELD_MAPPINGS
+    os_client.search.return_value = {
+        "aggregations": {"values": {"sum_other_doc_count": 0, "buckets": [{"key": "WA"}, {"key": "Iowa"}]}}
+    }
+    with (
+        patch.object(SycamoreExecutor, "get_os_client", return_value=os_client),
+        patch("sycamore.query.execution.opensearch_pushdown.OpenSearch", return_value=os_client),
+    ):
+        executor = SycamoreExecutor(sycamore.init(), os_client_args={}, pushdown=True)
+        result = executor.execute(filter_count_plan("properties.entity.state"))
+
+    assert result == 2
+    assert set(executor.pushed_down) == {1, 2}
+    # Only the count ran; the load and filter were folded into its query.
+    assert set(executor.node_timings) == {2}
+    body = os_client.search.call_args.kwargs["body"]
+    assert body["size"] == 0
+    assert body["query"] == {
+        "bool": {
+            "filter": [{"wildcard": {"properties.entity.state.keyword": {"value": "*wa*", "case_insensitive": True}}}]
+        }
+    }
+    assert body["aggs"]["values"]["terms"]["field"] == "properties.entity.state.keyword"
+
+
+def test_pushdown_reflected_in_code_and_falls_back_without_keyword():
+    os_client = MagicMock()
+    os_client.indices.get_field_mapping.return_value = FIELD_MAPPINGS
+    with patch.object(SycamoreExecutor, "get_os_client", return_value=os_client):
+        executor = SycamoreExecutor(sycamore.init(), os_client_args={}, dry_run=True, pushdown=True)
+        code = executor.execute(filter_count_plan("properties.entity.state"))
+        assert "opensearch_count(" in code and "wildcard" in code
+        assert "match_filter_batch" not in code
+
+        # A text field without a keyword subfield cannot do substring matching in OpenSearch.
+        executor = SycamoreExecutor(sycamore.init(), os_client_args={}, dry_run=True, pushdown=True)
+        code = executor.execute(filter_count_plan("properties.entity.summary"))
+        assert set(executor.pushed_down) == set()
+        assert "match_filter_batch" in code and "count_distinct" in code
+
+        # Values longer than ignore_above are not in the keyword subfield, so they would never match.
+        executor = SycamoreExecutor(sycamore.init(), os_client_args={}, dry_run=True, pushdown=True)
+        executor.execute(filter_count_plan("properties.entity.city"))
+        assert 1 not in executor.pushed_down
+
+        # Pushdown is opt-in.
+        executor = SycamoreExecutor(sycamore.init(), os_client_args={}, dry_run=True)
+        code = executor.execute(filter_count_plan("properties.entity.state"))
+        assert executor.pushed_down == {}
+        assert "opensearch_count(" not in code
@@ -5,6 +5,7 @@ import sycamore
 from sycamore.query.operators.join import Join
 from sycamore.query.operators.llmextract import LlmExtract
 from sycamore import DocSet
+from sycamore.data import Document
 
 from sycamore.query.operators.count import Count
 from sycamore.query.operators.limit import Limit
@@ -102,6 +103,7 @@ def test_llm_filter():
             prompt=ANY,
             field=logical_node.field,
             threshold=3,
+            cascade=None,
             name=str(logical_node.node_id),
         )
 
@@ -201,9 +203,36 @@ def test_join():
             docset2=doc_set2,
             field1=logical_node.field_one,
             field2=logical_node.field_two,
+            how="inner",
         )
 
 
+def test_join_returns_left_properties():
+    context = sycamore.init()
+    ships = context.read.document(
+        [
+            Document(doc_id="0", properties={"key": "Cruise Ship", "count": 3}),
+            Document(doc_id="1", properties={"key": "Sailboat", "count": 2}),
+        ]
+    )
+    incidents = context.read.document(
+        [
+            Document(doc_id="a", properties={"entity": {"shipType": "Cruise Ship", "city": "Cabo"}}),
+            Document(doc_id="b", properties={"entity": {"shipType": "Canoe", "city": "Kyoto"}}),
+        ]
+    )
+    logical_node = Join(node_id=0, field_one="properties.key", field_two="properties.entity.shipType")
+    sycamore_operator = SycamoreJoin(context, logical_node, query_id="test", inputs=[ships, incidents])
+    result = sycamore_operator.execute().take_all()
+
+    assert len(result) == 1
+    assert result[0].properties == {
+        "key": "Cruise Ship",
+        "count": 3,
+        "entity": {"shipType": "Cruise Ship", "city": "Cabo"},
+    }
+
+
 def test_llm_extract():
     with (
         patch("sycamore.query.execution.sycamore_operator.OpenAI"),
@@ -11,8 +11,10 @@ from sycamore.query.execution.operations import (
     convert_string_to_date,
     join_operation,
     llm_generate_operation,
+    match_filter_batch,
     match_filter_operation,
     math_operation,
+    range_filter_batch,
     range_filter_operation,
     semantic_cluster,
     top_k_operation,
@@ -205,6 +207,41 @@ class TestOperations:
             filtered_ids.append(doc.text_representation)
         assert filtered_ids == ["January 1, 2022", "2022-05-04", "September 19, 2022", "2022-06-07T03:47:00Z"]
 
+    def test_batch_filters_match_per_document_filters(self):
+        words = [
+            Document(text_representation=t, doc_id=i)
+            for t, i in zip(["submarine", None, "awesome", True, "unSubtle", "Sub", "", 4], [1, 3, 5, 9, 3, 2, 6, 7])
+        ]
+
+        def ids(docs):
+            return [(d.doc_id, d.text_representation) for d in docs]
+
+        for query, field, ignore_case in [
+            ("sub", "text_representation", True),
+            ("sub", "text_representation", False),
+            (3, "doc_id", True),
+            (4, "text_representation", True),
+        ]:
+            expected = [d for d in words if match_filter_operation(d, query, field, ignore_case)]
+            assert ids(match_filter_batch(words, query, field, ignore_case)) == ids(expected)
+
+        for start, end in [(2, 4), (5, None), (None, 5)]:
+            expected = [d for d in words if range_filter_operation(d, "doc_id", start, end)]
+            assert ids(range_filter_batch(words, "doc_id", start, end)) == ids(expected)
+
+        dates = [Document(text_representation=t) for t in ["January 1, 2022", "2/4/20", "2022-06-07T03:47:00Z"] * 3]
+        expected = [
+            d for d in dates if range_filter_operation(d, "text_representation", "01-01-2022", "2022-12-31", True)
+        ]
+        result = range_filter_batch(dates, "text_representation", "01-01-2022", "2022-12-31", True)
+        assert [d.text_representation for d in result] == [d.text_representation for d in expected]
+        assert len(result) == 6
+
+        with pytest.raises(ValueError):
+            range_filter_batch(words, "text_representation", "2022", None, True)
+        with pytest.raises(ValueError):
+            range_filter_batch(words, "doc_id")
+
     # LLM Generate
     def test_llm_generate(words_and_ids_docset):
         response = llm_generate_operation(client=MockLLM(), question="", result_description="", result_data=[""])
@@ -246,6 +283,52 @@ class TestOperations:
             elif doc.parent_id == 1:
                 assert doc.text_representation == "2"
 
+    @pytest.mark.parametrize("broadcast_threshold", [64 * 1024 * 1024, 0])
+    def test_join_combines_properties(self, generate_docset, broadcast_threshold):
+        counts = generate_docset(
+            {
+                "text_representation": ["", "", ""],
+                "properties": [{"key": "a", "count": 2}, {"key": "b", "count": 1}, {"key": "z", "count": 7}],
+            }
+        )
+        records = generate_docset(
+            {
+                "doc_id": [1, 2, 3, 4],
+                "properties": [{"kind": "a", "count": 0}, {"kind": "b"}, {"kind": "a"}, {"kind": "c"}],
+            }
+        )
+        joined = join_operation(
+            docset1=counts,
+            docset2=records,
+            field1="properties.key",
+            field2="properties.kind",
+            how="inner",
+            broadcast_threshold=broadcast_threshold,
+        )
+        docs = sorted(joined.take_all(), key=lambda d: d.doc_id)
+        assert [d.doc_id for d in docs] == [1, 2, 3]
+        assert docs[0].properties == {"kind": "a", "key": "a", "count": 0}
+        assert docs[1].properties == {"kind": "b", "key": "b", "count": 1}
+        assert docs[2].properties == {"kind": "a", "key": "a", "count": 2}
+
+    @pytest.mark.parametrize("broadcast_threshold", [64 * 1024 * 1024, 0])
+    def test_join_filters_by_default(self, generate_docset, broadcast_threshold):
+        keys = generate_docset({"text_representation": ["", "", ""], "properties": [{"key": "a"}, {"key": "a"}, {}]})
+        records = generate_docset(
+            {"doc_id": [1, 2, 3], "properties": [{"kind": "a"}, {"kind": "b"}, {"kind": "a", "count": 1}]}
+        )
+        joined = join_operation(
+            docset1=keys,
+            docset2=records,
+            field1="properties.key",
+            field2="properties.kind",
+            broadcast_threshold=broadcast_threshold,
+        )
+        docs = sorted(joined.take_all(), key=lambda d: d.doc_id)
+        assert [d.doc_id for d in docs] == [1, 3]
+        assert docs[0].properties == {"kind": "a"}
+        assert docs[1].properties == {"kind": "a", "count": 1}
+
     # Math
     def test_math(self):
         assert math_operation(val1=1, val2=2, operator="add") == 3
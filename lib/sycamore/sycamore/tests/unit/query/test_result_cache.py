@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, patch
+
+import sycamore
+
+from sycamore.query.client import SycamoreQueryClient
+from sycamore.query.logical_plan import LogicalPlan
+from sycamore.query.operators.count import Count
+from sycamore.query.operators.loaddata import LoadData
+from sycamore.query.result_cache import QueryCache, TTLCache, result_cache_key
+from sycamore.query.schema import get_index_version
+
+
+def make_plan(load_id: int, count_id: int, query: str = "How many?") -> LogicalPlan:
+    load = LoadData(node_id=load_id, description="Load data", index="ntsb")
+    count = Count(node_id=count_id, description="Count", input=[load_id])
+    load._downstream_nodes = [count]
+    count._dependencies = [load]
+    return LogicalPlan(result_node=count, nodes={load_id: load, count_id: count}, query=query)
+
+
+def test_canonical_plan_ignores_node_ids_and_question():
+    key = result_cache_key(make_plan(0, 1), "ntsb", (10, 10, 0, 1))
+    assert result_cache_key(make_plan(7, 3, query="Count them"), "ntsb", (10, 10, 0, 1)) == key
+    assert result_cache_key(make_plan(0, 1), "ntsb", (11, 11, 0, 2)) != key
+    assert result_cache_key(make_plan(0, 1), "ntsb", (10, 10, 0, 1), dry_run=True) != key
+
+
+def test_ttl_cache_expiry_and_invalidation():
+    now = [0.0]
+    cache = TTLCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    cache.set("a", 1, "ntsb")
+    cache.set("b", 2, "other")
+    assert cache.get("a") == 1
+
+    now[0] = 11
+    assert cache.get("a") is None
+
+    cache.set("a", 1, "ntsb")
+    cache.set("c", 3, "ntsb")
+    assert len(cache) == 2 and cache.get("b") is None
+
+    cache.invalidate("ntsb")
+    assert len(cache) == 0
+
+
+def test_query_reuses_plan_and_result():
+    client = SycamoreQueryClient(cache=QueryCache())
+    patch_schema = patch.object(client, "get_opensearch_schema", return_value={"field": "str"})
+    patch_version = patch.object(client, "get_index_version", return_value=(10, 10, 0, 1))
+    patch_generate = patch.object(client, "generate_plan", side_effect=lambda q, i, s: make_plan(0, 1, q))
+    patch_run = patch.object(client, "run_plan", return_value=("id", "42"))
+    with patch_schema, patch_version as version, patch_generate as generate, patch_run as run:
+        assert client.query("How many?", "ntsb") == "42"
+        assert client.query("How many?", "ntsb") == "42"
+        assert generate.call_count == 1 and run.call_count == 1
+
+        # A different question that plans to the same thing reuses the result.
+        assert client.query("Count them", "ntsb") == "42"
+        assert generate.call_count == 2 and run.call_count == 1
+
+        version.return_value = (11, 11, 0, 2)
+        client.query("How many?", "ntsb")
+        assert generate.call_count == 2 and run.call_count == 2
+
+        client.invalidate_cache("ntsb")
+        client.query("How many?", "ntsb")
+        assert generate.call_count == 3 and run.call_count == 3
+
+
+def test_query_does_not_cache_lazy_results():
+    client = SycamoreQueryClient(cache=QueryCache())
+    docset = sycamore.init().read.document([])
+    patch_schema = patch.object(client, "get_opensearch_schema", return_value={"field": "str"})
+    patch_version = patch.object(client, "get_index_version", return_value=(10, 10, 0, 1))
+    patch_generate = patch.object(client, "generate_plan", side_effect=lambda q, i, s: make_plan(0, 1, q))
+    patch_run = patch.object(client, "run_plan", return_value=("id", docset))
+    with patch_schema, patch_version, patch_generate, patch_run as run:
+        assert client.query("How many?", "ntsb") is docset
+        assert client.query("How many?", "ntsb") is docset
+        assert run.call_count == 2
+
+
+def test_index_version_tracks_refreshes():
+    client = MagicMock()
+    stats = {"docs": {"count": 10}, "indexing": {"index_total": 12, "delete_total": 2}, "refresh": {"total": 5}}
+    client.stats.return_value = {"_all": {"primaries": stats}}
+    assert get_index_version(client, "ntsb") == (10, 12, 2, 5)
+    stats["refresh"]["total"] = 6
+    assert get_index_version(client, "ntsb") == (10, 12, 2, 6)
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+from sycamore.query.schema import OpenSearchSchema, SchemaCache
+
+
+def test_get_schema_formats_sampled_examples():
+    client = MagicMock()
+    client.get_field_mapping.return_value = {
+        "ntsb": {
+            "mappings": {
+                "properties.entity.state": {},
+                "properties.entity.state.keyword": {},
+                "properties.entity.year": {},
+                "properties.entity.unused": {},
+                "text_representation": {},
+            }
+        }
+    }
+    executor = MagicMock()
+    executor.query.return_value = {
+        "result": {
+            "hits": {
+                "hits": [
+                    {"_source": {"properties": {"entity": {"state": "WA", "year": 2023}}}},
+                    {"_source": {"properties": {"entity": {"state": "CA"}}}},
+                ]
+            }
+        }
+    }
+
+    schema = OpenSearchSchema(client, "ntsb", executor, sample_size=2).get_schema()
+
+    assert schema == {
+        "properties.entity.state": "(<class 'str'>) e.g. (WA), (CA)",
+        "properties.entity.year": "(<class 'int'>) e.g. (2023)",
+        "text_representation": "(<class 'str'>) Can be assumed to have all other details",
+    }
+    query = executor.query.call_args[0][0]["query"]
+    assert query["size"] == 2
+    assert "random_score" in query["query"]["function_score"]
+
+
+def test_schema_cache_checks_version_after_refresh_interval():
+    now = [0.0]
+    cache = SchemaCache(refresh_interval_seconds=10, clock=lambda: now[0])
+    version = MagicMock(return_value=1)
+    extract = MagicMock(return_value={"a": "b"})
+
+    assert cache.get("ntsb", version, extract) == {"a": "b"}
+    assert cache.get("ntsb", version, extract) == {"a": "b"}
+    assert version.call_count == 1 and extract.call_count == 1
+
+    # Unchanged index: one version check, no extraction.
+    now[0] = 11
+    cache.get("ntsb", version, extract)
+    assert version.call_count == 2 and extract.call_count == 1
+
+    now[0] = 22
+    version.return_value = 2
+    cache.get("ntsb", version, extract)
+    assert extract.call_count == 2
+
+    cache.invalidate("ntsb")
+    cache.get("ntsb", version, extract)
+    assert extract.call_count == 3
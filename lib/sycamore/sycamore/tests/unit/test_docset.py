@@ -3,10 +3,11 @@ import string
 from typing import Callable, Optional
 
 import pytest
+import ray
 
 import sycamore
 from sycamore import DocSet, Context
-from sycamore.data import Document, Element
+from sycamore.data import Document, Element, MetadataDocument
 from sycamore.transforms import (
     Embedder,
     Embed,
@@ -27,6 +28,7 @@ from sycamore.llms import LLM
 from sycamore.transforms.base import get_name_from_callable
 from sycamore.transforms.extract_entity import OpenAIEntityExtractor
 from sycamore.transforms.extract_schema import SchemaExtractor
+from sycamore.transforms.llm_filter_cascade import KeywordPrefilter, LlmFilterCascade, cascade_stats
 from sycamore.transforms import Filter
 from sycamore.transforms.summarize import LLMElementTextSummarizer
 from sycamore.transforms.query import QueryExecutor
@@ -286,6 +288,48 @@ class TestDocSet:
         docset = context.read.document(docs)
         assert docset.count_distinct("doc_id") == 9
 
+    def test_count_skips_metadata(self):
+        docs = [Document(text_representation="metadata", doc_id=i) for i in range(5)]
+        docs += [MetadataDocument(nobel_prize="metadata"), MetadataDocument(x=1)]
+
+        context = sycamore.init()
+        docset = context.read.document(docs)
+        assert docset.count() == 5
+        assert docset.count(include_metadata=True) == 7
+        assert docset.count_distinct("text_representation") == 1
+
+    def test_numeric_aggregations(self):
+        docs = [Document(doc_id=str(i), properties={"pages": i, "label": str(i % 2)}) for i in range(10)]
+        docs.append(Document(doc_id="no_pages", properties={"pages": "n/a"}))
+        docs.append(Document(doc_id="nan_pages", properties={"pages": "nan"}))
+        docs.append(Document(doc_id="inf_pages", properties={"pages": "-inf"}))
+        docs.append(MetadataDocument(pages=100))
+
+        context = sycamore.init()
+        docset = context.read.document(docs)
+        stats = docset.aggregate("properties.pages")
+        assert stats == {"count": 10, "sum": 45, "min": 0, "max": 9, "mean": 4.5}
+        assert docset.sum("properties.pages") == 45
+        assert docset.min("properties.label") == 0
+        assert docset.max("properties.missing") is None
+
+        counts, edges = docset.histogram("properties.pages", bins=3)
+        assert counts == [3, 3, 4]
+        assert edges == [0.0, 3.0, 6.0, 9.0]
+
+        counts, edges = docset.histogram("properties.pages", bins=[0, 5, 100])
+        assert counts == [5, 5]
+
+    def test_aggregations_merge_many_blocks(self):
+        # One block per document, so the partials are combined by more than one level of merges.
+        docs = [Document(doc_id=str(i), properties={"pages": i}) for i in range(100)]
+
+        context = sycamore.init()
+        docset = context.read.document(docs)
+        assert docset.count() == 100
+        assert docset.count_distinct("doc_id") == 100
+        assert docset.aggregate("properties.pages") == {"count": 100, "sum": 4950, "min": 0, "max": 99, "mean": 49.5}
+
     def test_llm_filter(self):
 
         doc_list = [Document(text_representation="test1"), Document(text_representation="test2")]
@@ -313,3 +357,49 @@ class TestDocSet:
                 assert int(doc.properties[new_field]) == 4
             elif doc.text_representation == "test2":
                 assert int(doc.properties[new_field]) == 2
+
+    def test_llm_filter_cascade(self):
+        doc_list = [Document(text_representation="test1"), Document(text_representation="test2")]
+        context = sycamore.init()
+        docset = context.read.document(doc_list)
+        new_field = "_autogen_LLMFilterOutput"
+        cascade = LlmFilterCascade(KeywordPrefilter(), query="test1", reject_below=0.1)
+
+        filtered_docset = docset.llm_filter(
+            llm=MockLLM(), new_field=new_field, prompt=[], field="text_representation", threshold=3, cascade=cascade
+        )
+        docs = filtered_docset.take_all(include_metadata=True)
+
+        assert [d.text_representation for d in docs if not isinstance(d, MetadataDocument)] == ["test1"]
+        stats = cascade_stats(docs)
+        assert stats["documents"] == 2
+        assert stats["rejected"] == 1 and stats["llm_calls"] == 1 and stats["llm_calls_avoided"] == 1
+
+    def test_llm_filter_cascade_runs_in_actor_pool(self):
+        context = sycamore.init()
+        docset = context.read.document([Document(text_representation="test1")])
+        cascade = LlmFilterCascade(KeywordPrefilter(), query="test1", reject_below=0.1, max_actors=3)
+
+        filtered_docset = docset.llm_filter(llm=MockLLM(), new_field="out", prompt=[], cascade=cascade, num_cpus=0.5)
+        cascade_node = filtered_docset.plan.children[0]
+        assert cascade_node.resource_args["compute"].max_size == min(3, int(ray.cluster_resources()["CPU"]))
+        assert cascade_node.resource_args["num_cpus"] == 0.5
+        assert filtered_docset.plan.resource_args["num_cpus"] == 0.5
+
+    def test_llm_filter_cascade_calibrates_during_execution(self, mocker):
+        doc_list = [Document(text_representation=t) for t in ["test1", "test2"] * 4]
+        context = sycamore.init()
+        docset = context.read.document(doc_list)
+        cascade = LlmFilterCascade(KeywordPrefilter(), query="test1", recall_target=1.0, calibration_size=4)
+        take = mocker.spy(DocSet, "take")
+
+        filtered_docset = docset.llm_filter(
+            llm=MockLLM(), new_field="out", prompt=[], field="text_representation", threshold=3, cascade=cascade
+        )
+        assert take.call_count == 0
+        docs = filtered_docset.take_all(include_metadata=True)
+
+        assert [d.text_representation for d in docs if not isinstance(d, MetadataDocument)] == ["test1"] * 4
+        stats = cascade_stats(docs)
+        assert stats["documents"] == 8
+        assert stats["llm_calls"] >= 4 and stats["llm_calls"] + stats["rejected"] == 8
@@ -1,6 +1,6 @@
-from sycamore.rules import EnforceResourceUsage
+from sycamore.rules import EnforceResourceUsage, FuseSortLimit
 from sycamore.connectors.file import BinaryScan
-from sycamore.transforms import Partition, Explode
+from sycamore.transforms import Partition, Explode, Limit, Sort, TopK
 from sycamore.transforms.partition import UnstructuredPdfPartitioner
 from sycamore.connectors.opensearch import OpenSearchWriterClientParams, OpenSearchWriterTargetParams, OpenSearchWriter
 
@@ -19,3 +19,19 @@ class TestRewriter:
         assert scan.resource_args["num_cpus"] == 1 and "num_gpus" not in scan.resource_args
         assert explode.resource_args["num_cpus"] == 1 and "num_gpus" not in explode.resource_args
         assert writer.resource_args["num_cpus"] == 1 and "num_gpus" not in writer.resource_args
+
+    def test_fuse_sort_limit(self):
+        scan = BinaryScan("path", binary_format="pdf")
+        sort = Sort(scan, True, "properties.count", 0)
+        limit = Limit(sort, 5)
+        limit.traverse_down(FuseSortLimit())
+        top_k = limit.children[0]
+        assert isinstance(top_k, TopK)
+        assert top_k.children[0] is scan
+        assert top_k._k == 5 and top_k._descending and top_k._default_val == 0
+
+        # A Sort that is not directly limited is left alone.
+        sort = Sort(scan, True, "properties.count", 0)
+        explode = Explode(sort)
+        Limit(explode, 5).traverse_down(FuseSortLimit())
+        assert explode.children[0] is sort
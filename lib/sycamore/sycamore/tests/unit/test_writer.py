@@ -1,6 +1,6 @@
 import sycamore
 from sycamore import DocSet, Context
-from sycamore.data import Document, Element
+from sycamore.data import Document, Element, Table, TableElement
 from sycamore.plan_nodes import Node
 from sycamore.connectors.opensearch import OpenSearchWriter
 from sycamore.connectors.weaviate import WeaviateDocumentWriter
@@ -10,6 +10,9 @@ from sycamore.connectors.elasticsearch import ElasticsearchDocumentWriter
 import json
 from pathlib import Path
 
+import pyarrow.parquet as pq
+
+from sycamore.connectors.file.bundle_format import read_bundle_document, read_bundle_index
 from sycamore.connectors.file.file_writer import (
     default_filename,
     default_doc_to_bytes,
@@ -186,3 +189,78 @@ class TestDocSetWriter:
         doc_set = context.read.document(docs).map(noop_map)
         doc_set.write.json(str(tmp_path))
         _check_doc_blocks(docs, tmp_path)
+
+    def test_parquet_round_trip(self, tmp_path: Path):
+        docs = generate_docs(5, binary=True, num_elements=3)
+        for i, doc in enumerate(docs):
+            doc.embedding = [0.5 * i, 0.25, 1.0]
+            doc.properties["filetype"] = "pdf" if i % 2 == 0 else "html"
+            doc.elements[0]["bbox"] = (0.0, 0.5, 0.25, 1.0)
+        context = sycamore.init()
+        doc_set = context.read.document(docs)
+        doc_set.write.parquet(str(tmp_path), embedding_dim=3, partition_by=["filetype"])
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["properties.filetype=html", "properties.filetype=pdf"]
+        read_docs = context.read.parquet(str(tmp_path)).take_all()
+        assert sorted(read_docs, key=lambda d: d.doc_id or "") == docs
+
+        text_only = context.read.parquet(str(tmp_path), columns=["doc_id", "text_representation"]).take_all()
+        assert sorted(d.text_representation or "" for d in text_only) == sorted(
+            d.text_representation or "" for d in docs
+        )
+        assert all(d.embedding is None and d.binary_representation is None for d in text_only)
+
+    def test_parquet_stores_extra_fields_as_json(self, tmp_path: Path):
+        table = Table.from_html("<table><tr><th>a</th><th>b</th></tr><tr><td colspan='2'>x</td></tr></table>")
+        element = TableElement(table=table, tokens=[{"text": "a", "bbox": [0.0, 0.0, 1.0, 1.0]}])
+        doc = Document({"doc_id": "doc_0", "properties": {"raw": b"\x00\x01", "odd": complex(1, 2)}})
+        doc.elements = [element]
+        doc.data["custom"] = {"score": 0.5}
+        context = sycamore.init()
+        context.read.document([doc]).write.parquet(str(tmp_path))
+
+        stored = pq.read_table(tmp_path).to_pylist()[0]
+        assert json.loads(stored["extra"]) == {"custom": {"score": 0.5}}
+        assert json.loads(stored["properties"])["odd"] == "(1+2j)"
+        assert json.loads(stored["elements"][0]["extra"])["tokens"] == element.tokens
+
+        read_doc = context.read.parquet(str(tmp_path)).take_all()[0]
+        assert read_doc.data["custom"] == {"score": 0.5}
+        assert read_doc.properties == {"raw": b"\x00\x01", "odd": "(1+2j)"}
+        assert read_doc.elements[0].data["table"] == table
+        assert read_doc.elements[0].data["tokens"] == element.tokens
+
+    def test_file_writer_binary_bundles(self, tmp_path: Path):
+        docs = generate_docs(20, binary=True, num_elements=2)
+        context = sycamore.init()
+        doc_set = context.read.document(docs)
+        doc_set.write.files(str(tmp_path), bundle_format="binary")
+        read_docs = context.read.bundles(str(tmp_path)).take_all()
+        assert sorted(read_docs, key=lambda d: d.doc_id or "") == sorted(docs, key=lambda d: d.doc_id or "")
+
+    def test_file_writer_splits_bundles_by_size(self, tmp_path: Path):
+        # Exploding a document puts all of its elements in one block, so a single task writes them all.
+        docs = generate_docs(1, binary=True, num_elements=20)
+        context = sycamore.init()
+        context.read.document(docs).explode().write.files(str(tmp_path), bundle_format="binary", target_file_size=1024)
+        paths = sorted(p for p in tmp_path.iterdir())
+        read_docs = context.read.bundles(str(tmp_path)).take_all()
+        assert len(read_docs) == 21
+        assert 1 < len(paths) < len(read_docs)
+
+        docs_by_id = {d.doc_id: d for d in read_docs}
+        for p in paths:
+            with open(p, "rb") as f:
+                doc_ids = list(read_bundle_index(f, p.stat().st_size))
+            for doc_id in doc_ids:
+                assert doc_id is not None
+                assert read_bundle_document(str(p), doc_id) == docs_by_id[doc_id]
+        assert read_bundle_document(str(paths[0]), "missing") is None
+
+    def test_file_writer_jsonl_bundles(self, tmp_path: Path):
+        docs = generate_docs(5, num_elements=2)
+        context = sycamore.init()
+        doc_set = context.read.document(docs).map(noop_map)
+        doc_set.write.files(str(tmp_path), bundle_format="jsonl")
+        assert all(p.suffix == ".jsonl" for p in tmp_path.iterdir())
+        _check_doc_blocks(docs, tmp_path)
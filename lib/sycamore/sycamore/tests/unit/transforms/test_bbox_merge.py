@@ -1,3 +1,7 @@
+import copy
+import pickle
+import random
+
 import ray.data
 
 from sycamore.data import Document
@@ -9,6 +13,7 @@ from sycamore.transforms import (
     MarkDropTiny,
     SortByPageBbox,
 )
+from sycamore.transforms.bbox_merge import RowFinder, getRow
 from sycamore.transforms.merge_elements import Merge, MarkedMerger
 from sycamore.functions.tokenizer import HuggingFaceTokenizer
 from sycamore.plan_nodes import Node
@@ -134,3 +139,45 @@ class TestBboxMerge:
         merge = Merge(node, merger)
         output = merge.execute()
         output.show()
+
+
+def random_layout(rng: random.Random, pages: int, per_page: int) -> Document:
+    elements = []
+    for page in range(1, pages + 1):
+        for _ in range(per_page):
+            top = round(rng.random() * 0.9, rng.choice([2, 3]))  # coarse tops make rows share a top
+            kind = rng.random()
+            if kind < 0.3:
+                left = rng.choice([0.05, 0.25, 0.45, 0.65, 0.85])
+                elements.append(mkText("cell", page, left, top, left + 0.1, top + 0.02))
+            elif kind < 0.8:
+                left = rng.choice([0.05, 0.52]) + rng.random() * 0.05
+                elements.append(mkText(spew(20), page, left, top, left + 0.4, top + rng.random() * 0.1))
+            else:
+                elements.append(mkText(spew(60), page, 0.05, top, 0.95, top + 0.05))
+    return SortByPageBbox.sort_by_page_bbox(Document(elements=elements))
+
+
+def test_row_finder_matches_get_row():
+    for seed in range(5):
+        elements = random_layout(random.Random(seed), 3, 100).elements
+        finder = RowFinder.create(elements)
+        assert finder is not None
+        for i, elem in enumerate(elements):
+            assert [elements[j] for j in finder.row(i)] == getRow(elem, elements)
+
+    elements = random_layout(random.Random(0), 1, 10).elements
+    assert RowFinder.create(elements[::-1]) is None
+    elements[3].data["bbox"] = None
+    assert RowFinder.create(elements) is None
+
+
+def test_mark_break_by_column_matches_get_row(monkeypatch):
+    for seed in range(5):
+        doc = random_layout(random.Random(seed), 3, 100)
+        expected = copy.deepcopy(doc)
+        with monkeypatch.context() as m:
+            m.setattr(RowFinder, "create", staticmethod(lambda elements: None))
+            expected = MarkBreakByColumn.mark_break_by_column(expected)
+        actual = MarkBreakByColumn.mark_break_by_column(doc)
+        assert [pickle.dumps(e.data) for e in actual.elements] == [pickle.dumps(e.data) for e in expected.elements]
@@ -99,3 +99,18 @@ class TestEntityExtraction:
         execute.return_value = input_dataset
         output_dataset = extract_entity.execute()
         assert Document.from_row(output_dataset.take(1)[0]).properties.get("title") == "alt_title"
+
+    def test_extract_entity_document_field_prompt_not_shared(self):
+        llm = MockLLM()
+        generate = llm.generate
+        prompts = []
+
+        def record(*, prompt_kwargs, llm_kwargs=None):
+            prompts.append(prompt_kwargs)
+            return generate(prompt_kwargs=prompt_kwargs, llm_kwargs=llm_kwargs)
+
+        llm.generate = record  # type: ignore[method-assign]
+        extractor = OpenAIEntityExtractor("title", llm=llm, use_elements=False, prompt=[], field="properties.path")
+        extractor.extract_entity(Document(properties={"path": "a"}))
+        extractor.extract_entity(Document(properties={"path": "b"}))
+        assert prompts[1] == {"messages": [{"role": "user", "content": "b"}]}
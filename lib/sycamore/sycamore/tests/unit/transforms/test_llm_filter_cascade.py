@@ -0,0 +1,56 @@
+from sycamore.data import Document, MetadataDocument
+from sycamore.transforms.extract_entity import EntityExtractor
+from sycamore.transforms.llm_filter_cascade import (
+    CascadeFilter,
+    KeywordPrefilter,
+    LlmFilterCascade,
+    calibrate_reject_below,
+)
+
+
+class FakeExtractor(EntityExtractor):
+    """Scores documents mentioning engines 5 and everything else 1, counting the calls."""
+
+    def __init__(self):
+        super().__init__("score")
+        self.calls = 0
+
+    def extract_entity(self, document: Document) -> Document:
+        self.calls += 1
+        document.properties["score"] = 5 if "engine" in (document.text_representation or "") else 1
+        return document
+
+
+def test_keyword_prefilter():
+    scores = KeywordPrefilter().score(
+        "Which incidents involved engine failure?", ["The engine failed", "engine failure, engine failure", "Fog"]
+    )
+    assert scores[2] == 0.0
+    assert 0 < scores[0] < scores[1] <= 1
+    assert KeywordPrefilter().score("what is the", ["anything"]) == [0.0]
+
+
+def test_calibrate_reject_below():
+    scores = [0.1, 0.2, 0.3, 0.4, 0.5, 0.9]
+    relevant = [False, True, True, True, True, False]
+    assert calibrate_reject_below(scores, relevant, recall_target=1.0) == 0.2
+    assert calibrate_reject_below(scores, relevant, recall_target=0.75) == 0.3
+    assert calibrate_reject_below(scores, relevant, recall_target=0.0) == 0.5
+    assert calibrate_reject_below(scores, [False] * 6, recall_target=1.0) is None
+
+
+def test_cascade_filter_calibrates_on_first_documents():
+    texts = ["engine failure", "fog", "engine fire", "icing"] + ["engine", "bird strike", "engine stall"]
+    docs = [Document(text_representation=t) for t in texts]
+    extractor = FakeExtractor()
+    cascade = LlmFilterCascade(KeywordPrefilter(), query="engine", recall_target=1.0, calibration_size=4)
+    cascade_filter = CascadeFilter(cascade, extractor, "text_representation", "score", 3)
+
+    out = cascade_filter(docs[:2]) + cascade_filter(docs[2:])
+    kept = [d.text_representation for d in out if not isinstance(d, MetadataDocument)]
+    assert kept == ["engine failure", "fog", "engine fire", "icing", "engine", "engine stall"]
+    # The four calibration documents and the two engine documents after them; "bird strike" is rejected.
+    assert extractor.calls == 6
+    stats = [d.metadata["llm_filter_cascade"] for d in out if isinstance(d, MetadataDocument)]
+    assert stats[0] == {"documents": 2, "rejected": 0, "accepted": 0, "llm_calls": 2}
+    assert stats[1] == {"documents": 5, "rejected": 1, "accepted": 0, "llm_calls": 4}
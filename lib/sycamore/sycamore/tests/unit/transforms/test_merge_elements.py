@@ -1,11 +1,22 @@
+import pickle
+import random
+
 import pytest
 import ray.data
 
 import sycamore
 from sycamore.data import Document
-from sycamore.transforms.merge_elements import GreedyTextElementMerger, Merge
-from sycamore.functions.tokenizer import HuggingFaceTokenizer
+from sycamore.transforms.embed import Embedder
+from sycamore.transforms.merge_elements import (
+    ElementMerger,
+    GreedyTextElementMerger,
+    MarkedMerger,
+    Merge,
+    SemanticElementMerger,
+)
+from sycamore.functions.tokenizer import CharacterTokenizer, HuggingFaceTokenizer
 from sycamore.plan_nodes import Node
+from sycamore.tests.unit.element_helpers import random_merge_elements, reference_marked_merge, serialized_elements
 
 
 class FakeNode(Node):
@@ -16,6 +27,65 @@ class FakeNode(Node):
         return ray.data.from_items([self.doc])
 
 
+@pytest.mark.parametrize("seed", range(5))
+def test_greedy_merge_matches_pairwise_merge(seed):
+    elements = random_merge_elements(random.Random(seed), 300)
+    for merge_across_pages in (True, False):
+        merger = GreedyTextElementMerger(CharacterTokenizer(), 80, merge_across_pages=merge_across_pages)
+        # Without merging across pages every element needs a page number.
+        data = pickle.dumps([e for e in elements if merge_across_pages or "page_number" in e["properties"]])
+        expected = ElementMerger.merge_elements(merger, Document(elements=pickle.loads(data)))
+        actual = merger.merge_elements(Document(elements=pickle.loads(data)))
+        assert serialized_elements(actual) == serialized_elements(expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_marked_merge_matches_reference(seed):
+    elements = random_merge_elements(random.Random(seed), 300)
+    expected = reference_marked_merge(Document(elements=pickle.loads(pickle.dumps(elements))))
+    actual = MarkedMerger().merge_elements(Document(elements=pickle.loads(pickle.dumps(elements))))
+    assert serialized_elements(actual) == serialized_elements(expected)
+
+
+class TopicEmbedder(Embedder):
+    """Embeds text by which of two topics it mentions."""
+
+    def __init__(self):
+        super().__init__("topics")
+        self.calls = 0
+
+    def generate_embeddings(self, doc_batch: list[Document]) -> list[Document]:
+        self.calls += 1
+        for doc in doc_batch:
+            text = doc.text_representation or ""
+            doc.embedding = [float("cat" in text), float("dog" in text), 0.1]
+        return doc_batch
+
+
+def test_semantic_merge_breaks_at_topic_change():
+    texts = ["cat one", "cat two", "cat three", None, "dog one", "dog two", "cat four"]
+    doc = Document(elements=[{"text_representation": t, "properties": {"page_number": 1}} for t in texts])
+    embedder = TopicEmbedder()
+    merger = SemanticElementMerger(embedder, CharacterTokenizer(), max_tokens=1000, threshold=0.5)
+
+    elements = merger.merge_elements(doc).elements
+    assert embedder.calls == 1
+    assert [e.text_representation for e in elements] == ["cat one\ncat two\ncat three", "dog one\ndog two", "cat four"]
+    assert elements[0].data["embedding"] == pytest.approx([1 / 1.01**0.5, 0, 0.1 / 1.01**0.5])
+    # A single element chunk keeps the embedding of the element.
+    assert elements[2].data["embedding"] == [1.0, 0.0, 0.1]
+    assert all("token_count" not in e.data for e in elements)
+
+    # The token limit wins over similarity, and small chunks are not ended at a similarity drop.
+    doc = Document(elements=[{"text_representation": t, "properties": {"page_number": 1}} for t in texts])
+    merger = SemanticElementMerger(TopicEmbedder(), CharacterTokenizer(), max_tokens=17, min_tokens=10, threshold=0.5)
+    assert [e.text_representation for e in merger.merge_elements(doc).elements] == [
+        "cat one\ncat two",
+        "cat three\ndog one",
+        "dog two\ncat four",
+    ]
+
+
 class TestMergeElements:
     passage1 = """Recurrent neural networks, long short-term memory [12]
                                             and gated recurrent [7] neural networks in particular,
@@ -5,6 +5,7 @@ import random
 import sycamore
 from sycamore import DocSet
 from sycamore.data import Document, MetadataDocument
+from sycamore.transforms.sort import Sort, TopK
 
 
 class TestSort:
@@ -83,3 +84,17 @@ class TestSort:
                 assert sorted_doc_list[i].text_representation == "C"
             elif i == 4:
                 assert sorted_doc_list[i].text_representation == "Z"
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_top_k_matches_sort_and_limit(self, docs: list[Document], descending: bool):
+        context = sycamore.init()
+        docset = context.read.document(docs)
+        expected = sorted(docs, key=lambda d: d.properties["document_number"], reverse=descending)[:3]
+
+        top_k = DocSet(context, TopK(docset.plan, descending, "properties.document_number", k=3)).take_all()
+        assert [d.doc_id for d in top_k] == [d.doc_id for d in expected]
+
+        fused = docset.sort(descending, "properties.document_number").limit(3)
+        assert isinstance(fused.plan.children[0], Sort)
+        assert [d.doc_id for d in fused.take_all()] == [d.doc_id for d in expected]
+        assert isinstance(fused.plan.children[0], TopK)
@@ -1,8 +1,11 @@
+import random
+import re
+
 import ray.data
 
-from sycamore.data import Document
+from sycamore.data import Document, Element
 from sycamore.transforms.split_elements import SplitElements
-from sycamore.functions.tokenizer import HuggingFaceTokenizer
+from sycamore.functions.tokenizer import CharacterTokenizer, HuggingFaceTokenizer, Tokenizer
 from sycamore.plan_nodes import Node
 
 
@@ -14,6 +17,14 @@ class FakeNode(Node):
         return ray.data.from_items([self.doc])
 
 
+class WordTokenizer(Tokenizer):
+    def tokenize(self, text: str, as_ints: bool = False):
+        return re.findall(r"\w+|[^\w\s]", text)
+
+    def token_offsets(self, text: str):
+        return [m.span() for m in re.finditer(r"\w+|[^\w\s]", text)]
+
+
 class TestSplitElements:
     doc = Document(
         {
@@ -62,3 +73,16 @@ class TestSplitElements:
         assert elems[7].text_representation == "thirtyeight thirtynine forty fortyone fortytwo fortythree "
         assert elems[8].text_representation == "fortyfour fortyfive fortysix "
         assert elems[9].text_representation == "fortyseven fortyeight fortynine"
+
+    def test_offset_split_matches_retokenizing(self):
+        rng = random.Random(0)
+        words = ["alpha", "be", "c", "delta.", "e;", "(f)", "g:", "h,", "iota!", "kappa?"]
+        for tokenizer in [CharacterTokenizer(), WordTokenizer()]:
+            for _ in range(50):
+                text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 200)))
+                maximum = rng.randint(2, 40)
+                expected = SplitElements._split_one_retokenizing(Element(text_representation=text), tokenizer, maximum)
+                actual = SplitElements.split_one(Element(text_representation=text), tokenizer, maximum)
+                assert [e.text_representation for e in actual] == [e.text_representation for e in expected]
+                assert "".join(e.text_representation for e in actual) == text
+                assert all(len(tokenizer.tokenize(e.text_representation)) <= maximum for e in actual)
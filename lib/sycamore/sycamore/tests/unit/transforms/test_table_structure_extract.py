@@ -0,0 +1,83 @@
+import copy
+
+import torch
+from PIL import Image
+
+from sycamore.data import BoundingBox, Element, TableElement
+from sycamore.transforms.table_structure.extract import TableTransformerStructureExtractor
+
+
+class FakeOutputs(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+class FakeStructureModel:
+    """Predicts a table of two rows and two columns filling the unpadded part of every image."""
+
+    # (cx, cy, w, h) relative to the image, and the label of each prediction.
+    BOXES = [(0.5, 0.5, 0.9, 0.9), (0.275, 0.5, 0.45, 0.9), (0.725, 0.5, 0.45, 0.9), (0.5, 0.275, 0.9, 0.45)]
+    BOXES += [(0.5, 0.725, 0.9, 0.45)]
+    LABELS = [0, 1, 1, 2, 2]
+
+    def __init__(self):
+        self.config = type("Config", (), {"id2label": {0: "table", 1: "table column", 2: "table row"}})()
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, pixel_values, pixel_mask):
+        self.batch_sizes.append(len(pixel_values))
+        logits = torch.full((len(pixel_values), len(self.LABELS), 4), -10.0)
+        logits[:, range(len(self.LABELS)), self.LABELS] = 10.0
+        pred_boxes = torch.tensor([self.BOXES] * len(pixel_values))
+        return FakeOutputs(logits=logits, pred_boxes=pred_boxes)
+
+
+def table(bbox: BoundingBox, page_size: tuple[int, int], texts: list[str]) -> TableElement:
+    """A table with one token in the middle of each of its four cells, as the fake model will predict them."""
+    width, height = page_size
+    crop = bbox.to_absolute(width, height)
+    crop = BoundingBox(crop.x1 - 10, crop.y1 - 10, crop.x2 + 10, crop.y2 + 10)
+    tokens = []
+    for text, (fx, fy) in zip(texts, [(0.275, 0.275), (0.725, 0.275), (0.275, 0.725), (0.725, 0.725)]):
+        x, y = crop.x1 + fx * crop.width, crop.y1 + fy * crop.height
+        tokens.append({"text": text, "bbox": BoundingBox(x - 5, y - 3, x + 5, y + 3).to_relative(width, height)})
+    return TableElement(bbox=bbox.coordinates, tokens=tokens)
+
+
+def test_extract_batch_matches_extract():
+    pages = [Image.new("RGB", (600, 800), "white"), Image.new("RGB", (800, 600), "white")]
+    tables = [
+        table(BoundingBox(0.1, 0.1, 0.9, 0.3), pages[0].size, ["a", "b", "c", "d"]),
+        table(BoundingBox(0.1, 0.5, 0.5, 0.9), pages[0].size, ["e", "f", "g", "h"]),
+        table(BoundingBox(0.2, 0.2, 0.8, 0.4), pages[1].size, ["i", "j", "k", "l"]),
+        TableElement(),
+    ]
+    images = [pages[0], pages[0], pages[1], pages[1]]
+
+    one_by_one = TableTransformerStructureExtractor()
+    one_by_one.structure_model = FakeStructureModel()
+    expected = [one_by_one.extract(t, image) for t, image in zip(copy.deepcopy(tables), images)]
+    assert one_by_one.structure_model.batch_sizes == [1, 1, 1]
+
+    batched = TableTransformerStructureExtractor(batch_size=2)
+    batched.structure_model = FakeStructureModel()
+    result = batched.extract_batch(copy.deepcopy(tables), images)
+    assert batched.structure_model.batch_sizes == [2, 1]
+
+    assert [t.table for t in result] == [t.table for t in expected]
+    assert [cell.content for cell in result[1].table.cells] == ["e", "f", "g", "h"]
+    assert result[3].table is None
+
+
+def test_extract_from_pages():
+    page = Image.new("RGB", (600, 800), "white")
+    layout = [
+        [Element({"type": "Text"}), table(BoundingBox(0.1, 0.1, 0.9, 0.3), page.size, ["a", "b", "c", "d"])],
+        [table(BoundingBox(0.1, 0.5, 0.5, 0.9), page.size, ["e", "f", "g", "h"])],
+    ]
+    extractor = TableTransformerStructureExtractor()
+    extractor.structure_model = FakeStructureModel()
+    extractor.extract_from_pages(layout, [page, page])
+    assert extractor.structure_model.batch_sizes == [2]
+    assert [cell.content for cell in layout[0][1].table.cells] == ["a", "b", "c", "d"]
+    assert [cell.content for cell in layout[1][0].table.cells] == ["e", "f", "g", "h"]
@@ -0,0 +1,80 @@
+import copy
+import json
+
+import pytest
+
+from sycamore.data import BoundingBox, Table
+from sycamore.data.table import TableCell
+from sycamore.tests.config import TEST_DIR
+from sycamore.transforms.table_structure.table_transformers import (
+    DEFAULT_STRUCTURE_CLASS_THRESHOLDS,
+    nms,
+    objects_to_structures,
+    objects_to_table,
+    slot_into_containers,
+    structure_to_cells,
+)
+
+# Synthetic table structure model outputs, with the cells the loop-based postprocessing produced for them.
+# See sycamore/tests/manual/table_transformers_benchmark.py.
+with open(TEST_DIR / "resources/data/json/table_structure_objects.json") as f:
+    CASES = json.load(f)
+
+CELL_KEYS = ["bbox", "row_nums", "column_nums", "column header", "projected row header", "cell text"]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[f"case{i}" for i in range(len(CASES))])
+def test_postprocessing_matches_stored_outputs(case):
+    # Postprocessing updates the objects in place.
+    case = copy.deepcopy(case)
+    structure = objects_to_structures(case["objects"], case["tokens"], DEFAULT_STRUCTURE_CLASS_THRESHOLDS)
+    cells, confidence = structure_to_cells(structure, case["tokens"])
+    assert [{k: cell[k] for k in CELL_KEYS} for cell in cells] == case["expected"]["cells"]
+    assert confidence == case["expected"]["confidence"]
+
+
+def test_objects_to_table():
+    case = copy.deepcopy(CASES[7])
+    table = objects_to_table(case["objects"], case["tokens"])
+    expected = [
+        TableCell(
+            content=cell["cell text"],
+            rows=list(cell["row_nums"]),
+            cols=list(cell["column_nums"]),
+            is_header=cell["column header"],
+            bbox=BoundingBox(*cell["bbox"]),
+        )
+        for cell in case["expected"]["cells"]
+    ]
+    assert table == Table(expected)
+
+
+def test_slot_into_containers():
+    containers = [{"bbox": [0, 0, 10, 10]}, {"bbox": [5, 0, 15, 10]}, {"bbox": [0, 0, 20, 10]}]
+    packages = [{"bbox": [6, 2, 8, 4]}, {"bbox": [12, 2, 14, 4]}, {"bbox": [30, 2, 32, 4]}]
+
+    by_container, by_package, scores = slot_into_containers(containers, packages)
+    assert by_container == [[0], [1], []]
+    assert by_package == [[0], [1], []]
+    assert scores == [1.0, 1.0, 0.0]
+
+    by_container, by_package, _ = slot_into_containers(containers, packages, unique_assignment=False)
+    assert by_container == [[0], [0, 1], [0, 1]]
+    assert by_package == [[0, 1, 2], [1, 2], []]
+
+    by_container, by_package, _ = slot_into_containers(containers, packages, forced_assignment=True)
+    assert by_container == [[0, 2], [1], []]
+
+    with pytest.raises(ZeroDivisionError):
+        slot_into_containers(containers, [{"bbox": [1, 1, 1, 1]}])
+
+
+def test_nms():
+    objects = [
+        {"bbox": [0, 0, 10, 10], "score": 0.5},
+        {"bbox": [1, 1, 9, 9], "score": 0.9},
+        {"bbox": [20, 0, 30, 10], "score": 0.7},
+    ]
+    assert nms(objects) == [objects[1], objects[2]]
+    assert nms(objects, keep_higher=False) == [objects[0], objects[2]]
+    assert nms(objects, match_criteria="iou", match_threshold=0.7) == [objects[1], objects[2], objects[0]]
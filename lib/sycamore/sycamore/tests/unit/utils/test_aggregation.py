@@ -0,0 +1,19 @@
+import pickle
+
+from sycamore.data import Document, MetadataDocument
+from sycamore.utils.aggregation import is_metadata_row
+
+
+def test_is_metadata_row_without_unpickling(mocker):
+    deserialize = mocker.spy(Document, "deserialize")
+    assert is_metadata_row(MetadataDocument(lineage_links={"from_ids": ["a"]}).to_row())
+    assert is_metadata_row(MetadataDocument({"extra": 1, "metadata": {"a": 1}}).to_row())
+    assert not is_metadata_row(Document(text_representation="text", properties={"n": 1}).to_row())
+    assert deserialize.call_count == 0
+
+
+def test_is_metadata_row_falls_back_to_unpickling():
+    assert not is_metadata_row(Document(text_representation="about metadata").to_row())
+    # Rows not written by MetadataDocument.serialize may have the metadata key anywhere.
+    assert is_metadata_row({"doc": pickle.dumps({"extra": 1, "metadata": {}})})
+    assert is_metadata_row({"doc": pickle.dumps({"extra": 1, "metadata": {}}, protocol=2)})
@@ -31,7 +31,8 @@ from sycamore.transforms.random_sample import RandomSample
 from sycamore.transforms.split_elements import SplitElements
 from sycamore.transforms.query import Query
 from sycamore.transforms.term_frequency import TermFrequency
-from sycamore.transforms.sort import Sort
+from sycamore.transforms.sort import Sort, TopK
+from sycamore.transforms.join import HashJoin
 from sycamore.transforms.llm_query import LLMQuery
 
 __all__ = [
@@ -72,5 +73,7 @@ __all__ = [
     "Query",
     "TermFrequency",
     "Sort",
+    "TopK",
+    "HashJoin",
     "LLMQuery",
 ]
@@ -1,5 +1,7 @@
+from bisect import bisect_right
 from typing import Optional
 
+import numpy as np
 
 from sycamore.data import Document, Element
 from sycamore.plan_nodes import Node, SingleThreadUser, NonGPUUser
@@ -82,6 +84,134 @@ def getRow(elem: Element, elements: list[Element]) -> list[Element]:
     return rv
 
 
+# Scanned ranges shorter than this are tested in Python; numpy's per-call overhead dominates below it.
+_VECTORIZE_MIN = 32
+
+
+class RowFinder:
+    """
+    Finds the same rows as getRow for every element of a list, but with the bounding boxes unpacked
+    into arrays once. Within each page the tops are sorted, so the end of the scan done by getRow is
+    found by binary search, and the elements in the scanned range are tested in one vectorized step.
+    Use RowFinder.create, which returns None for lists getRow would not handle the same way.
+    """
+
+    def __init__(self, elements: list[Element], pages: list, bboxes: np.ndarray):
+        self._elements = elements
+        self._pages = pages
+        self._lefts = bboxes[:, 0].tolist()
+        self._tops = bboxes[:, 1].tolist()
+        self._rights = bboxes[:, 2].tolist()
+        self._bottoms = bboxes[:, 3].tolist()
+        self._left = bboxes[:, 0]
+        self._top = bboxes[:, 1]
+        self._right = bboxes[:, 2]
+        self._bottom = bboxes[:, 3]
+        # Start of each run of elements on the same page, and the end of the run each element is in.
+        starts = [i for i in range(len(pages)) if i == 0 or pages[i] != pages[i - 1]]
+        self._run_end = [0] * len(pages)
+        for start, end in zip(starts, starts[1:] + [len(pages)]):
+            self._run_end[start:end] = [end] * (end - start)
+
+    @staticmethod
+    def create(elements: list[Element]) -> Optional["RowFinder"]:
+        """Returns a RowFinder, or None unless every element has a bbox and a page number and the list is
+        sorted by page and top."""
+        if any(e.data.get("bbox") is None or "page_number" not in e.properties for e in elements):
+            return None
+        pages = [e.properties["page_number"] for e in elements]
+        bboxes = np.array([e.data["bbox"][:4] for e in elements], dtype=float).reshape(-1, 4)
+        tops = bboxes[:, 1].tolist()
+        for i in range(1, len(elements)):
+            if pages[i] < pages[i - 1] or (pages[i] == pages[i - 1] and tops[i] < tops[i - 1]):
+                return None
+        return RowFinder(elements, pages, bboxes)
+
+    def _scan_start(self, page, top: float) -> int:
+        # The binary search of getRow, including where it stops on an element with the same page and top.
+        pages, tops = self._pages, self._tops
+        beg, end, idx = 0, len(pages), 0
+        while beg < end:
+            mid = beg + ((end - beg) // 2)
+            if pages[mid] < page:
+                beg = mid + 1
+                idx = mid
+            elif pages[mid] > page:
+                end = mid
+            elif tops[mid] < top:
+                beg = mid + 1
+                idx = mid
+            elif tops[mid] > top:
+                end = mid
+            else:
+                break
+        return idx
+
+    def _scan_end(self, start: int, bottom: float) -> int:
+        # First element at or after start whose top is below bottom; the scan may run into later pages.
+        n = len(self._pages)
+        while start < n:
+            run_end = self._run_end[start]
+            pos = bisect_right(self._tops, bottom, start, run_end)
+            if pos < run_end:
+                return pos
+            start = run_end
+        return n
+
+    def row(self, i: int) -> list[int]:
+        """Returns the indices of the elements getRow would return for element i, in the same order."""
+        left, top, right, bottom = self._lefts[i], self._tops[i], self._rights[i], self._bottoms[i]
+        start = self._scan_start(self._pages[i], self._tops[i])
+        end = self._scan_end(start, bottom)
+        if end - start < _VECTORIZE_MIN:
+            lefts, rights, bottoms = self._lefts, self._rights, self._bottoms
+            rv = [i] + [j for j in range(start, end) if bottoms[j] >= top and (lefts[j] > right or rights[j] < left)]
+        else:
+            window = slice(start, end)
+            hits = np.nonzero(
+                (self._bottom[window] >= top) & ((self._left[window] > right) | (self._right[window] < left))
+            )[0]
+            rv = [i] + (hits + start).tolist()
+        rv.sort(key=lambda j: (self._lefts[j], self._tops[j]))
+        return rv
+
+    def tag_columns(self, full_width: float) -> None:
+        """Sets '_colIdx' and '_colCnt' as MarkBreakByColumn does with getRow, tracking them in lists
+        and only writing them to the elements at the end."""
+        elements = self._elements
+        lefts, rights = self._lefts, self._rights
+        col_idx = [e.data.get("_colIdx") for e in elements]
+        col_cnt = [e.data.get("_colCnt") for e in elements]
+        assigned_idx = [False] * len(elements)
+        assigned_cnt = [False] * len(elements)
+        for i in range(len(elements)):
+            if col_idx[i] is None:
+                row = self.row(i)
+                if len(row) == 1:
+                    col_idx[i] = 0
+                    col_cnt[i] = 0 if rights[i] - lefts[i] > full_width else 1  # 0 signals full-width
+                    assigned_idx[i] = assigned_cnt[i] = True
+                else:
+                    idx = -1
+                    last = 0.0
+                    for j in row:
+                        if lefts[j] >= last:  # may be stacked vertically
+                            idx += 1
+                        last = rights[j]
+                        if col_idx[j] is None:
+                            col_idx[j] = idx
+                            assigned_idx[j] = True
+                    for j in row:
+                        if col_cnt[j] is None:
+                            col_cnt[j] = idx + 1
+                            assigned_cnt[j] = True
+        for i, elem in enumerate(elements):
+            if assigned_idx[i]:
+                elem.data["_colIdx"] = col_idx[i]
+            if assigned_cnt[i]:
+                elem.data["_colCnt"] = col_cnt[i]
+
+
 def partOfTwoCol(elem: Element, xmin, xmax) -> bool:
     cc = elem.data.get("_colCnt")
     if (cc is None) or (cc != 2):
@@ -199,45 +329,51 @@ class MarkBreakByColumn(SingleThreadUser, NonGPUUser, Map):
         # measure width in-use
         xmin = 1.0  # FIXME are these global?
         xmax = 0.0
-        for elem in elements:
-            bbox = elem.data.get("bbox")
-            if (bbox is not None) and validBbox(bbox):
-                xmin = min(xmin, bbox[0])
-                xmax = max(xmax, bbox[2])
+        present = [e.data["bbox"][:4] for e in elements if e.data.get("bbox") is not None]
+        bboxes = np.array(present, dtype=float).reshape(-1, 4)
+        if len(bboxes):
+            valid = bboxes[((bboxes >= 0.0) & (bboxes <= 1.0)).all(axis=1)]
+            if len(valid):
+                xmin = min(xmin, float(valid[:, 0].min()))
+                xmax = max(xmax, float(valid[:, 2].max()))
         if xmin < xmax:
             fullWidth = (xmax - xmin) * 0.8  # fudge
         else:
             fullWidth = 0.8
 
         # tag elements by column
-        for elem in elements:
-            if elem.data.get("_colIdx") is None:
-                row = getRow(elem, elements)
-                if len(row) == 1:
-                    bbox = elem.data.get("bbox")
-                    if bbox is None:
-                        width = 0.0
-                    else:
-                        width = bbox[2] - bbox[0]
-                    if width > fullWidth:
-                        cnt = 0  # signal full-width
+        finder = RowFinder.create(elements)
+        if finder is not None:
+            finder.tag_columns(fullWidth)
+        else:
+            for elem in elements:
+                if elem.data.get("_colIdx") is None:
+                    row = getRow(elem, elements)
+                    if len(row) == 1:
+                        bbox = elem.data.get("bbox")
+                        if bbox is None:
+                            width = 0.0
+                        else:
+                            width = bbox[2] - bbox[0]
+                        if width > fullWidth:
+                            cnt = 0  # signal full-width
+                        else:
+                            cnt = 1
+                        elem.data["_colIdx"] = 0
+                        elem.data["_colCnt"] = cnt
                     else:
-                        cnt = 1
-                    elem.data["_colIdx"] = 0
-                    elem.data["_colCnt"] = cnt
-                else:
-                    idx = -1
-                    last = 0.0
-                    for ee in row:
-                        bbox = ee.data["bbox"]
-                        if bbox[0] >= last:  # may be stacked vertically
-                            idx += 1
-                        last = bbox[2]
-                        if ee.data.get("_colIdx") is None:
-                            ee.data["_colIdx"] = idx
-                    for ee in row:
-                        if ee.data.get("_colCnt") is None:
-                            ee.data["_colCnt"] = idx + 1
+                        idx = -1
+                        last = 0.0
+                        for ee in row:
+                            bbox = ee.data["bbox"]
+                            if bbox[0] >= last:  # may be stacked vertically
+                                idx += 1
+                            last = bbox[2]
+                            if ee.data.get("_colIdx") is None:
+                                ee.data["_colIdx"] = idx
+                        for ee in row:
+                            if ee.data.get("_colCnt") is None:
+                                ee.data["_colCnt"] = idx + 1
 
         # re-sort ranges of two-column text
         last = 0
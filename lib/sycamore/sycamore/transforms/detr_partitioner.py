@@ -28,7 +28,7 @@ from pdfminer.utils import open_filename
 from pdfminer.pdfparser import PDFParser
 from pdfminer.pdfdocument import PDFDocument
 
-from sycamore.data import Element, BoundingBox, ImageElement, TableElement
+from sycamore.data import Element, BoundingBox, ElementIndex, ImageElement, TableElement
 from sycamore.data.element import create_element
 from sycamore.transforms.table_structure.extract import DEFAULT_TABLE_STRUCTURE_EXTRACTOR
 from sycamore.utils import choose_device
@@ -101,14 +101,26 @@ class ArynPDFPartitioner:
         # update its text representation. We allow multiple detected objects contain the same text, we hold on solving
         # this.
 
-        unmatched = text.copy()
+        # Only text overlapping a detected object can match it, so look it up in an index instead of comparing
+        # every pair. A negative threshold matches even disjoint boxes, so then compare all pairs.
+        index = ElementIndex(text)
+        pages = index.page_numbers
+        is_matched = [False] * len(text)
+        position = {id(t): n for n, t in enumerate(text)}
         for index_i, i in enumerate(inferred):
             matched = []
-            for t in text:
-                if i.bbox and t.bbox and (i.bbox.iou(t.bbox) > threshold or i.bbox.contains(t.bbox)):
+            if i.bbox is None:
+                continue
+            if threshold < 0:
+                candidates = text
+            else:
+                candidates = [t for page in pages for t in index.elements_in_region(page, i.bbox)]
+                if len(pages) > 1:
+                    candidates.sort(key=lambda t: position[id(t)])
+            for t in candidates:
+                if t.bbox and (i.bbox.iou(t.bbox) > threshold or i.bbox.contains(t.bbox)):
                     matched.append(t)
-                    if t in unmatched:
-                        unmatched.remove(t)
+                    is_matched[position[id(t)]] = True
             if matched:
                 matches = []
                 full_text = []
@@ -122,7 +134,7 @@ class ArynPDFPartitioner:
 
                 i.text_representation = " ".join(full_text)
 
-        return inferred + unmatched
+        return inferred + [t for t, m in zip(text, is_matched) if not m]
 
     def partition_pdf(
         self,
@@ -431,13 +443,12 @@ class ArynPDFPartitioner:
 
         if extract_table_structure or extract_images:
             with LogTime("extract_images_or_table"):
+                if extract_table_structure:
+                    table_structure_extractor.extract_from_pages(deformable_layout, images)
                 for i, page_elements in enumerate(deformable_layout):
                     with LogTime(f"extract_images_or_table_one {i}/{len(deformable_layout)}"):
                         image = images[i]
                         for element in page_elements:
-                            if isinstance(element, TableElement) and extract_table_structure:
-                                table_structure_extractor.extract(element, image)
-
                             if isinstance(element, ImageElement) and extract_images:
                                 if element.bbox is None:
                                     continue
@@ -602,11 +613,7 @@ class ArynPDFPartitioner:
             with LogTime("extract_table_structure_batch"):
                 if table_structure_extractor is None:
                     table_structure_extractor = DEFAULT_TABLE_STRUCTURE_EXTRACTOR(device=self.device)
-                for i, page_elements in enumerate(deformable_layout):
-                    image = batch[i]
-                    for element in page_elements:
-                        if isinstance(element, TableElement):
-                            table_structure_extractor.extract(element, image)
+                table_structure_extractor.extract_from_pages(deformable_layout, batch)
 
         if extract_images:
             with LogTime("extract_images_batch"):
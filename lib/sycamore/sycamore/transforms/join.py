@@ -0,0 +1,189 @@
+import json
+import logging
+import pickle
+from typing import Any, Optional
+
+import numpy as np
+import ray
+from ray.data import Dataset
+
+from sycamore.data import Document, MetadataDocument
+from sycamore.plan_nodes import Node
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROADCAST_THRESHOLD = 64 * 1024 * 1024
+
+_LEFT = 0
+_RIGHT = 1
+_PASSTHROUGH = 2
+
+JOIN_TYPES = ("inner", "semi")
+
+
+def join_key(value: Any) -> Optional[str]:
+    """
+    Encodes a field value as a string so that it can be hashed and grouped on by Ray. Integral floats
+    are treated like ints, so 1 and 1.0 join with each other. Returns None for missing values, which
+    never join.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _join_doc(doc: Document, left_properties: dict[str, Any]) -> Document:
+    joined = Document(doc.data)
+    # Properties of the right side win on conflicts.
+    joined.properties = {**left_properties, **doc.properties}
+    return joined
+
+
+def _joined_docs(doc: Document, matches: list[dict[str, Any]], how: str) -> list[Document]:
+    if not matches:
+        return []
+    if how == "semi":
+        return [doc]
+    return [_join_doc(doc, props) for props in matches]
+
+
+class HashJoin(Node):
+    """
+    Equi-join of two DocSets, matching Documents where ``left_field`` of the left Document equals
+    ``right_field`` of the right Document. With ``how="inner"``, the output has the right Document once
+    per matching left Document, with the properties of the left Document added to it; properties of the
+    right Document win on conflicts. With ``how="semi"``, the output has each right Document that matches
+    at least one left Document, once and unchanged.
+
+    Only the join key and, for inner joins, the properties of the left side are kept. If that projection
+    is smaller than ``broadcast_threshold`` bytes it is broadcast to every task scanning the right side
+    (broadcast hash join); otherwise both sides are shuffled by key and joined per key (shuffle hash join).
+
+    Args:
+        left: The plan node providing the left (build) side.
+        right: The plan node providing the right (probe) side.
+        left_field: Field of the left Documents to join on, in dotted notation.
+        right_field: Field of the right Documents to join on, in dotted notation.
+        how: The type of join, "inner" or "semi".
+        broadcast_threshold: Largest size in bytes of the left projection that is broadcast.
+        resource_args: Additional resource-related arguments to pass to the execution env.
+    """
+
+    def __init__(
+        self,
+        left: Node,
+        right: Node,
+        left_field: str,
+        right_field: str,
+        how: str = "inner",
+        broadcast_threshold: int = DEFAULT_BROADCAST_THRESHOLD,
+        **resource_args,
+    ):
+        super().__init__([left, right], **resource_args)
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Unknown join type {how}; expected one of {list(JOIN_TYPES)}")
+        self._left_field = left_field
+        self._right_field = right_field
+        self._how = how
+        self._broadcast_threshold = broadcast_threshold
+
+    def __str__(self):
+        return "join"
+
+    def _left_projection(self, batch: dict[str, np.ndarray]) -> dict[str, list]:
+        keys, sides, values = [], [], []
+        for raw in batch["doc"]:
+            doc = Document.deserialize(raw)
+            if isinstance(doc, MetadataDocument):
+                continue
+            key = join_key(doc.field_to_value(self._left_field))
+            if key is None:
+                continue
+            keys.append(key)
+            sides.append(_LEFT)
+            # A semi join only needs to know that the key exists.
+            values.append(pickle.dumps(doc.properties if self._how == "inner" else {}))
+        return {"key": keys, "side": sides, "doc": values}
+
+    def _right_projection(self, batch: dict[str, np.ndarray]) -> dict[str, list]:
+        keys, sides, values = [], [], []
+        for raw in batch["doc"]:
+            doc = Document.deserialize(raw)
+            if isinstance(doc, MetadataDocument):
+                keys.append("")
+                sides.append(_PASSTHROUGH)
+            else:
+                key = join_key(doc.field_to_value(self._right_field))
+                if key is None:
+                    continue
+                keys.append(key)
+                sides.append(_RIGHT)
+            values.append(raw)
+        return {"key": keys, "side": sides, "doc": values}
+
+    def _join_group(self, group: dict[str, np.ndarray]) -> dict[str, list]:
+        left = [pickle.loads(v) for v, side in zip(group["doc"], group["side"]) if side == _LEFT]
+        out: list[bytes] = []
+        for raw, side in zip(group["doc"], group["side"]):
+            if side == _PASSTHROUGH:
+                out.append(raw)
+            elif side == _RIGHT and left:
+                doc = Document.deserialize(raw)
+                out.extend(d.serialize() for d in _joined_docs(doc, left, self._how))
+        return {"doc": out}
+
+    def _broadcast_join(self, right: Dataset, table: dict[str, list[dict[str, Any]]]) -> Dataset:
+        table_ref = ray.put(table)
+        right_field = self._right_field
+        how = self._how
+
+        def probe(batch: dict[str, np.ndarray]) -> dict[str, list]:
+            build = ray.get(table_ref)
+            out = []
+            for raw in batch["doc"]:
+                doc = Document.deserialize(raw)
+                if isinstance(doc, MetadataDocument):
+                    out.append(raw)
+                    continue
+                key = join_key(doc.field_to_value(right_field))
+                matches = build.get(key, []) if key is not None else []
+                out.extend(d.serialize() for d in _joined_docs(doc, matches, how))
+            return {"doc": out}
+
+        return right.map_batches(probe, batch_format="numpy", **self.resource_args)
+
+    def execute(self, **kwargs) -> Dataset:
+        assert self.children[0] is not None and self.children[1] is not None
+        left = self.children[0].execute(**kwargs)
+        right = self.children[1].execute(**kwargs)
+
+        left_keys = left.map_batches(self._left_projection, batch_format="numpy", **self.resource_args).materialize()
+        if left_keys.size_bytes() <= self._broadcast_threshold:
+            table: dict[str, list[dict[str, Any]]] = {}
+            for row in left_keys.iter_rows():
+                matches = table.setdefault(row["key"], [])
+                if self._how == "inner" or not matches:
+                    matches.append(pickle.loads(row["doc"]))
+            logger.info(f"Broadcast join with {len(table)} distinct keys")
+            return self._broadcast_join(right, table)
+
+        logger.info(f"Shuffle join; left side is {left_keys.size_bytes()} bytes")
+        right_keys = right.map_batches(self._right_projection, batch_format="numpy", **self.resource_args)
+        return left_keys.union(right_keys).groupby("key").map_groups(self._join_group, batch_format="numpy")
+
+    def local_execute(self, left: list[Document], right: list[Document]) -> list[Document]:
+        table: dict[str, list[dict[str, Any]]] = {}
+        for doc in left:
+            key = join_key(doc.field_to_value(self._left_field))
+            if key is not None and not isinstance(doc, MetadataDocument):
+                table.setdefault(key, []).append(doc.properties)
+        out: list[Document] = []
+        for doc in right:
+            if isinstance(doc, MetadataDocument):
+                out.append(doc)
+                continue
+            key = join_key(doc.field_to_value(self._right_field))
+            out.extend(_joined_docs(doc, table.get(key, []) if key is not None else [], self._how))
+        return out
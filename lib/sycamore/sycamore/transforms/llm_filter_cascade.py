@@ -0,0 +1,238 @@
+"""
+Cheap pre-filtering for LLM filters.
+
+An LLM filter asks the LLM to score every document. A cascade first scores the documents with a cheap
+relevance model (keyword overlap or embedding similarity), discards the ones that are clearly
+irrelevant, optionally keeps the ones that are clearly relevant, and only sends the uncertain band
+in between to the LLM.
+"""
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+import logging
+import math
+import re
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from sycamore.data import Document, MetadataDocument
+from sycamore.transforms.embed import Embedder
+from sycamore.transforms.extract_entity import EntityExtractor
+
+logger = logging.getLogger(__name__)
+
+CASCADE_METADATA_KEY = "llm_filter_cascade"
+
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from has have how in is it its of on or that the this to was "
+    "were what when where which who why with".split()
+)
+
+
+def _terms(text: str) -> list[str]:
+    return [t for t in _WORD.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class PrefilterScorer(ABC):
+    """Scores how relevant each text is to a query. Higher is more relevant; scores only need to be
+    comparable between texts scored for the same query."""
+
+    @abstractmethod
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        pass
+
+
+class KeywordPrefilter(PrefilterScorer):
+    """
+    BM25-style term matching without corpus statistics: each query term contributes a saturating
+    function of its frequency in the text, and the sum is normalized by the number of query terms so
+    scores lie in [0, 1].
+
+    Args:
+        k1: How quickly repeated occurrences of a term stop adding to the score.
+    """
+
+    def __init__(self, k1: float = 1.2):
+        self._k1 = k1
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        query_terms = set(_terms(query))
+        if not query_terms:
+            return [0.0] * len(texts)
+        scores = []
+        for text in texts:
+            tf = Counter(_terms(text))
+            total = sum(tf[t] * (self._k1 + 1) / (tf[t] + self._k1) for t in query_terms if t in tf)
+            scores.append(total / ((self._k1 + 1) * len(query_terms)))
+        return scores
+
+
+class EmbeddingPrefilter(PrefilterScorer):
+    """
+    Scores texts by the cosine similarity of their embeddings with the embedding of the query.
+
+    Args:
+        embedder: The Embedder used for both the query and the texts.
+    """
+
+    def __init__(self, embedder: Embedder):
+        self._embedder = embedder
+        self._query_embeddings: dict[str, np.ndarray] = {}
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        docs = self._embedder.generate_embeddings([Document(text_representation=t) for t in texts])
+        vectors = np.asarray([d.embedding for d in docs], dtype=float)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        if not texts:
+            return []
+        if query not in self._query_embeddings:
+            self._query_embeddings[query] = self._embed([query])[0]
+        return (self._embed(texts) @ self._query_embeddings[query]).tolist()
+
+
+def calibrate_reject_below(scores: Iterable[float], relevant: Iterable[bool], recall_target: float) -> Optional[float]:
+    """
+    Returns the highest score threshold that keeps at least recall_target of the relevant documents
+    of a labelled sample, or None if the sample has no relevant documents to calibrate with.
+    """
+    positives = sorted(s for s, r in zip(scores, relevant) if r)
+    if not positives:
+        return None
+    # Rejecting everything below positives[i] loses the i lowest-scoring relevant documents.
+    allowed_misses = math.floor((1 - recall_target) * len(positives) + 1e-9)
+    return positives[min(allowed_misses, len(positives) - 1)]
+
+
+@dataclass
+class LlmFilterCascade:
+    """
+    Configures the pre-filter of DocSet.llm_filter.
+
+    Documents scoring below ``reject_below`` are discarded and documents scoring at or above
+    ``accept_above`` are kept, both without calling the LLM. If ``reject_below`` is not given it is
+    calibrated while the filter runs: the first ``calibration_size`` documents are scored by both the
+    pre-filter and the LLM, and the threshold is set to keep ``recall_target`` of the documents the LLM
+    kept. If the sample contains no relevant documents every document goes to the LLM.
+
+    The cascade runs in a pool of up to ``max_actors`` actors, which send their documents to the LLM in
+    parallel. Each actor calibrates on the first ``calibration_size`` documents it sees.
+
+    Statistics are emitted as MetadataDocuments; use cascade_stats to sum them.
+
+    Args:
+        scorer: The cheap relevance model.
+        query: What the filter looks for, in words; usually the filter question.
+        recall_target: Fraction of relevant documents the pre-filter should keep when calibrating.
+        calibration_size: Number of documents labelled by the LLM when calibrating.
+        reject_below: Fixed score below which documents are discarded.
+        accept_above: Score at or above which documents are kept. Defaults to never.
+        max_actors: Largest number of actors running the cascade at once; also capped by the number of CPUs.
+    """
+
+    scorer: PrefilterScorer
+    query: str = ""
+    recall_target: float = 0.95
+    calibration_size: int = 50
+    reject_below: Optional[float] = None
+    accept_above: Optional[float] = None
+    max_actors: int = 8
+
+
+def _text(doc: Document, field: str) -> str:
+    return str(doc.field_to_value(field) or "")
+
+
+def _passes(doc: Document, new_field: str, threshold: int) -> bool:
+    try:
+        return int(doc.properties[new_field]) >= threshold
+    except Exception:
+        # accounts for llm output errors
+        return False
+
+
+class CascadeFilter:
+    """
+    Routes batches of documents through a cascade; used with DocSet.map_batch. Rejected documents are
+    dropped, accepted documents get ``threshold`` as their score and the rest are scored by the LLM. A
+    MetadataDocument with the routing counts is appended to each batch.
+
+    Without a fixed ``reject_below``, the first ``calibration_size`` documents all go to the LLM, and
+    their pre-filter scores and LLM decisions set the threshold for the documents after them. The LLM
+    scores of the sample are also its filter results, so calibrating costs no extra LLM calls. Each
+    instance calibrates on the documents it sees, so calibration happens during execution, per actor.
+    """
+
+    def __init__(
+        self,
+        cascade: LlmFilterCascade,
+        entity_extractor: EntityExtractor,
+        field: str,
+        new_field: str,
+        threshold: int,
+    ):
+        self._cascade = cascade
+        self._entity_extractor = entity_extractor
+        self._field = field
+        self._new_field = new_field
+        self._threshold = threshold
+        self._reject_below = cascade.reject_below
+        self._calibrating = cascade.reject_below is None and cascade.calibration_size > 0
+        self._sample_scores: list[float] = []
+        self._sample_relevant: list[bool] = []
+
+    def _label(self, doc: Document, score: float) -> Document:
+        doc = self._entity_extractor.extract_entity(doc)
+        self._sample_scores.append(score)
+        self._sample_relevant.append(_passes(doc, self._new_field, self._threshold))
+        if len(self._sample_scores) >= self._cascade.calibration_size:
+            self._calibrating = False
+            self._reject_below = calibrate_reject_below(
+                self._sample_scores, self._sample_relevant, self._cascade.recall_target
+            )
+            logger.info(
+                f"LLM filter cascade calibrated on {len(self._sample_scores)} documents, "
+                f"{sum(self._sample_relevant)} relevant: rejecting scores below {self._reject_below}"
+            )
+        return doc
+
+    def __call__(self, docs: list[Document]) -> list[Any]:
+        cascade = self._cascade
+        scores = cascade.scorer.score(cascade.query, [_text(d, self._field) for d in docs]) if docs else []
+        out: list[Any] = []
+        rejected = accepted = 0
+        for doc, score in zip(docs, scores):
+            if self._calibrating:
+                out.append(self._label(doc, score))
+            elif self._reject_below is not None and score < self._reject_below:
+                rejected += 1
+            elif cascade.accept_above is not None and score >= cascade.accept_above:
+                doc.properties[self._new_field] = self._threshold
+                accepted += 1
+                out.append(doc)
+            else:
+                out.append(self._entity_extractor.extract_entity(doc))
+        stats = {"documents": len(docs), "rejected": rejected, "accepted": accepted}
+        stats["llm_calls"] = len(docs) - rejected - accepted
+        out.append(MetadataDocument(**{CASCADE_METADATA_KEY: stats}))
+        return out
+
+
+def cascade_stats(docs: Iterable[Document]) -> dict[str, int]:
+    """
+    Sums the routing statistics of the LLM filter cascades found among the MetadataDocuments of an
+    executed DocSet, e.g. ``cascade_stats(docset.take_all(include_metadata=True))``. ``llm_calls_avoided``
+    is the number of documents decided without the LLM.
+    """
+    totals = Counter({"documents": 0, "rejected": 0, "accepted": 0, "llm_calls": 0})
+    for doc in docs:
+        if isinstance(doc, MetadataDocument) and CASCADE_METADATA_KEY in doc.metadata:
+            totals.update(doc.metadata[CASCADE_METADATA_KEY])
+    result = dict(totals)
+    result["llm_calls_avoided"] = result["rejected"] + result["accepted"]
+    return result
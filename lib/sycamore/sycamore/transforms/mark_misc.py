@@ -103,11 +103,10 @@ class MarkBreakByTokens(SingleThreadUser, NonGPUUser, Map):
     @timetrace("markBreakToks")
     def mark_break_by_tokens(parent: Document, tokenizer: Tokenizer, limit: int) -> Document:
         toks = 0
+        texts = [elem.text_representation for elem in parent.elements if elem.text_representation]
+        counts = iter(tokenizer.count_tokens_batch(texts))
         for elem in parent.elements:
-            if elem.text_representation:
-                n = len(tokenizer.tokenize(elem.text_representation))
-            else:
-                n = 0
+            n = next(counts) if elem.text_representation else 0
             elem.data["_tokCnt"] = n
             if elem.data.get("_break") or ((toks + n) > limit):
                 elem.data["_break"] = True
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import numpy as np
 
 from sycamore.data import Document, Element, BoundingBox
 from sycamore.plan_nodes import SingleThreadUser, NonGPUUser, Node
 from sycamore.functions.tokenizer import Tokenizer
+from sycamore.transforms.embed import Embedder
 from sycamore.transforms.map import Map
 from sycamore.utils.time_trace import timetrace
 
@@ -26,6 +28,9 @@ class ElementMerger(ABC):
     def postprocess_element(self, element: Element) -> Element:
         pass
 
+    def preprocess_elements(self, elements: list[Element]) -> list[Element]:
+        return [self.preprocess_element(e) for e in elements]
+
     @timetrace("mergeElem")
     def merge_elements(self, document: Document) -> Document:
         """Use self._should_merge and self._merge to greedily merge consecutive elements.
@@ -39,7 +44,7 @@ class ElementMerger(ABC):
         """
         if len(document.elements) < 2:
             return document
-        to_merge = [self.preprocess_element(e) for e in document.elements]
+        to_merge = self.preprocess_elements(document.elements)
         new_elements = [to_merge[0]]
         for element in to_merge[1:]:
             if self.should_merge(new_elements[-1], element):
@@ -50,6 +55,98 @@ class ElementMerger(ABC):
         return document
 
 
+def _add_page_number(page_numbers: Any, page_number: Any) -> set:
+    # Page numbers are kept as a set while merging; _finalize_page_numbers turns it back into a list.
+    if isinstance(page_numbers, set):
+        page_numbers.add(page_number)
+        return page_numbers
+    return set(page_numbers or []) | {page_number}
+
+
+def _finalize_page_numbers(properties: dict[str, Any]) -> dict[str, Any]:
+    if isinstance(properties.get("page_numbers"), set):
+        properties["page_numbers"] = list(properties["page_numbers"])
+    return properties
+
+
+class _Section:
+    """
+    A run of elements being merged by GreedyTextElementMerger. Adding an element has the same result as
+    GreedyTextElementMerger.merge, but text and binary parts are only joined once, in to_element.
+    """
+
+    def __init__(self, element: Element):
+        self.first = element
+        self.size = 1
+        text = element.text_representation
+        binary = element.binary_representation
+        self.text_parts: Optional[list[str]] = None if text is None else [text]
+        self.binary_parts: Optional[list[bytes]] = None if binary is None else [binary]
+        self.binary_empty = not binary
+        self.token_count: int = element.data["token_count"]
+        self.bbox = None if element.bbox is None else element.bbox.coordinates
+        self.properties = element.properties
+
+    def add(self, element: Element) -> None:
+        self.size += 1
+        tokens = element.data["token_count"]
+        binary = element.binary_representation
+        if self.binary_parts is None or binary is None:
+            # merge keeps whichever side is truthy, so an empty accumulation followed by None becomes None.
+            if self.binary_parts is None:
+                self.binary_parts = None if binary is None else [binary]
+                self.binary_empty = not binary
+            elif self.binary_empty:
+                self.binary_parts = None
+        else:
+            self.binary_parts.append(binary)
+            self.binary_empty = self.binary_empty and not binary
+
+        text = element.text_representation
+        if self.text_parts is None or text is None:
+            if self.text_parts is None:
+                self.text_parts = None if text is None else [text]
+            elif self.text_parts == [""]:
+                self.text_parts = None
+            self.token_count = max(self.token_count, tokens)
+        else:
+            self.text_parts.append(text)
+            self.token_count = self.token_count + 1 + tokens
+
+        ebb = element.bbox
+        if ebb is not None:
+            if self.bbox is None:
+                self.bbox = ebb.coordinates
+            else:
+                x1, y1, x2, y2 = self.bbox
+                self.bbox = (min(x1, ebb.x1), min(y1, ebb.y1), max(x2, ebb.x2), max(y2, ebb.y2))
+
+        properties: dict[str, Any] = {}
+        for k, v in self.properties.items():
+            properties[k] = v
+            if k == "page_number":
+                properties["page_numbers"] = _add_page_number(properties.get("page_numbers"), v)
+        for k, v in element.properties.items():
+            if properties.get(k) is None:
+                properties[k] = v
+            if k == "page_number":
+                properties["page_numbers"] = _add_page_number(properties.get("page_numbers"), v)
+        self.properties = properties
+
+    def to_element(self) -> Element:
+        if self.size == 1:
+            return self.first
+        new_elt = Element()
+        new_elt.type = "Section"
+        new_elt.data["binary_representation"] = None if self.binary_parts is None else b"".join(self.binary_parts)
+        new_elt.data["text_representation"] = None if self.text_parts is None else "\n".join(self.text_parts)
+        new_elt.data["token_count"] = self.token_count
+        if self.bbox is not None:
+            new_elt.bbox = BoundingBox(*self.bbox)
+        new_elt.properties = _finalize_page_numbers(self.properties)
+        return new_elt
+
+
 class GreedyTextElementMerger(ElementMerger):
     def __init__(self, tokenizer: Tokenizer, max_tokens: int, merge_across_pages: bool = True):
         self.tokenizer = tokenizer
@@ -57,20 +154,54 @@ class GreedyTextElementMerger(ElementMerger):
         self.merge_across_pages = merge_across_pages
 
     def preprocess_element(self, element: Element) -> Element:
-        element.data["token_count"] = len(self.tokenizer.tokenize(element.text_representation or ""))
+        element.data["token_count"] = self.tokenizer.count_tokens(element.text_representation or "")
         return element
 
+    def preprocess_elements(self, elements: list[Element]) -> list[Element]:
+        counts = self.tokenizer.count_tokens_batch([e.text_representation or "" for e in elements])
+        for element, count in zip(elements, counts):
+            element.data["token_count"] = count
+        return elements
+
     def postprocess_element(self, element: Element) -> Element:
         del element.data["token_count"]
         return element
 
     def should_merge(self, element1: Element, element2: Element) -> bool:
-        if not self.merge_across_pages and element1.properties["page_number"] != element2.properties["page_number"]:
+        return self._should_merge(element1.data["token_count"], element1.properties, element2)
+
+    def _should_merge(self, token_count: int, properties: dict[str, Any], element2: Element) -> bool:
+        if not self.merge_across_pages and properties["page_number"] != element2.properties["page_number"]:
             return False
-        if element1.data["token_count"] + 1 + element2.data["token_count"] > self.max_tokens:
+        if token_count + 1 + element2.data["token_count"] > self.max_tokens:
             return False
         return True
 
+    @timetrace("mergeElem")
+    def merge_elements(self, document: Document) -> Document:
+        """Greedily merge consecutive elements as ElementMerger.merge_elements does with self.merge, but
+        accumulate each run of merged elements and build the merged element once, so that long runs of
+        small elements take linear rather than quadratic time.
+
+        Args:
+            document (Document): A document with elements to be merged.
+
+        Returns:
+            Document: The same document, with its elements merged
+        """
+        if len(document.elements) < 2:
+            return document
+        to_merge = self.preprocess_elements(document.elements)
+        sections = [_Section(to_merge[0])]
+        for element in to_merge[1:]:
+            section = sections[-1]
+            if self._should_merge(section.token_count, section.properties, element):
+                section.add(element)
+            else:
+                sections.append(_Section(element))
+        document.elements = [self.postprocess_element(s.to_element()) for s in sections]
+        return document
+
     def merge(self, elt1: Element, elt2: Element) -> Element:
         """Merge two elements; the new element's fields will be set as:
             - type: "Section"
@@ -94,28 +225,29 @@ class GreedyTextElementMerger(ElementMerger):
         new_elt.type = "Section"
         # Merge binary representations by concatenation
         if elt1.binary_representation is None or elt2.binary_representation is None:
-            new_elt.binary_representation = elt1.binary_representation or elt2.binary_representation
+            new_elt.data["binary_representation"] = elt1.binary_representation or elt2.binary_representation
         else:
             new_elt.binary_representation = elt1.binary_representation + elt2.binary_representation
         # Merge text representations by concatenation with a newline
         if elt1.text_representation is None or elt2.text_representation is None:
-            new_elt.text_representation = elt1.text_representation or elt2.text_representation
+            new_elt.data["text_representation"] = elt1.text_representation or elt2.text_representation
             new_elt.data["token_count"] = max(tok1, tok2)
         else:
             new_elt.text_representation = elt1.text_representation + "\n" + elt2.text_representation
             new_elt.data["token_count"] = tok1 + 1 + tok2
         # Merge bbox by taking the coords that make the largest box
-        if elt1.bbox is None and elt2.bbox is None:
-            pass
-        elif elt1.bbox is None or elt2.bbox is None:
-            new_elt.bbox = elt1.bbox or elt2.bbox
-        else:
+        bbox1, bbox2 = elt1.bbox, elt2.bbox
+        if bbox1 is not None and bbox2 is not None:
             new_elt.bbox = BoundingBox(
-                min(elt1.bbox.x1, elt2.bbox.x1),
-                min(elt1.bbox.y1, elt2.bbox.y1),
-                max(elt1.bbox.x2, elt2.bbox.x2),
-                max(elt1.bbox.y2, elt2.bbox.y2),
+                min(bbox1.x1, bbox2.x1),
+                min(bbox1.y1, bbox2.y1),
+                max(bbox1.x2, bbox2.x2),
+                max(bbox1.y2, bbox2.y2),
             )
+        elif bbox1 is not None:
+            new_elt.bbox = bbox1
+        elif bbox2 is not None:
+            new_elt.bbox = bbox2
         # Merge properties by taking the union of the keys
         properties = new_elt.properties
         for k, v in elt1.properties.items():
@@ -156,33 +288,35 @@ class MarkedMerger(ElementMerger):
 
         # merge elements, honoring marked breaks and drops
         merged = []
-        bin = b""
-        text = ""
+        bin: list[bytes] = []
+        text: list[str] = []
         props: Dict[str, Any] = {}
         bbox = None
 
+        def finish() -> Element:
+            ee = Element()
+            ee.binary_representation = b"".join(bin)
+            ee.text_representation = "".join(text)
+            ee.properties = _finalize_page_numbers(props)
+            ee.data["bbox"] = bbox
+            return ee
+
         for elem in document.elements:
             if elem.data.get("_drop"):
                 continue
             if elem.data.get("_break"):
-                ee = Element()
-                ee.binary_representation = bin
-                ee.text_representation = text
-                ee.properties = props
-                ee.data["bbox"] = bbox
-                merged.append(ee)
-                bin = b""
-                text = ""
+                merged.append(finish())
+                bin = []
+                text = []
                 props = {}
                 bbox = None
             if elem.binary_representation:
-                bin += elem.binary_representation + b"\n"
+                bin.append(elem.binary_representation + b"\n")
             if elem.text_representation:
-                text += elem.text_representation + "\n"
+                text.append(elem.text_representation + "\n")
             for k, v in elem.properties.items():
                 if k == "page_number":
-                    props["page_numbers"] = props.get("page_numbers", list())
-                    props["page_numbers"] = list(set(props["page_numbers"] + [v]))
+                    props["page_numbers"] = _add_page_number(props.get("page_numbers"), v)
                 if k not in props:  # ??? order may matter here
                     props[k] = v
             ebb = elem.data.get("bbox")
@@ -193,13 +327,133 @@ class MarkedMerger(ElementMerger):
                     bbox = (min(bbox[0], ebb[0]), min(bbox[1], ebb[1]), max(bbox[2], ebb[2]), max(bbox[3], ebb[3]))
 
         if text:
-            ee = Element()
-            ee.binary_representation = bin
-            ee.text_representation = text
-            ee.properties = props
-            ee.data["bbox"] = bbox
-            merged.append(ee)
+            merged.append(finish())
+
+        document.elements = merged
+        return document
+
 
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class SemanticElementMerger(GreedyTextElementMerger):
+    """
+    Merges consecutive elements into chunks about a single topic. Every element is embedded, and a chunk
+    ends where the cosine similarity between neighbouring elements drops, as long as the chunk has at
+    least min_tokens tokens; a chunk never grows beyond max_tokens. Elements are merged as by
+    GreedyTextElementMerger.
+
+    The element embeddings are reused as chunk embeddings: a chunk of one element keeps that element's
+    embedding, and a larger chunk gets the normalized mean of its elements' embeddings, so documents
+    exploded from the chunks need no separate embed(). Elements without text are never embedded and
+    stay with the chunk before them.
+
+    Args:
+        embedder: The Embedder used for the elements. Use the model the chunks would be embedded with.
+        tokenizer: The tokenizer used to count tokens.
+        max_tokens: The largest number of tokens in a chunk, unless a single element is larger.
+        min_tokens: Chunks smaller than this are not ended at a similarity drop.
+        threshold: Similarity below which a chunk ends. If None, the threshold is the given percentile
+            of the similarities between neighbouring elements in each document.
+        percentile: The percentile used when threshold is None.
+        merge_across_pages: Whether chunks may span pages.
+
+    Example:
+         .. code-block:: python
+
+            embedder = SentenceTransformerEmbedder(model_name="sentence-transformers/all-MiniLM-L6-v2")
+            tokenizer = HuggingFaceTokenizer("sentence-transformers/all-MiniLM-L6-v2")
+            merger = SemanticElementMerger(embedder, tokenizer, max_tokens=512, min_tokens=64)
+
+            context = sycamore.init()
+            pdf_docset = context.read.binary(paths, binary_format="pdf")
+                .partition(partitioner=ArynPartitioner())
+                .merge(merger=merger)
+                .explode()
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        tokenizer: Tokenizer,
+        max_tokens: int = 512,
+        min_tokens: int = 0,
+        threshold: Optional[float] = None,
+        percentile: float = 25.0,
+        merge_across_pages: bool = True,
+    ):
+        super().__init__(tokenizer, max_tokens, merge_across_pages)
+        self.embedder = embedder
+        self.min_tokens = min_tokens
+        self.threshold = threshold
+        self.percentile = percentile
+
+    def _embed(self, elements: list[Element]) -> list[Optional[list[float]]]:
+        """Returns the embedding of each element with text, and None for the others."""
+        embedded = [i for i, e in enumerate(elements) if e.text_representation]
+        docs = [Document(text_representation=elements[i].text_representation) for i in embedded]
+        if docs:
+            docs = self.embedder.generate_embeddings(docs)
+        embeddings: list[Optional[list[float]]] = [None] * len(elements)
+        for i, doc in zip(embedded, docs):
+            embeddings[i] = doc.embedding
+        return embeddings
+
+    @timetrace("mergeSemantic")
+    def merge_elements(self, document: Document) -> Document:
+        """Merge the elements of the document into chunks, placing chunk boundaries at similarity drops.
+
+        Args:
+            document (Document): A document with elements to be merged.
+
+        Returns:
+            Document: The same document, with its elements merged and embedded
+        """
+        if len(document.elements) < 1:
+            return document
+        elements = self.preprocess_elements(document.elements)
+        embeddings = self._embed(elements)
+        vectors = [None if e is None else _normalize(np.asarray(e, dtype=float)) for e in embeddings]
+
+        # Similarity of each embedded element to the closest embedded element before it.
+        similarities: list[Optional[float]] = [None] * len(elements)
+        previous: Optional[np.ndarray] = None
+        for i, vector in enumerate(vectors):
+            if vector is not None:
+                if previous is not None:
+                    similarities[i] = float(vector @ previous)
+                previous = vector
+        threshold = self.threshold
+        if threshold is None:
+            observed = [s for s in similarities if s is not None]
+            threshold = float(np.percentile(observed, self.percentile)) if observed else None
+
+        sections = [_Section(elements[0])]
+        members = [[0]]
+        for i in range(1, len(elements)):
+            element, similarity = elements[i], similarities[i]
+            section = sections[-1]
+            drop = threshold is not None and similarity is not None and similarity < threshold
+            if self._should_merge(section.token_count, section.properties, element) and not (
+                drop and section.token_count >= self.min_tokens
+            ):
+                section.add(element)
+                members[-1].append(i)
+            else:
+                sections.append(_Section(element))
+                members.append([i])
+
+        merged = []
+        for section, indices in zip(sections, members):
+            element = self.postprocess_element(section.to_element())
+            chunk: list[np.ndarray] = [v for v in (vectors[i] for i in indices) if v is not None]
+            if len(indices) == 1 and chunk:
+                element.data["embedding"] = embeddings[indices[0]]
+            elif chunk:
+                element.data["embedding"] = _normalize(np.mean(chunk, axis=0)).tolist()
+            merged.append(element)
         document.elements = merged
         return document
 
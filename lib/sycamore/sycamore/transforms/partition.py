@@ -56,6 +56,13 @@ def _elements_reorder_comparator(element1: Element, element2: Element) -> int:
         return _pageless_reorder_comparator(element1, element2)
 
 
+def _elements_reorder_key(element: Element) -> tuple:
+    """Sort key ordering elements as _elements_reorder_comparator does: by page, then left column first.
+    Elements without a bbox sort with the left column."""
+    bbox = element.data.get("bbox")
+    return (element.properties["page_number"], bbox is not None and bbox[0] > 0.5)
+
+
 class Partitioner(ABC):
     def __init__(self, device=None, batch_size=1):
         self.device = device
@@ -154,7 +161,8 @@ class UnstructuredPPTXPartitioner(Partitioner):
 class UnstructuredPdfPartitioner(Partitioner):
     """
     UnstructuredPdfPartitioner utilizes open-source Unstructured library to extract structured elements from
-    unstructured PDFs.
+    unstructured PDFs. The elements are ordered by page and then left column first; elements without a
+    bounding box are ordered with the left column.
 
     Args:
         include_page_breaks: Whether to include page breaks as separate elements.
@@ -259,7 +267,7 @@ class UnstructuredPdfPartitioner(Partitioner):
         document.elements = [self.to_element(ee.to_dict(), self._retain_coordinates) for ee in elements]
         del elements
 
-        document = reorder_elements(document, _elements_reorder_comparator)
+        document = reorder_elements(document, key=_elements_reorder_key)
         return document
 
 
@@ -383,7 +391,8 @@ class HtmlPartitioner(Partitioner):
 class ArynPartitioner(Partitioner):
     """
     The ArynPartitioner uses an object recognition model to partition the document into
-    structured elements.
+    structured elements. The elements are ordered by page, left column first, and then top to
+    bottom and left to right; elements without a bounding box come first in the left column.
 
     Args:
         model_name_or_path: The HuggingFace coordinates or model local path. Should be set to
@@ -510,6 +519,15 @@ class ArynPartitioner(Partitioner):
         else:
             return 0
 
+    @staticmethod
+    def _elements_reorder_key(element: Element) -> tuple:
+        """Sort key ordering elements as _elements_reorder does: by page, left column first, then y and x.
+        Elements without a bbox sort at the top of the left column."""
+        bbox = element.data.get("bbox")
+        if bbox is None:
+            return (element.properties["page_number"], False, 0.0, 0.0)
+        return (element.properties["page_number"], bbox[0] > 0.5, bbox[1], bbox[0])
+
     @timetrace("SycamorePdf")
     def partition(self, document: Document) -> Document:
         binary = io.BytesIO(document.data["binary_representation"])
@@ -540,7 +558,7 @@ class ArynPartitioner(Partitioner):
             raise RuntimeError(f"SycamorePartitioner Error processing {path}") from e
 
         document.elements = elements
-        document = reorder_elements(document, self._elements_reorder)
+        document = reorder_elements(document, key=self._elements_reorder_key)
         return document
 
 
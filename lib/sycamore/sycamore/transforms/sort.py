@@ -1,11 +1,26 @@
+import heapq
 from typing import Any, Optional
 
+import numpy as np
+
 from sycamore.plan_nodes import Node, Transform
 from sycamore.data import Document
 
 from ray.data import Dataset
 
 
+def _sort_key(doc: Document, field: str, default_val: Optional[Any]) -> Any:
+    val = doc.field_to_value(field)
+
+    if val is None:
+        if default_val is None:
+            exception_string = f'Field "{field}" not present in Document and default value not provided.'
+            raise Exception(exception_string)
+        else:
+            val = default_val
+    return val
+
+
 class Sort(Transform):
     """
     Sort by field in Document
@@ -34,14 +49,7 @@ class Sort(Transform):
         def ray_callable(input_dict: dict[str, Any]) -> dict[str, Any]:
             doc = Document.from_row(input_dict)
 
-            val = doc.field_to_value(self._field)
-
-            if val is None:
-                if self._default_val is None:
-                    exception_string = f'Field "{self._field}" not present in Document and default value not provided.'
-                    raise Exception(exception_string)
-                else:
-                    val = self._default_val
+            val = _sort_key(doc, self._field, self._default_val)
 
             # updates row to include new col
             new_doc = doc.to_row()
@@ -50,3 +58,47 @@ class Sort(Transform):
             return new_doc
 
         return ray_callable
+
+
+class TopK(Transform):
+    """
+    Returns the k Documents with the largest (or smallest) value of a field, in sorted order. This is
+    equivalent to a Sort followed by a Limit, but each block only keeps a bounded heap of its best k
+    Documents and the heaps are then merged, so there is no global shuffle. Sort followed by Limit is
+    rewritten into TopK automatically.
+
+    Args:
+        child: The plan node providing the dataset.
+        descending: Whether to keep the largest values (True) or the smallest (False).
+        field: Document field in dotted notation, e.g. properties.count.
+        k: The number of Documents to keep.
+        default_val: Default value to use if field does not exist in Document.
+    """
+
+    def __init__(self, child: Node, descending: bool, field: str, k: int, default_val: Optional[Any] = None):
+        super().__init__(child)
+        self._descending = descending
+        self._field = field
+        self._k = k
+        self._default_val = default_val
+
+    def _top_k(self, docs: list[Document]) -> list[Document]:
+        def key(doc):
+            return _sort_key(doc, self._field, self._default_val)
+
+        if self._descending:
+            return heapq.nlargest(self._k, docs, key=key)
+        return heapq.nsmallest(self._k, docs, key=key)
+
+    def _top_k_batch(self, batch: dict[str, np.ndarray]) -> dict[str, list]:
+        docs = [Document.deserialize(raw) for raw in batch["doc"]]
+        return {"doc": [d.serialize() for d in self._top_k(docs)]}
+
+    def execute(self, **kwargs) -> "Dataset":
+        ds = self.child().execute(**kwargs)
+        # One heap per block, then a single task merges the (at most k per block) survivors.
+        ds = ds.map_batches(self._top_k_batch, batch_size=None, batch_format="numpy")
+        return ds.repartition(1, shuffle=False).map_batches(self._top_k_batch, batch_size=None, batch_format="numpy")
+
+    def local_execute(self, docs: list[Document]) -> list[Document]:
+        return self._top_k(docs)
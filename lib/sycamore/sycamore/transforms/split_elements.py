@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from typing import Optional
 
 
@@ -7,6 +8,78 @@ from sycamore.plan_nodes import Node, SingleThreadUser, NonGPUUser
 from sycamore.transforms.map import Map
 from sycamore.utils.time_trace import timetrace
 
+# FIXME: make this work with asian languages
+_PREDICATES = [  # in precedence order
+    lambda c: c in ".!?",
+    lambda c: c == ";",
+    lambda c: c in "()",
+    lambda c: c == ":",
+    lambda c: c == ",",
+    str.isspace,
+]
+
+
+def _boundary_class(c: str) -> Optional[int]:
+    for ii, predicate in enumerate(_PREDICATES):
+        if predicate(c):
+            return ii
+    return None
+
+
+class _OffsetSplitter:
+    """
+    Finds the same split points as SplitElements.split_one, but tokenizes the text only once. Token
+    counts of pieces come from the token offsets, and the candidate split characters of each class
+    are indexed up front so the split nearest the middle of a piece is found by binary search
+    rather than by scanning outwards character by character.
+    """
+
+    def __init__(self, txt: str, offsets: list[tuple[int, int]]):
+        self._starts = [start for start, _ in offsets]
+        self._ends = [end for _, end in offsets]
+        self._boundaries: list[list[int]] = [[] for _ in _PREDICATES]
+        for pos, c in enumerate(txt):
+            cls = _boundary_class(c)
+            if cls is not None:
+                self._boundaries[cls].append(pos)
+
+    def count(self, start: int, end: int) -> int:
+        """Number of tokens overlapping txt[start:end]."""
+        return bisect_left(self._starts, end) - bisect_right(self._ends, start)
+
+    def split_point(self, start: int, end: int) -> int:
+        half = (end - start) // 2
+        mid = start + half
+        width = half // 2  # stay near middle; avoid the ends
+        for positions in self._boundaries:
+            if width == 0:
+                break
+            best: Optional[int] = None
+            # Nearest candidate at or left of the middle, then right of it; left wins ties.
+            i = bisect_right(positions, mid) - 1
+            if i >= 0 and mid - positions[i] < width:
+                best = positions[i]
+            j = bisect_right(positions, mid)
+            if j < len(positions) and positions[j] - (mid + 1) < width:
+                if best is None or positions[j] - (mid + 1) < mid - best:
+                    best = positions[j]
+            if best is not None:
+                return best + 1 if best + 1 < end else mid
+        return mid + 1 if mid + 1 < end else mid
+
+    def pieces(self, start: int, end: int, max: int) -> list[tuple[int, int]]:
+        result = []
+        stack = [(start, end)]
+        while stack:
+            a, b = stack.pop()
+            if b - a < 2 or self.count(a, b) <= max:
+                result.append((a, b))
+                continue
+            idx = self.split_point(a, b)
+            stack.append((idx, b))
+            stack.append((a, idx))
+        return result
+
 
 class SplitElements(SingleThreadUser, NonGPUUser, Map):
     """
@@ -43,7 +116,33 @@ class SplitElements(SingleThreadUser, NonGPUUser, Map):
         txt = elem.text_representation
         if not txt:
             return [elem]
-        num = len(tokenizer.tokenize(txt))
+        offsets = tokenizer.token_offsets(txt)
+        if offsets is None:
+            return SplitElements._split_one_retokenizing(elem, tokenizer, max)
+        if len(offsets) <= max:
+            return [elem]
+
+        splitter = _OffsetSplitter(txt, offsets)
+        result = []
+        for a, b in splitter.pieces(0, len(txt), max):
+            piece = txt[a:b]
+            ment = elem.copy()
+            ment.text_representation = piece
+            ment.binary_representation = bytes(piece, "utf-8")
+            # Counts from offsets can differ from re-tokenizing a piece on its own when a token spans a
+            # split point; check the pieces that are close to the limit and fall back for those.
+            if max - splitter.count(a, b) < 2 and tokenizer.count_tokens(piece) > max:
+                result.extend(SplitElements._split_one_retokenizing(ment, tokenizer, max))
+            else:
+                result.append(ment)
+        return result
+
+    @staticmethod
+    def _split_one_retokenizing(elem: Element, tokenizer: Tokenizer, max: int) -> list[Element]:
+        txt = elem.text_representation
+        if not txt:
+            return [elem]
+        num = tokenizer.count_tokens(txt)
         if num <= max:
             return [elem]
 
@@ -51,15 +150,7 @@ class SplitElements(SingleThreadUser, NonGPUUser, Map):
         left = half
         right = half + 1
 
-        # FIXME: make this work with asian languages
-        predicates = [  # in precedence order
-            lambda c: c in ".!?",
-            lambda c: c == ";",
-            lambda c: c in "()",
-            lambda c: c == ":",
-            lambda c: c == ",",
-            str.isspace,
-        ]
+        predicates = _PREDICATES
         results: list[Optional[int]] = [None] * len(predicates)
 
         for jj in range(half // 2):  # stay near middle; avoid the ends
@@ -89,6 +180,10 @@ class SplitElements(SingleThreadUser, NonGPUUser, Map):
             if res is not None:
                 idx = res + 1
                 break
+        if idx >= len(txt):  # a split at the very end would recurse forever
+            idx = half
+        if idx == 0:
+            return [elem]
 
         one = txt[:idx]
         two = txt[idx:]
@@ -98,7 +193,7 @@ class SplitElements(SingleThreadUser, NonGPUUser, Map):
         elem.binary_representation = bytes(one, "utf-8")
         ment.text_representation = two
         ment.binary_representation = bytes(two, "utf-8")
-        aa = SplitElements.split_one(elem, tokenizer, max)
-        bb = SplitElements.split_one(ment, tokenizer, max)
+        aa = SplitElements._split_one_retokenizing(elem, tokenizer, max)
+        bb = SplitElements._split_one_retokenizing(ment, tokenizer, max)
         aa.extend(bb)
         return aa
@@ -31,6 +31,35 @@ class TableStructureExtractor:
         """
         pass
 
+    def extract_batch(self, elements: list[TableElement], doc_images: list[Image.Image]) -> list[TableElement]:
+        """Extracts the table structure of several elements at once.
+
+        The default implementation calls extract on each element in turn. Implementations backed by a
+        model can override it to run the model on all the tables together.
+
+        Args:
+          elements: A list of TableElements.
+          doc_images: The image of the page containing each element; doc_images[i] is the page of elements[i].
+        """
+        return [self.extract(element, doc_image) for element, doc_image in zip(elements, doc_images)]
+
+    def extract_from_pages(self, pages: list[list[Element]], page_images: list[Image.Image]) -> None:
+        """Extracts the table structure of every TableElement on a list of pages, with one call to extract_batch.
+
+        Args:
+          pages: The elements of each page, as produced by a partitioner. Tables are updated in place.
+          page_images: The image of each page.
+        """
+        tables: list[TableElement] = []
+        table_images: list[Image.Image] = []
+        for page_elements, page_image in zip(pages, page_images):
+            for element in page_elements:
+                if isinstance(element, TableElement):
+                    tables.append(element)
+                    table_images.append(page_image)
+        if len(tables) > 0:
+            self.extract_batch(tables, table_images)
+
     def extract_from_doc(self, doc: Document) -> Document:
         """Method that extracts the table structure for each table in the Document.
 
@@ -47,6 +76,9 @@ class TableStructureExtractor:
 
         images = pdf2image.convert_from_bytes(doc.binary_representation)
         new_elements: list[Element] = []
+        table_positions: list[int] = []
+        tables: list[TableElement] = []
+        table_images: list[Image.Image] = []
 
         for elem in doc.elements:
             if isinstance(elem, TableElement):
@@ -57,9 +89,13 @@ class TableStructureExtractor:
                 else:
                     new_elements.append(elem)
                     continue
-                new_elements.append(self.extract(elem, images[page_num]))
-            else:
-                new_elements.append(elem)
+                table_positions.append(len(new_elements))
+                tables.append(elem)
+                table_images.append(images[page_num])
+            new_elements.append(elem)
+
+        for position, table in zip(table_positions, self.extract_batch(tables, table_images)):
+            new_elements[position] = table
         doc.elements = new_elements
         return doc
 
@@ -71,17 +107,20 @@ class TableTransformerStructureExtractor(TableStructureExtractor):
     """
 
     DEFAULT_TTAR_MODEL = "microsoft/table-structure-recognition-v1.1-all"
+    DEFAULT_BATCH_SIZE = 8
 
-    def __init__(self, model: str = DEFAULT_TTAR_MODEL, device=None):
+    def __init__(self, model: str = DEFAULT_TTAR_MODEL, device=None, batch_size: int = DEFAULT_BATCH_SIZE):
         """
         Creates a TableTransformerStructureExtractor
 
         Args:
           model: The HuggingFace URL for the TableTransformer model to use.
+          batch_size: The maximum number of tables that extract_batch passes through the model at once.
         """
 
         self.model = model
         self.device = device
+        self.batch_size = batch_size
         self.structure_model = None
 
     def _get_device(self) -> str:
@@ -99,7 +138,6 @@ class TableTransformerStructureExtractor(TableStructureExtractor):
             t["block_num"] = 0
         return tokens
 
-    @timetrace("tblExtr")
     def extract(self, element: TableElement, doc_image: Image.Image) -> TableElement:
         """Extracts the table structure from the specified element using a TableTransformer model.
 
@@ -111,14 +149,24 @@ class TableTransformerStructureExtractor(TableStructureExtractor):
           doc_image: A PIL object containing an image of the Document page containing the element.
                Used for bounding box calculations.
         """
+        return self.extract_batch([element], [doc_image])[0]
 
-        # We need a bounding box to be able to do anything.
-        if element.bbox is None:
-            return element
+    @timetrace("tblExtr")
+    def extract_batch(self, elements: list[TableElement], doc_images: list[Image.Image]) -> list[TableElement]:
+        """Extracts the table structure of several elements, running the model on up to batch_size tables at once.
 
-        from torchvision import transforms
+        Crops of similar shape are batched together. Each batch is padded to its largest crop, and the padding
+        is masked out of the model's input, so the tables can come from any pages or documents.
 
-        width, height = doc_image.size
+        Args:
+          elements: A list of TableElements. Elements without a bounding box are returned unchanged.
+          doc_images: The image of the page containing each element; doc_images[i] is the page of elements[i].
+        """
+
+        # We need a bounding box to be able to do anything.
+        pending = [i for i, element in enumerate(elements) if element.bbox is not None]
+        if len(pending) == 0:
+            return elements
 
         if self.structure_model is None:
             from transformers import TableTransformerForObjectDetection
@@ -126,15 +174,60 @@ class TableTransformerStructureExtractor(TableStructureExtractor):
             self.structure_model = TableTransformerForObjectDetection.from_pretrained(self.model).to(self._get_device())
         assert self.structure_model is not None  # For typechecking
 
+        structure_id2label = self.structure_model.config.id2label
+        structure_id2label[len(structure_id2label)] = "no object"
+
+        # Crops are resized to the same longest side, so batching crops of similar aspect ratio together
+        # keeps the padding small. Crops are only prepared a batch at a time, to bound memory use.
+        def aspect_ratio(i: int) -> float:
+            x1, y1, x2, y2 = self._crop_box(elements[i], doc_images[i])
+            return (y2 - y1) / (x2 - x1)
+
+        pending.sort(key=aspect_ratio)
+        for start in range(0, len(pending), self.batch_size):
+            batch = [
+                (i, *self._prepare_crop(elements[i], doc_images[i])) for i in pending[start : start + self.batch_size]
+            ]
+            outputs = self._infer([crop[3] for crop in batch])
+            for batch_index, (i, crop_box, cropped_image, _, tokens) in enumerate(batch):
+                # Convert the raw objects to our internal table representation. This involves multiple
+                # phases of postprocessing.
+                objects = table_transformers.outputs_to_objects(
+                    outputs, cropped_image.size, structure_id2label, batch_index=batch_index
+                )
+                table = table_transformers.objects_to_table(objects, tokens)
+
+                if table is not None:
+                    # Convert cell bounding boxes to be relative to the original image.
+                    width, height = doc_images[i].size
+                    for cell in table.cells:
+                        if cell.bbox is None:
+                            continue
+
+                        cell.bbox.translate_self(crop_box[0], crop_box[1]).to_relative_self(width, height)
+
+                elements[i].table = table
+        return elements
+
+    @staticmethod
+    def _crop_box(element: TableElement, doc_image: Image.Image) -> tuple[float, float, float, float]:
+        assert element.bbox is not None  # For typechecking
+        width, height = doc_image.size
+
         # Crop the image to encompass just the table + some padding.
         padding = 10
-        crop_box = (
+        return (
             element.bbox.x1 * width - padding,
             element.bbox.y1 * height - padding,
             element.bbox.x2 * width + padding,
             element.bbox.y2 * height + padding,
         )
 
+    def _prepare_crop(self, element: TableElement, doc_image: Image.Image):
+        from torchvision import transforms
+
+        width, height = doc_image.size
+        crop_box = self._crop_box(element, doc_image)
         cropped_image = doc_image.crop(crop_box).convert("RGB")
 
         # Shift the token bounding boxes to be relative to the cropped image.
@@ -147,35 +240,23 @@ class TableTransformerStructureExtractor(TableStructureExtractor):
         structure_transform = transforms.Compose(
             [MaxResize(1000), transforms.ToTensor(), transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])]
         )
+        pixel_values = structure_transform(cropped_image)
+        return crop_box, cropped_image, pixel_values, tokens
 
-        # Run inference using the model and convert the output to raw "objects" containing bounding boxes and types.
-        pixel_values = structure_transform(cropped_image).unsqueeze(0).to(self._get_device())
-
+    def _infer(self, pixel_values: list[torch.Tensor]):
+        """Runs the model on a batch of images, zero padding them to a common size and masking out the padding."""
+        assert self.structure_model is not None  # For typechecking
+        height = max(p.shape[1] for p in pixel_values)
+        width = max(p.shape[2] for p in pixel_values)
+        batch = torch.zeros((len(pixel_values), 3, height, width))
+        pixel_mask = torch.zeros((len(pixel_values), height, width), dtype=torch.long)
+        for i, p in enumerate(pixel_values):
+            batch[i, :, : p.shape[1], : p.shape[2]] = p
+            pixel_mask[i, : p.shape[1], : p.shape[2]] = 1
+
+        device = self._get_device()
         with torch.no_grad():
-            outputs = self.structure_model(pixel_values)
-
-        structure_id2label = self.structure_model.config.id2label
-        structure_id2label[len(structure_id2label)] = "no object"
-
-        objects = table_transformers.outputs_to_objects(outputs, cropped_image.size, structure_id2label)
-
-        # Convert the raw objects to our internal table representation. This involves multiple
-        # phases of postprocessing.
-        table = table_transformers.objects_to_table(objects, tokens)
-
-        if table is None:
-            element.table = None
-            return element
-
-        # Convert cell bounding boxes to be relative to the original image.
-        for cell in table.cells:
-            if cell.bbox is None:
-                continue
-
-            cell.bbox.translate_self(crop_box[0], crop_box[1]).to_relative_self(width, height)
-
-        element.table = table
-        return element
+            return self.structure_model(batch.to(device), pixel_mask=pixel_mask.to(device))
 
 
 DEFAULT_TABLE_STRUCTURE_EXTRACTOR = TableTransformerStructureExtractor
@@ -15,7 +15,10 @@ import pandas as pd
 import torch
 
 from sycamore.data.table import Table, TableCell
-from sycamore.data import BoundingBox
+from sycamore.data import BoundingBox, BoundingBoxArray
+
+# Packages times containers above which slot_into_containers compares the packages in blocks.
+_SLOT_BLOCK_SIZE = 1 << 20
 
 
 # From https://github.com/NielsRogge/Transformers-Tutorials/blob/master/Table%20Transformer/Inference_with_Table_Transformer_(TATR)_for_parsing_tables.ipynb
@@ -59,6 +62,20 @@ def iob(coords1, coords2) -> float:
     return BoundingBox(*coords1).iob(BoundingBox(*coords2))
 
 
+def _boxes(objects) -> BoundingBoxArray:
+    return BoundingBoxArray([obj["bbox"] for obj in objects])
+
+
+def _divide(numerator, denominator):
+    """
+    Elementwise numerator / denominator that raises ZeroDivisionError when any denominator is 0, as the
+    per-pair float division it replaces would.
+    """
+    if np.size(numerator) > 0 and np.any(denominator == 0):
+        raise ZeroDivisionError("float division by zero")
+    return numerator / denominator
+
+
 # for output bounding box post-processing
 def box_cxcywh_to_xyxy(x):
     x_c, y_c, w, h = x.unbind(-1)
@@ -73,11 +90,11 @@ def rescale_bboxes(out_bbox, size):
     return b
 
 
-def outputs_to_objects(outputs, img_size, id2label):
+def outputs_to_objects(outputs, img_size, id2label, batch_index=0):
     m = outputs.logits.softmax(-1).max(-1)
-    pred_labels = list(m.indices.detach().cpu().numpy())[0]
-    pred_scores = list(m.values.detach().cpu().numpy())[0]
-    pred_bboxes = outputs["pred_boxes"].detach().cpu()[0]
+    pred_labels = list(m.indices.detach().cpu().numpy())[batch_index]
+    pred_scores = list(m.values.detach().cpu().numpy())[batch_index]
+    pred_bboxes = outputs["pred_boxes"].detach().cpu()[batch_index]
     pred_bboxes = [elem.tolist() for elem in rescale_bboxes(pred_bboxes, img_size)]
 
     objects = []
@@ -162,8 +179,6 @@ def nms_by_containment(container_objects, package_objects, overlap_threshold=0.5
     Non-maxima suppression (NMS) of objects based on shared containment of other objects.
     """
     container_objects = sort_objects_by_score(container_objects)
-    num_objects = len(container_objects)
-    suppression = [False for obj in container_objects]
 
     packages_by_container, _, _ = slot_into_containers(
         container_objects,
@@ -173,17 +188,11 @@ def nms_by_containment(container_objects, package_objects, overlap_threshold=0.5
         forced_assignment=False,
     )
 
-    for object2_num in range(1, num_objects):
-        object2_packages = set(packages_by_container[object2_num])
-        if len(object2_packages) == 0:
-            suppression[object2_num] = True
-        for object1_num in range(object2_num):
-            if not suppression[object1_num]:
-                object1_packages = set(packages_by_container[object1_num])
-                if len(object2_packages.intersection(object1_packages)) > 0:
-                    suppression[object2_num] = True
-
-    final_objects = [obj for idx, obj in enumerate(container_objects) if not suppression[idx]]
+    # With a unique assignment no two containers share a package, so the only containers suppressed
+    # are those, other than the highest scoring one, that hold no packages.
+    final_objects = [
+        obj for idx, obj in enumerate(container_objects) if idx == 0 or len(packages_by_container[idx]) > 0
+    ]
     return final_objects
 
 
@@ -202,33 +211,30 @@ def slot_into_containers(
     if len(container_objects) == 0 or len(package_objects) == 0:
         return container_assignments, package_assignments, best_match_scores
 
-    match_scores = defaultdict(dict)
-    for package_num, package in enumerate(package_objects):
-        match_scores = []
-        package_rect = BoundingBox(*package["bbox"])
-        package_area = package_rect.area
-        for container_num, container in enumerate(container_objects):
-            container_rect = BoundingBox(*container["bbox"])
-            intersect_area = container_rect.intersect(package_rect).area
-            overlap_fraction = intersect_area / package_area
-            match_scores.append({"container": container, "container_num": container_num, "score": overlap_fraction})
-
-        sorted_match_scores = sort_objects_by_score(match_scores)
-
-        best_match_score = sorted_match_scores[0]
-
-        best_match_scores.append(best_match_score["score"])
-        if forced_assignment or best_match_score["score"] >= overlap_threshold:
-            container_assignments[best_match_score["container_num"]].append(package_num)
-            package_assignments[package_num].append(best_match_score["container_num"])
-
-        if not unique_assignment:  # slot package into all eligible slots
-            for match_score in sorted_match_scores[1:]:
-                if match_score["score"] >= overlap_threshold:
-                    container_assignments[match_score["container_num"]].append(package_num)
-                    package_assignments[package_num].append(match_score["container_num"])
-                else:
-                    break
+    containers = _boxes(container_objects)
+    packages = _boxes(package_objects)
+    block_size = max(1, _SLOT_BLOCK_SIZE // len(containers))
+    for start in range(0, len(packages), block_size):
+        block = BoundingBoxArray(packages.coords[start : start + block_size])
+        # [i, j] is the fraction of package start + i inside container j.
+        match_scores = _divide(block.intersection_area(containers), block.area[:, None])
+        # The best match is the highest score, ties going to the first container.
+        best_containers = match_scores.argmax(axis=1)
+        best_scores = match_scores[np.arange(len(block)), best_containers]
+
+        for i, (container_num, score) in enumerate(zip(best_containers.tolist(), best_scores.tolist())):
+            package_num = start + i
+            best_match_scores.append(score)
+            if forced_assignment or score >= overlap_threshold:
+                container_assignments[container_num].append(package_num)
+                package_assignments[package_num].append(container_num)
+
+            if not unique_assignment:  # slot package into all eligible slots
+                eligible = np.nonzero(match_scores[i] >= overlap_threshold)[0]
+                eligible = eligible[np.argsort(-match_scores[i][eligible], kind="stable")]
+                for other_num in eligible[1:].tolist():
+                    container_assignments[other_num].append(package_num)
+                    package_assignments[package_num].append(other_num)
 
     return container_assignments, package_assignments, best_match_scores
 
@@ -249,10 +255,17 @@ def remove_objects_without_content(page_spans, objects):
     Remove any objects (these can be rows, columns, supercells, etc.) that don't
     have any text associated with them.
     """
-    for obj in objects[:]:
-        object_text, _ = extract_text_inside_bbox(page_spans, obj["bbox"])
-        if len(object_text.strip()) == 0:
-            objects.remove(obj)
+    if len(objects) == 0:
+        return
+    # [i, j] is whether span i falls within object j, as in get_bbox_span_subset.
+    inside = _overlap_matrix(_boxes(page_spans), _boxes(objects), 0.5)
+    with_content = []
+    for obj, span_nums in zip(objects, inside.T):
+        object_spans = [page_spans[num] for num in np.nonzero(span_nums)[0].tolist()]
+        object_text = extract_text_from_spans(object_spans, remove_integer_superscripts=True)
+        if len(object_text.strip()) > 0:
+            with_content.append(obj)
+    objects[:] = with_content
 
 
 def extract_text_inside_bbox(spans, bbox):
@@ -289,6 +302,14 @@ def overlaps(bbox1, bbox2, threshold=0.5):
     return rect1.intersect(BoundingBox(*bbox2)).area / area1 >= threshold
 
 
+def _overlap_matrix(boxes1: BoundingBoxArray, boxes2: BoundingBoxArray, threshold=0.5) -> np.ndarray:
+    """The matrix of overlaps(boxes1[i], boxes2[j], threshold) for every pair of boxes."""
+    area = boxes1.area[:, None]
+    intersect_area = boxes1.intersection_area(boxes2)
+    overlap_fraction = np.divide(intersect_area, area, out=np.zeros_like(intersect_area), where=area != 0)
+    return (area != 0) & (overlap_fraction >= threshold)
+
+
 def extract_text_from_spans(spans, join_with_space=True, remove_integer_superscripts=True):
     """
     Convert a collection of page tokens/words/spans into a single text string.
@@ -478,35 +499,10 @@ def nms(objects, match_criteria="object2_overlap", match_threshold=0.05, keep_hi
     if len(objects) == 0:
         return []
 
-    objects = sort_objects_by_score(objects, reverse=keep_higher)
-
-    num_objects = len(objects)
-    suppression = [False for obj in objects]
-
-    for object2_num in range(1, num_objects):
-        object2_rect = BoundingBox(*objects[object2_num]["bbox"])
-        object2_area = object2_rect.area
-        for object1_num in range(object2_num):
-            if not suppression[object1_num]:
-                object1_rect = BoundingBox(*objects[object1_num]["bbox"])
-                object1_area = object1_rect.area
-                intersect_area = object1_rect.intersect(object2_rect).area
-                try:
-                    metric = 0
-                    if match_criteria == "object1_overlap":
-                        metric = intersect_area / object1_area
-                    elif match_criteria == "object2_overlap":
-                        metric = intersect_area / object2_area
-                    elif match_criteria == "iou":
-                        metric = intersect_area / (object1_area + object2_area - intersect_area)
-                    if metric >= match_threshold:
-                        suppression[object2_num] = True
-                        break
-                except Exception:
-                    # Intended to recover from divide-by-zero
-                    pass
-
-    return [obj for idx, obj in enumerate(objects) if not suppression[idx]]
+    # BoundingBoxArray.nms visits the highest scores first, ties in order, like sort_objects_by_score.
+    scores = np.array([obj["score"] for obj in objects], dtype=float)
+    kept = _boxes(objects).nms(scores if keep_higher else -scores, match_threshold, match_criteria)
+    return [objects[idx] for idx in kept.tolist()]
 
 
 def align_headers(headers, rows) -> list[dict[str, list]]:
@@ -572,27 +568,23 @@ def align_supercells(supercells, rows, columns):
     """
     aligned_supercells = []
 
+    row_boxes = _boxes(rows)
+    header_rows = np.array([bool("header" in row and row["header"]) for row in rows], dtype=bool)
+    column_boxes = _boxes(columns)
+
     for supercell in supercells:
         supercell["header"] = False
         row_bbox_rect = None
         col_bbox_rect = None
-        intersecting_header_rows = set()
-        intersecting_data_rows = set()
-        for row_num, row in enumerate(rows):
-            row_height = row["bbox"][3] - row["bbox"][1]
-            supercell_height = supercell["bbox"][3] - supercell["bbox"][1]
-            min_row_overlap = max(row["bbox"][1], supercell["bbox"][1])
-            max_row_overlap = min(row["bbox"][3], supercell["bbox"][3])
-            overlap_height = max_row_overlap - min_row_overlap
-            if "span" in supercell:
-                overlap_fraction = max(overlap_height / row_height, overlap_height / supercell_height)
-            else:
-                overlap_fraction = overlap_height / row_height
-            if overlap_fraction >= 0.5:
-                if "header" in row and row["header"]:
-                    intersecting_header_rows.add(row_num)
-                else:
-                    intersecting_data_rows.add(row_num)
+        x1, y1, x2, y2 = supercell["bbox"][:4]
+        overlap_height = np.minimum(row_boxes.y2, y2) - np.maximum(row_boxes.y1, y1)
+        if "span" in supercell:
+            overlap_fraction = np.maximum(_divide(overlap_height, row_boxes.height), _divide(overlap_height, y2 - y1))
+        else:
+            overlap_fraction = _divide(overlap_height, row_boxes.height)
+        intersecting = overlap_fraction >= 0.5
+        intersecting_header_rows = set(np.nonzero(intersecting & header_rows)[0].tolist())
+        intersecting_data_rows = set(np.nonzero(intersecting & ~header_rows)[0].tolist())
 
         # Supercell cannot span across the header boundary; eliminate whichever
         # group of rows is the smallest
@@ -616,26 +608,21 @@ def align_supercells(supercells, rows, columns):
         if row_bbox_rect is None:
             continue
 
-        intersecting_cols = []
-        for col_num, col in enumerate(columns):
-            col_width = col["bbox"][2] - col["bbox"][0]
-            supercell_width = supercell["bbox"][2] - supercell["bbox"][0]
-            min_col_overlap = max(col["bbox"][0], supercell["bbox"][0])
-            max_col_overlap = min(col["bbox"][2], supercell["bbox"][2])
-            overlap_width = max_col_overlap - min_col_overlap
-            if "span" in supercell:
-                overlap_fraction = max(overlap_width / col_width, overlap_width / supercell_width)
-                # Multiply by 2 effectively lowers the threshold to 0.25
-                if supercell["header"]:
-                    overlap_fraction = overlap_fraction * 2
+        overlap_width = np.minimum(column_boxes.x2, x2) - np.maximum(column_boxes.x1, x1)
+        if "span" in supercell:
+            overlap_fraction = np.maximum(_divide(overlap_width, column_boxes.width), _divide(overlap_width, x2 - x1))
+            # Multiply by 2 effectively lowers the threshold to 0.25
+            if supercell["header"]:
+                overlap_fraction = overlap_fraction * 2
+        else:
+            overlap_fraction = _divide(overlap_width, column_boxes.width)
+        intersecting_cols = np.nonzero(overlap_fraction >= 0.5)[0].tolist()
+        for col_num in intersecting_cols:
+            col = columns[col_num]
+            if col_bbox_rect is None:
+                col_bbox_rect = BoundingBox(*col["bbox"])
             else:
-                overlap_fraction = overlap_width / col_width
-            if overlap_fraction >= 0.5:
-                intersecting_cols.append(col_num)
-                if col_bbox_rect is None:
-                    col_bbox_rect = BoundingBox(*col["bbox"])
-                else:
-                    col_bbox_rect = col_bbox_rect.union_self(BoundingBox(*col["bbox"]))
+                col_bbox_rect = col_bbox_rect.union_self(BoundingBox(*col["bbox"]))
         if col_bbox_rect is None:
             continue
 
@@ -743,8 +730,9 @@ def objects_to_structures(objects, tokens, class_thresholds):
     structure = {}
     # for table in tables:
 
-    table_objects = [obj for obj in objects if iob(obj["bbox"], table["bbox"]) >= 0.5]
-    table_tokens = [token for token in tokens if iob(token["bbox"], table["bbox"]) >= 0.5]
+    table_rect = BoundingBoxArray([table["bbox"]])
+    table_objects = [obj for obj, inside in zip(objects, _boxes(objects).iob(table_rect)[:, 0] >= 0.5) if inside]
+    table_tokens = [token for token, inside in zip(tokens, _boxes(tokens).iob(table_rect)[:, 0] >= 0.5) if inside]
     # table_tokens = []
 
     columns = [obj for obj in table_objects if obj["label"] == "table column"]
@@ -758,11 +746,9 @@ def objects_to_structures(objects, tokens, class_thresholds):
     for obj in projected_row_headers:
         obj["projected row header"] = True
     spanning_cells += projected_row_headers
-    for obj in rows:
-        obj["column header"] = False
-        for header_obj in column_headers:
-            if iob(obj["bbox"], header_obj["bbox"]) >= 0.5:
-                obj["column header"] = True
+    in_column_header = (_boxes(rows).iob(_boxes(column_headers)) >= 0.5).any(axis=1)
+    for obj, in_header in zip(rows, in_column_header.tolist()):
+        obj["column header"] = in_header
 
     # Refine table structures
     rows = refine_rows(rows, table_tokens, class_thresholds["table row"])
@@ -817,55 +803,65 @@ def structure_to_cells(table_structure, tokens):
     cells = []
     subcells = []
 
-    # Identify complete cells and subcells
-    for column_num, column in enumerate(columns):
-        for row_num, row in enumerate(rows):
-            column_rect = BoundingBox(*column["bbox"])
-            row_rect = BoundingBox(*row["bbox"])
-            cell_rect = row_rect.intersect(column_rect)
-            header = "column header" in row and row["column header"]
-            cell = {
-                "bbox": cell_rect.to_list(),
-                "column_nums": [column_num],
-                "row_nums": [row_num],
-                "column header": header,
-            }
-
-            cell["subcell"] = False
-            for spanning_cell in spanning_cells:
-                spanning_cell_rect = BoundingBox(*spanning_cell["bbox"])
-                if (spanning_cell_rect.intersect(cell_rect).area / cell_rect.area) > 0.5:
-                    cell["subcell"] = True
-                    break
+    # Identify complete cells and subcells. The grid cells are the intersections of every column, in
+    # the outer loop, with every row.
+    row_boxes = _boxes(rows)
+    column_boxes = _boxes(columns)
+    grid = BoundingBoxArray(np.tile(row_boxes.coords, (len(columns), 1))).intersect(
+        BoundingBoxArray(np.repeat(column_boxes.coords, len(rows), axis=0))
+    )
+    spanning_cell_boxes = _boxes(spanning_cells)
+    if len(spanning_cells) > 0:
+        in_spanning_cell = _divide(grid.intersection_area(spanning_cell_boxes), grid.area[:, None]) > 0.5
+        is_subcell = in_spanning_cell.any(axis=1).tolist()
+    else:
+        is_subcell = [False] * len(grid)
+
+    for cell_num, cell_bbox in enumerate(grid.to_list()):
+        column_num, row_num = divmod(cell_num, len(rows))
+        row = rows[row_num]
+        header = "column header" in row and row["column header"]
+        cell = {
+            "bbox": cell_bbox,
+            "column_nums": [column_num],
+            "row_nums": [row_num],
+            "column header": header,
+        }
+
+        cell["subcell"] = is_subcell[cell_num]
+        if cell["subcell"]:
+            subcells.append(cell)
+        else:
+            # cell text = extract_text_inside_bbox(table_spans, cell['bbox'])
+            # cell['cell text'] = cell text
+            cell["projected row header"] = False
+            cells.append(cell)
 
-            if cell["subcell"]:
-                subcells.append(cell)
-            else:
-                # cell text = extract_text_inside_bbox(table_spans, cell['bbox'])
-                # cell['cell text'] = cell text
-                cell["projected row header"] = False
-                cells.append(cell)
+    if len(subcells) > 0:
+        subcell_boxes = _boxes(subcells)
+        # [i, j] is whether subcell i lies mostly within spanning cell j.
+        subcell_in_spanning_cell = (
+            _divide(subcell_boxes.intersection_area(spanning_cell_boxes), subcell_boxes.area[:, None]) > 0.5
+        )
 
-    for spanning_cell in spanning_cells:
-        spanning_cell_rect = BoundingBox(*spanning_cell["bbox"])
+    for spanning_cell_num, spanning_cell in enumerate(spanning_cells):
         cell_columns = set()
         cell_rows = set()
         cell_rect = None
         header = True
-        for subcell in subcells:
-            subcell_rect = BoundingBox(*subcell["bbox"])
-            subcell_rect_area = subcell_rect.area
-            if (subcell_rect.intersect(spanning_cell_rect).area / subcell_rect_area) > 0.5:
-                if cell_rect is None:
-                    cell_rect = BoundingBox(*subcell["bbox"])
-                else:
-                    cell_rect.union_self(BoundingBox(*subcell["bbox"]))
-                cell_rows = cell_rows.union(set(subcell["row_nums"]))
-                cell_columns = cell_columns.union(set(subcell["column_nums"]))
-                # By convention here, all subcells must be classified
-                # as header cells for a spanning cell to be classified as a header cell;
-                # otherwise, this could lead to a non-rectangular header region
-                header = header and "column header" in subcell and subcell["column header"]
+        subcell_nums = np.nonzero(subcell_in_spanning_cell[:, spanning_cell_num])[0].tolist() if subcells else []
+        for subcell_num in subcell_nums:
+            subcell = subcells[subcell_num]
+            if cell_rect is None:
+                cell_rect = BoundingBox(*subcell["bbox"])
+            else:
+                cell_rect.union_self(BoundingBox(*subcell["bbox"]))
+            cell_rows = cell_rows.union(set(subcell["row_nums"]))
+            cell_columns = cell_columns.union(set(subcell["column_nums"]))
+            # By convention here, all subcells must be classified
+            # as header cells for a spanning cell to be classified as a header cell;
+            # otherwise, this could lead to a non-rectangular header region
+            header = header and "column header" in subcell and subcell["column header"]
         if len(cell_rows) > 0 and len(cell_columns) > 0:
             cell = {
                 "bbox": cell_rect.to_list(),
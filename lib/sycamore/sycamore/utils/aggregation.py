@@ -0,0 +1,226 @@
+"""
+Map-side partial aggregations over a Ray Dataset of serialized Documents.
+
+Each aggregation turns a batch of rows into a small partial result on the workers; the partials are
+then merged in a tree of Ray tasks, so only a handful of partials reach the driver instead of every row.
+"""
+
+from abc import ABC, abstractmethod
+from functools import reduce
+import math
+import pickle
+import pickletools
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+from ray.data import Dataset
+
+from sycamore.data import Document, MetadataDocument
+
+# The number of partials merged by each task of the merge tree.
+_MERGE_FANOUT = 16
+
+
+# Opcodes a pickled dict starts with before its first key.
+_DICT_PREAMBLE = frozenset(["PROTO", "FRAME", "EMPTY_DICT", "MEMOIZE", "BINPUT", "LONG_BINPUT", "PUT", "MARK"])
+
+
+def _first_key(raw: bytes) -> Optional[str]:
+    """Returns the first key of a pickled dict of str keys, reading only the opcodes up to it."""
+    for opcode, arg, _ in pickletools.genops(raw):
+        if opcode.name not in _DICT_PREAMBLE:
+            return arg if isinstance(arg, str) else None
+    return None
+
+
+def is_metadata_row(row: dict[str, Any]) -> bool:
+    """
+    Returns True if the Ray row holds a MetadataDocument. MetadataDocument.serialize writes the metadata
+    key first, so only rows that mention "metadata" elsewhere need to be unpickled to tell.
+    """
+    raw = row["doc"]
+    if _first_key(raw) == "metadata":
+        return True
+    if b"metadata" not in raw:
+        return False
+    return isinstance(Document.deserialize(raw), MetadataDocument)
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Strings such as "nan" or "inf" parse, but are not values we want to aggregate.
+    return number if math.isfinite(number) else None
+
+
+class Aggregation(ABC):
+    """
+    A decomposable aggregation. ``partial`` runs on the workers over the documents of one block and
+    must return something small and picklable; ``merge`` combines two partials and ``finalize`` turns
+    the merged partial into the result.
+    """
+
+    #: Whether the aggregation needs the Documents themselves, or only the number of rows.
+    needs_documents = True
+
+    @abstractmethod
+    def partial(self, docs: list[Document]) -> Any:
+        pass
+
+    @abstractmethod
+    def merge(self, left: Any, right: Any) -> Any:
+        pass
+
+    def finalize(self, value: Any) -> Any:
+        return value
+
+
+def _merge_all(aggregations: list[Aggregation], partials: list[list[Any]]) -> list[Any]:
+    return reduce(lambda left, right: [a.merge(m, v) for a, m, v in zip(aggregations, left, right)], partials)
+
+
+class CountAggregation(Aggregation):
+    needs_documents = False
+
+    def partial(self, docs: list[Document]) -> int:
+        return len(docs)
+
+    def merge(self, left: int, right: int) -> int:
+        return left + right
+
+
+class CountDistinctAggregation(Aggregation):
+    def __init__(self, field: str):
+        self._field = field
+
+    def partial(self, docs: list[Document]) -> set:
+        values = set()
+        for doc in docs:
+            value = doc.field_to_value(self._field)
+            if value is not None and value != "None":
+                values.add(value)
+        return values
+
+    def merge(self, left: set, right: set) -> set:
+        if len(left) < len(right):
+            left, right = right, left
+        left.update(right)
+        return left
+
+    def finalize(self, value: set) -> int:
+        return len(value)
+
+
+class NumericAggregation(Aggregation):
+    """
+    Computes count, sum, min, max and mean of the numeric values of a field. Missing values and
+    values that cannot be converted to a number are skipped.
+    """
+
+    def __init__(self, field: str):
+        self._field = field
+
+    def partial(self, docs: list[Document]) -> dict[str, Any]:
+        values = [v for v in (_to_number(d.field_to_value(self._field)) for d in docs) if v is not None]
+        if not values:
+            return {"count": 0, "sum": 0, "min": None, "max": None}
+        return {"count": len(values), "sum": math.fsum(values), "min": min(values), "max": max(values)}
+
+    def merge(self, left: dict[str, Any], right: dict[str, Any]) -> dict[str, Any]:
+        if left["count"] == 0:
+            return right
+        if right["count"] == 0:
+            return left
+        return {
+            "count": left["count"] + right["count"],
+            "sum": left["sum"] + right["sum"],
+            "min": min(left["min"], right["min"]),
+            "max": max(left["max"], right["max"]),
+        }
+
+    def finalize(self, value: dict[str, Any]) -> dict[str, Any]:
+        value["mean"] = value["sum"] / value["count"] if value["count"] else None
+        return value
+
+
+class HistogramAggregation(Aggregation):
+    """Counts the numeric values of a field falling into each bin. Bins follow numpy.histogram:
+    every bin is half-open except the last, and values outside the edges are ignored."""
+
+    def __init__(self, field: str, edges: Sequence[float]):
+        self._field = field
+        self._edges = np.asarray(edges, dtype=float)
+
+    def partial(self, docs: list[Document]) -> np.ndarray:
+        values = [v for v in (_to_number(d.field_to_value(self._field)) for d in docs) if v is not None]
+        counts, _ = np.histogram(np.asarray(values, dtype=float), bins=self._edges)
+        return counts
+
+    def merge(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return left + right
+
+    def finalize(self, value: np.ndarray) -> tuple[list[int], list[float]]:
+        return value.tolist(), self._edges.tolist()
+
+
+def histogram_edges(bins: Union[int, Sequence[float]], value_range: tuple[float, float]) -> list[float]:
+    if not isinstance(bins, int):
+        return list(bins)
+    low, high = value_range
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1).tolist()
+
+
+def aggregate(dataset: Dataset, aggregations: list[Aggregation], include_metadata: bool = False) -> list[Any]:
+    """
+    Runs all the aggregations in one pass over a Dataset of serialized Documents.
+
+    Args:
+        dataset: The Dataset to aggregate, with one serialized Document per row.
+        aggregations: The aggregations to compute.
+        include_metadata: Whether MetadataDocuments are passed to the aggregations.
+
+    Returns:
+        The finalized result of each aggregation, in order.
+    """
+    if include_metadata and all(isinstance(a, CountAggregation) for a in aggregations):
+        # Ray knows the number of rows from block metadata.
+        count = dataset.count()
+        return [count for _ in aggregations]
+
+    needs_documents = any(a.needs_documents for a in aggregations)
+
+    def partials(batch: dict[str, Any]) -> dict[str, list]:
+        rows = [{"doc": raw} for raw in batch["doc"]]
+        if needs_documents:
+            docs = [Document.from_row(r) for r in rows]
+            if not include_metadata:
+                docs = [d for d in docs if not isinstance(d, MetadataDocument)]
+        else:
+            # Only the number of documents matters, so rows are classified without unpickling them.
+            docs = [None for r in rows if include_metadata or not is_metadata_row(r)]  # type: ignore[misc]
+        return {"partial": [pickle.dumps([a.partial(docs) for a in aggregations])]}
+
+    def merge(batch: dict[str, Any]) -> dict[str, list]:
+        merged = _merge_all(aggregations, [pickle.loads(p) for p in batch["partial"]])
+        return {"partial": [pickle.dumps(merged)]}
+
+    partial_ds = dataset.map_batches(partials, batch_size=None, batch_format="numpy").materialize()
+    # Each level of the tree merges groups of partials in parallel, until few enough are left for the driver.
+    num_partials = partial_ds.count()
+    while num_partials > _MERGE_FANOUT:
+        partial_ds = partial_ds.map_batches(merge, batch_size=_MERGE_FANOUT, batch_format="numpy").materialize()
+        num_partials, previous = partial_ds.count(), num_partials
+        if num_partials >= previous:
+            break
+
+    values = [pickle.loads(row["partial"]) for row in partial_ds.iter_rows()]
+    merged = _merge_all(aggregations, values) if values else [a.partial([]) for a in aggregations]
+    return [a.finalize(m) for a, m in zip(aggregations, merged)]
@@ -6,13 +6,20 @@ from sycamore import Context
 from sycamore.plan_nodes import Node
 from sycamore.data import Document
 from sycamore.connectors.common import HostAndPort
-from sycamore.connectors.file.file_writer import default_doc_to_bytes, default_filename, FileWriter, JsonWriter
+from sycamore.connectors.file.file_writer import (
+    default_filename,
+    DEFAULT_TARGET_FILE_SIZE,
+    FileWriter,
+    JsonWriter,
+    ParquetWriter,
+)
 from ray.data import ActorPoolStrategy
 import logging
 
 if TYPE_CHECKING:
     # Shenanigans to avoid circular import
     from sycamore.docset import DocSet
+    from sycamore.connectors.bulk import BulkParams
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +43,7 @@ class DocSetWriter:
         index_name: str,
         index_settings: Optional[dict] = None,
         execute: bool = True,
+        bulk_params: Optional["BulkParams"] = None,
         **kwargs,
     ) -> Optional["DocSet"]:
         """Writes the content of the DocSet into the specified OpenSearch index.
@@ -49,6 +57,8 @@ class DocSetWriter:
                 https://opensearch.org/docs/latest/api-reference/index-apis/create-index/
             execute: Execute the pipeline and write to opensearch on adding this operator. If false,
                 will return a new docset with the write in the plan
+            bulk_params: Controls the size of bulk requests, the number of requests in flight, and the retries of
+                documents rejected by an overloaded cluster. See :class:`sycamore.connectors.bulk.BulkParams`.
             kwargs: Arguments to pass to the underlying execution engine
 
         Example:
@@ -122,6 +132,8 @@ class DocSetWriter:
         hosts = os_client_args.get("hosts", None)
         if hosts is not None:
             os_client_args["hosts"] = _convert_to_host_port_list(hosts)
+        if bulk_params is not None:
+            os_client_args["bulk_params"] = bulk_params
         client_params = OpenSearchWriterClientParams(**os_client_args)
 
         target_params: OpenSearchWriterTargetParams
@@ -473,6 +485,7 @@ class DocSetWriter:
         settings: Optional[dict] = None,
         mappings: Optional[dict] = None,
         execute: bool = True,
+        bulk_params: Optional["BulkParams"] = None,
         **kwargs,
     ) -> Optional["DocSet"]:
         """Writes the content of the DocSet into the specified Elasticsearch index.
@@ -489,6 +502,8 @@ class DocSetWriter:
             settings: Settings of the Elasticsearch index, can be optionally specified
             execute: Execute the pipeline and write to weaviate on adding this operator. If False,
                 will return a DocSet with this write in the plan. Default is True
+            bulk_params: Controls the size of bulk requests, the number of requests in flight, and the retries of
+                documents rejected by an overloaded cluster. See :class:`sycamore.connectors.bulk.BulkParams`.
         Example:
             The following code shows how to read a pdf dataset into a ``DocSet`` and write it out to a
             local Elasticsearch index called `test-index`.
@@ -525,7 +540,9 @@ class DocSetWriter:
             ElasticsearchWriterTargetParams,
         )
 
-        client_params = ElasticsearchWriterClientParams(url=url, es_client_args=es_client_args)
+        client_params = ElasticsearchWriterClientParams(
+            url=url, es_client_args=es_client_args, **({"bulk_params": bulk_params} if bulk_params else {})
+        )
         target_params = ElasticsearchWriterTargetParams(
             index_name=index_name,
             wait_for_completion=wait_for_completion,
@@ -555,20 +572,35 @@ class DocSetWriter:
         path: str,
         filesystem: Optional[FileSystem] = None,
         filename_fn: Callable[[Document], str] = default_filename,
-        doc_to_bytes_fn: Callable[[Document], bytes] = default_doc_to_bytes,
+        doc_to_bytes_fn: Optional[Callable[[Document], bytes]] = None,
+        bundle_format: Optional[str] = None,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE,
         **resource_args,
     ) -> None:
-        """Writes the content of each Document to a separate file.
+        """Writes the content of each Document to a separate file, or with bundle_format, packs many
+        Documents into each file.
 
         Args:
             path: The path prefix to write to. Should include the scheme if not local.
             filesystem: The pyarrow.fs FileSystem to use.
             filename_fn: A function for generating a file name. Takes a Document
-                and returns a unique name that will be appended to path.
+                and returns a unique name that will be appended to path. Not used for bundles.
             doc_to_bytes_fn: A function from a Document to bytes for generating the data to write.
                 Defaults to using text_representation if available, or binary_representation
-                if not.
+                if not. For bundles, defaults to a JSON line per Document ("jsonl") or the
+                serialized Document ("binary").
+            bundle_format: If set, each write task packs its Documents into files of roughly
+                target_file_size bytes. "jsonl" writes one JSON record per line and can be read back
+                with ``read.json_document``. "binary" writes length-prefixed records followed by an
+                index of doc_ids; read it back with ``read.bundles``, or fetch single Documents with
+                :func:`sycamore.connectors.file.bundle_format.read_bundle_document`.
+            target_file_size: Approximate size in bytes at which a bundle is closed and a new one started.
             resource_args: Arguments to pass to the underlying execution environment.
+
+        Example:
+            .. code-block:: python
+
+                docset.write.files("s3://bucket/export", bundle_format="binary", target_file_size=256 << 20)
         """
         file_writer = FileWriter(
             self.plan,
@@ -576,6 +608,8 @@ class DocSetWriter:
             filesystem=filesystem,
             filename_fn=filename_fn,
             doc_to_bytes_fn=doc_to_bytes_fn,
+            bundle_format=bundle_format,
+            target_file_size=target_file_size,
             **resource_args,
         )
 
@@ -600,3 +634,48 @@ class DocSetWriter:
 
         node = JsonWriter(self.plan, path, filesystem=filesystem, **resource_args)
         node.execute()
+
+    def parquet(
+        self,
+        path: str,
+        filesystem: Optional[FileSystem] = None,
+        embedding_dim: Optional[int] = None,
+        partition_by: Optional[list[str]] = None,
+        row_group_size: int = 10000,
+        max_rows_per_file: int = 0,
+        **resource_args,
+    ) -> None:
+        """
+        Writes Documents to Parquet files with one column per document field. Elements are stored as a
+        list of structs, properties as a JSON string, and embeddings as float32 lists. Unlike
+        :meth:`files`, many documents are packed into each file, and the output can be read back with
+        :meth:`sycamore.reader.DocSetReader.parquet`.
+
+        Args:
+            path: The path prefix to write to. Should include the scheme if not local.
+            filesystem: The pyarrow.fs FileSystem to use.
+            embedding_dim: If set, embeddings are stored as fixed size lists of this many values.
+            partition_by: Property names whose values are used to split the output into hive-style
+                ``properties.<name>=<value>`` directories.
+            row_group_size: Maximum number of rows in a Parquet row group.
+            max_rows_per_file: Maximum number of rows in a file; 0 means no limit.
+            resource_args: Arguments to pass to the underlying execution environment.
+
+        Example:
+            .. code-block:: python
+
+                docset.write.parquet("s3://bucket/checkpoint", partition_by=["filetype"])
+                docset = context.read.parquet("s3://bucket/checkpoint")
+        """
+
+        node = ParquetWriter(
+            self.plan,
+            path,
+            filesystem=filesystem,
+            embedding_dim=embedding_dim,
+            partition_by=partition_by,
+            row_group_size=row_group_size,
+            max_rows_per_file=max_rows_per_file,
+            **resource_args,
+        )
+        node.execute()